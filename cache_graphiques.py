@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import matplotlib.pyplot as plt
+
+DOSSIER_CACHE = ".cache_graphiques"
+TAILLE_MAX_CACHE = 100 * 1024 * 1024
+
+
+class CacheGraphiques:
+    """
+    Cache disque des graphiques rendus
+
+    Chaque image est rangée sous une clé qui résume le type de graphique, ses
+    paramètres, le style et la version des données : une image n'est jamais
+    invalidée, elle cesse simplement d'être demandée quand les données changent.
+    Les moins récemment utilisées sont supprimées au-delà de taille_max octets.
+    """
+
+    def __init__(self, dossier: str = DOSSIER_CACHE, taille_max: int = TAILLE_MAX_CACHE):
+        """
+        Initialise le cache (le dossier n'est créé qu'au premier enregistrement)
+
+        Args:
+            dossier: Dossier des images
+            taille_max: Taille totale maximale du cache en octets
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+
+    @staticmethod
+    def cle(graphique: str, parametres: Dict, style: str, version: str, devise: str, format_image: str) -> str:
+        """
+        Calcule la clé d'une image
+
+        Args:
+            graphique: Nom de la méthode de BudgetVisualizer
+            parametres: Paramètres passés à la méthode
+            style: Style matplotlib
+            version: Version persistante des données (voir BudgetDatabase.obtenir_version_persistante)
+            devise: Devise de rapport
+            format_image: Format de l'image (png, svg...)
+
+        Returns:
+            Clé hexadécimale
+        """
+        description = json.dumps(
+            [graphique, parametres, style, version, devise, format_image], sort_keys=True, default=str
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _chemin(self, cle: str, format_image: str) -> str:
+        """Retourne le fichier d'une image du cache"""
+        return os.path.join(self.dossier, f"{cle}.{format_image}")
+
+    def obtenir(self, cle: str, format_image: str = "png") -> Optional[str]:
+        """
+        Retourne le fichier d'une image en cache et la marque comme récemment utilisée
+
+        Returns:
+            Chemin de l'image, ou None si elle n'est pas en cache
+        """
+        chemin = self._chemin(cle, format_image)
+        try:
+            os.utime(chemin)
+        except FileNotFoundError:
+            return None
+        return chemin
+
+    def enregistrer(self, cle: str, fig: plt.Figure, format_image: str = "png") -> str:
+        """
+        Écrit une figure dans le cache puis applique la limite de taille
+
+        L'image est écrite dans un fichier temporaire puis renommée : un lecteur
+        concurrent ne voit jamais d'image partielle.
+
+        Returns:
+            Chemin de l'image
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+        chemin = self._chemin(cle, format_image)
+        fig.savefig(f"{chemin}.tmp", format=format_image)
+        os.replace(f"{chemin}.tmp", chemin)
+        self._evincer(conserver=chemin)
+        return chemin
+
+    def _evincer(self, conserver: str = None):
+        """Supprime les images les moins récemment utilisées tant que le cache dépasse taille_max"""
+        fichiers = []
+        for entree in os.scandir(self.dossier):
+            if entree.is_file() and not entree.name.endswith(".tmp") and entree.path != conserver:
+                infos = entree.stat()
+                fichiers.append((infos.st_mtime, infos.st_size, entree.path))
+
+        taille = sum(taille for _, taille, _ in fichiers) + (os.path.getsize(conserver) if conserver else 0)
+        for _, taille_fichier, chemin in sorted(fichiers):
+            if taille <= self.taille_max:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+            taille -= taille_fichier
+
+    def vider(self) -> int:
+        """
+        Supprime toutes les images du cache
+
+        Returns:
+            Nombre d'images supprimées
+        """
+        if not os.path.isdir(self.dossier):
+            return 0
+
+        nb_supprimees = 0
+        for entree in os.scandir(self.dossier):
+            if entree.is_file():
+                os.remove(entree.path)
+                nb_supprimees += 1
+        return nb_supprimees
@@ -0,0 +1,297 @@
+import time
+from typing import Dict, List, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.container import BarContainer
+
+from database_manager import BudgetDatabase
+
+MOIS_LABELS = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
+
+
+class TableauDeBord:
+    """
+    Tableau de bord persistant mis à jour en place
+
+    Regroupe la répartition par utilité, le comparatif par auteur et
+    l'évolution mensuelle dans une seule figure. La version des données est
+    surveillée à intervalle régulier et seuls les artistes existants (hauteurs
+    de barres, angles des parts) sont modifiés lorsqu'elle change.
+
+    Ces artistes sont animés : le fond de la figure (axes, graduations,
+    légendes) est mémorisé à chaque rendu complet, et une mise à jour se
+    contente de le restaurer puis de redessiner les artistes animés (blitting).
+    Le rendu complet n'est refait que si une échelle ou la liste des auteurs change.
+
+    Les trois graphiques sont calculés à partir d'un seul tableau croisé de
+    l'année (mois x auteur x utilité, par type), lu une fois par mise à jour.
+    """
+
+    def __init__(self, db: BudgetDatabase, annee: int, mois: int, intervalle_ms: int = 1000):
+        """
+        Initialise le tableau de bord
+
+        Args:
+            db: Instance de BudgetDatabase
+            annee: Année affichée dans l'évolution mensuelle
+            mois: Mois utilisé pour la répartition par utilité et le comparatif par auteur
+            intervalle_ms: Intervalle de surveillance de la base en millisecondes
+        """
+        self.db = db
+        self.annee = annee
+        self.mois = mois
+        self.intervalle_ms = intervalle_ms
+        self.version = None
+        self.derniere_duree_ms = 0.0
+        self.fond = None
+
+        plt.style.use("seaborn-v0_8-darkgrid")
+        self.fig = plt.figure(figsize=(16, 10))
+        grille = self.fig.add_gridspec(2, 2)
+        self.ax_utilite = self.fig.add_subplot(grille[0, 0])
+        self.ax_auteurs = self.fig.add_subplot(grille[0, 1])
+        self.ax_evolution = self.fig.add_subplot(grille[1, :])
+
+        self.auteurs: List[str] = []
+        self.barres_auteurs: Dict[str, BarContainer] = {}
+        self.animes: List[plt.Artist] = []
+        self._creer_utilite()
+        self._creer_evolution()
+        self.fig.canvas.mpl_connect("draw_event", self._sur_rendu_complet)
+        self.mettre_a_jour()
+
+        self.timer = self.fig.canvas.new_timer(interval=self.intervalle_ms)
+        self.timer.add_callback(self._verifier_version)
+
+    def _creer_utilite(self):
+        """Crée le camembert des dépenses par utilité"""
+        colors = ["#a9cbd7", "#ffc5d3"]
+        self.wedges, self.textes_utilite, self.pcts_utilite = self.ax_utilite.pie(
+            [1, 1], labels=["Commun", "Perso"], autopct="%1.1f%%", colors=colors, startangle=90
+        )
+        for autotext in self.pcts_utilite:
+            autotext.set_color("white")
+            autotext.set_fontsize(12)
+            autotext.set_fontweight("bold")
+        self.ax_utilite.set_title("Dépenses par utilité", fontsize=14, fontweight="bold")
+        self._animer([*self.wedges, *self.textes_utilite, *self.pcts_utilite, self.ax_utilite.title])
+
+    def _creer_auteurs(self, auteurs: List[str]):
+        """(Re)crée le comparatif par auteur, uniquement quand la liste des auteurs change"""
+        anciennes = {barre for barres in self.barres_auteurs.values() for barre in barres}
+        self.animes = [artiste for artiste in self.animes if artiste not in anciennes]
+        self.ax_auteurs.clear()
+        self.auteurs = auteurs
+
+        x = np.arange(len(auteurs))
+        width = 0.25
+        zeros = np.zeros(len(auteurs))
+
+        self.barres_auteurs = {
+            "revenus": self.ax_auteurs.bar(
+                x - width, zeros, width, label="Revenus", color="#2ecc71", alpha=0.8, edgecolor="black"
+            ),
+            "depenses": self.ax_auteurs.bar(
+                x, zeros, width, label="Dépenses", color="#e74c3c", alpha=0.8, edgecolor="black"
+            ),
+            "solde": self.ax_auteurs.bar(
+                x + width, zeros, width, label="Solde", color="#3498db", alpha=0.8, edgecolor="black"
+            ),
+        }
+
+        self.ax_auteurs.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
+        self.ax_auteurs.set_title("Comparatif par auteur", fontsize=14, fontweight="bold")
+        self.ax_auteurs.set_xticks(x)
+        self.ax_auteurs.set_xticklabels(auteurs)
+        self.ax_auteurs.legend(fontsize=10)
+        self.ax_auteurs.axhline(y=0, color="black", linestyle="-", linewidth=1)
+        self.ax_auteurs.grid(axis="y", alpha=0.3)
+        self._animer([barre for barres in self.barres_auteurs.values() for barre in barres])
+
+    def _creer_evolution(self):
+        """Crée les barres de l'évolution mensuelle"""
+        x = np.arange(len(MOIS_LABELS))
+        width = 0.35
+        zeros = np.zeros(len(MOIS_LABELS))
+
+        self.barres_revenus = self.ax_evolution.bar(
+            x - width / 2, zeros, width, label="Revenus", color="#2ecc71", alpha=0.8, edgecolor="black"
+        )
+        self.barres_depenses = self.ax_evolution.bar(
+            x + width / 2, zeros, width, label="Dépenses", color="#e74c3c", alpha=0.8, edgecolor="black"
+        )
+        (self.ligne_solde,) = self.ax_evolution.plot(x, zeros, color="#3498db", marker="o", label="Solde")
+
+        self.ax_evolution.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
+        self.ax_evolution.set_title(f"Évolution mensuelle - {self.annee}", fontsize=14, fontweight="bold")
+        self.ax_evolution.set_xticks(x)
+        self.ax_evolution.set_xticklabels(MOIS_LABELS)
+        self.ax_evolution.axhline(y=0, color="black", linestyle="-", linewidth=1)
+        self.ax_evolution.legend(fontsize=11)
+        self.ax_evolution.grid(axis="y", alpha=0.3)
+        self._animer([*self.barres_revenus, *self.barres_depenses, self.ligne_solde])
+
+    def _animer(self, artistes: List[plt.Artist]):
+        """Exclut des artistes du rendu complet : ils sont redessinés seuls à chaque mise à jour"""
+        for artiste in artistes:
+            artiste.set_animated(True)
+        self.animes.extend(artistes)
+
+    @staticmethod
+    def _ajuster_axe_y(ax: plt.Axes) -> bool:
+        """
+        Ajuste l'axe Y aux données, arrondi aux graduations
+
+        L'arrondi évite de changer d'échelle (et donc de refaire le rendu
+        complet) à chaque petite variation des montants.
+
+        Returns:
+            True si les limites ont changé
+        """
+        ax.relim()
+        bas, haut = min(ax.dataLim.y0, 0.0), max(ax.dataLim.y1, 0.0)
+        if bas == haut:
+            haut = 1.0
+        graduations = ax.yaxis.get_major_locator().tick_values(bas, haut)
+        limites = (min(graduations[0], bas), max(graduations[-1], haut))
+        if tuple(ax.get_ylim()) == limites:
+            return False
+        ax.set_ylim(*limites)
+        return True
+
+    def _charger_totaux(self) -> Dict[Tuple[int, str, str], Dict[str, float]]:
+        """
+        Lit en une requête les totaux de l'année par mois, auteur et utilité
+
+        Returns:
+            Dict {(mois, auteur, utilite): {'Revenu': montant, 'Depense': montant}}, types absents omis
+        """
+        pivot = self.db.obtenir_pivot(
+            ["mois", "auteur", "utilite"],
+            ["type"],
+            filtres={"date_debut": f"{self.annee}-01-01", "date_fin": f"{self.annee + 1}-01-01"},
+        )
+        return {
+            cle: dict(zip(pivot["colonnes"], valeurs))
+            for cle, valeurs in zip(pivot["lignes"], pivot["valeurs"].tolist())
+        }
+
+    def _maj_utilite(self, totaux: Dict[Tuple[int, str, str], Dict[str, float]]):
+        """Met à jour les angles et les pourcentages du camembert"""
+        depenses = {"Commun": 0.0, "Perso": 0.0}
+        for (mois, _, utilite), valeurs in totaux.items():
+            if mois == self.mois:
+                depenses[utilite] += valeurs.get("Depense", 0.0)
+
+        valeurs = np.array([depenses["Commun"], depenses["Perso"]])
+        total = valeurs.sum()
+        fractions = valeurs / total if total > 0 else np.array([0.5, 0.5])
+
+        theta = 90.0
+        for wedge, texte, pct, fraction in zip(self.wedges, self.textes_utilite, self.pcts_utilite, fractions):
+            theta2 = theta + 360.0 * fraction
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta2)
+
+            angle = np.deg2rad((theta + theta2) / 2)
+            texte.set_position((1.1 * np.cos(angle), 1.1 * np.sin(angle)))
+            pct.set_position((0.6 * np.cos(angle), 0.6 * np.sin(angle)))
+            pct.set_text(f"{fraction * 100:.1f}%" if total > 0 else "")
+            theta = theta2
+
+        self.ax_utilite.set_title(
+            f"Dépenses par utilité\nTotal: {total:.2f}{self.db.symbole_devise}", fontsize=14, fontweight="bold"
+        )
+
+    def _maj_auteurs(self, totaux: Dict[Tuple[int, str, str], Dict[str, float]]) -> bool:
+        """
+        Met à jour les hauteurs des barres du comparatif par auteur
+
+        Returns:
+            True si un rendu complet est nécessaire (nouveaux auteurs ou nouvelle échelle)
+        """
+        totaux_auteurs = {}
+        for (mois, auteur, _), valeurs in totaux.items():
+            if mois == self.mois:
+                revenus, depenses = totaux_auteurs.get(auteur, (0.0, 0.0))
+                totaux_auteurs[auteur] = (revenus + valeurs.get("Revenu", 0.0), depenses + valeurs.get("Depense", 0.0))
+
+        auteurs = sorted(totaux_auteurs)
+        recree = auteurs != self.auteurs
+        if recree:
+            self._creer_auteurs(auteurs)
+
+        for i, auteur in enumerate(auteurs):
+            revenus, depenses = totaux_auteurs[auteur]
+            self.barres_auteurs["revenus"][i].set_height(revenus)
+            self.barres_auteurs["depenses"][i].set_height(depenses)
+            self.barres_auteurs["solde"][i].set_height(revenus - depenses)
+
+        return self._ajuster_axe_y(self.ax_auteurs) or recree
+
+    def _maj_evolution(self, totaux: Dict[Tuple[int, str, str], Dict[str, float]]) -> bool:
+        """
+        Met à jour les barres mensuelles et la courbe de solde
+
+        Returns:
+            True si l'échelle a changé (rendu complet nécessaire)
+        """
+        revenus = np.zeros(len(MOIS_LABELS))
+        depenses = np.zeros(len(MOIS_LABELS))
+        for (mois, _, _), valeurs in totaux.items():
+            revenus[mois - 1] += valeurs.get("Revenu", 0.0)
+            depenses[mois - 1] += valeurs.get("Depense", 0.0)
+
+        for barre_revenus, barre_depenses, revenu, depense in zip(
+            self.barres_revenus, self.barres_depenses, revenus, depenses
+        ):
+            barre_revenus.set_height(revenu)
+            barre_depenses.set_height(depense)
+
+        self.ligne_solde.set_ydata(revenus - depenses)
+        return self._ajuster_axe_y(self.ax_evolution)
+
+    def _sur_rendu_complet(self, event):
+        """Mémorise le fond après un rendu complet, puis y dessine les artistes animés"""
+        self.fond = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._dessiner_animes()
+
+    def _dessiner_animes(self):
+        """Dessine les artistes animés sur le canevas"""
+        for artiste in self.animes:
+            self.fig.draw_artist(artiste)
+
+    def mettre_a_jour(self):
+        """Recalcule les données et met à jour les artistes sans recréer la figure"""
+        debut = time.perf_counter()
+
+        self.version = self.db.obtenir_version_donnees()
+        totaux = self._charger_totaux()
+        self._maj_utilite(totaux)
+        rendu_complet = self._maj_auteurs(totaux)
+        rendu_complet = self._maj_evolution(totaux) or rendu_complet
+
+        canvas = self.fig.canvas
+        if rendu_complet or self.fond is None or not canvas.supports_blit:
+            canvas.draw_idle()
+        else:
+            canvas.restore_region(self.fond)
+            self._dessiner_animes()
+            canvas.blit(self.fig.bbox)
+            canvas.flush_events()
+
+        self.derniere_duree_ms = (time.perf_counter() - debut) * 1000
+
+    def _verifier_version(self):
+        """Rafraîchit le tableau de bord uniquement si les données ont changé"""
+        if self.db.obtenir_version_donnees() != self.version:
+            self.mettre_a_jour()
+
+    def afficher(self):
+        """Affiche le tableau de bord et démarre la surveillance de la base"""
+        self.fig.suptitle(f"Tableau de bord - {self.mois:02d}/{self.annee}", fontsize=16, fontweight="bold")
+        plt.tight_layout()
+        self.timer.start()
+        plt.show()
+        self.timer.stop()
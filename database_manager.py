@@ -1,6 +1,474 @@
+import bisect
+import calendar
+import difflib
+import hashlib
+import re
+import secrets
 import sqlite3
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import unicodedata
+import uuid
+from contextlib import contextmanager
+from datetime import date as Date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Filtres acceptés par les opérations groupées : clé -> condition SQL
+FILTRES_TRANSACTIONS = {
+    "date_debut": "Date >= ?",
+    "date_fin": "Date < ?",
+    "type_transaction": "Type = ?",
+    "utilite": "Utilite = ?",
+    "auteur": "AuteurID = (SELECT ID FROM auteurs WHERE Nom = ?)",
+    "categorie": "CategorieID = (SELECT ID FROM categories WHERE Nom = ?)",
+    "description": "Description LIKE ?",
+    "montant_min": "Montant >= ?",
+    "montant_max": "Montant <= ?",
+    "devise": "Devise = ?",
+}
+
+# Dimensions d'un tableau croisé : clé -> (expression SQL, table de dimension dont les IDs sont résolus en noms)
+DIMENSIONS_PIVOT = {
+    "auteur": ("AuteurID", "auteurs"),
+    "categorie": ("CategorieID", "categories"),
+    "utilite": ("Utilite", None),
+    "type": ("Type", None),
+    "devise": ("Devise", None),
+    "annee": ("CAST(substr(Date, 1, 4) AS INTEGER)", None),
+    "mois": ("CAST(substr(Date, 6, 2) AS INTEGER)", None),
+    "periode": ("substr(Date, 1, 7)", None),
+}
+
+# Mesures d'un tableau croisé : clé -> agrégat SQL, {montant} étant le montant converti
+MESURES_PIVOT = {
+    "somme": "SUM({montant})",
+    "nombre": "COUNT(*)",
+    "moyenne": "AVG({montant})",
+    "min": "MIN({montant})",
+    "max": "MAX({montant})",
+}
+
+FREQUENCES_RECURRENCE = ("hebdomadaire", "mensuelle", "annuelle")
+
+# Traitement des doublons lors d'un ajout en masse
+MODES_DOUBLONS = ("ignorer", "signaler")
+_SEPARATEURS_MOTS = re.compile(r"\W+")
+
+# Devise dans laquelle sont exprimés les taux de change (1 unité de devise = Taux unités de référence)
+DEVISE_REFERENCE = "EUR"
+SYMBOLES_DEVISES = {"EUR": "€", "USD": "$", "GBP": "£", "JPY": "¥", "CHF": "CHF"}
+
+SCHEMA_TRANSACTIONS = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Date TEXT NOT NULL,
+        Montant REAL NOT NULL,
+        Type TEXT NOT NULL CHECK(Type IN ('Revenu', 'Depense')),
+        Utilite TEXT NOT NULL CHECK(Utilite IN ('Commun', 'Perso')),
+        Description TEXT,
+        AuteurID INTEGER NOT NULL REFERENCES auteurs(ID),
+        CategorieID INTEGER REFERENCES categories(ID),
+        RecurrenceID INTEGER REFERENCES recurrences(ID),
+        Uid TEXT,
+        Devise TEXT NOT NULL DEFAULT 'EUR',
+        Empreinte INTEGER,
+        DoublonDe INTEGER
+    )
+"""
+
+SCHEMA_RECURRENCES = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Frequence TEXT NOT NULL CHECK(Frequence IN ('hebdomadaire', 'mensuelle', 'annuelle')),
+        DateDebut TEXT NOT NULL,
+        DateFin TEXT,
+        Montant REAL NOT NULL,
+        Type TEXT NOT NULL CHECK(Type IN ('Revenu', 'Depense')),
+        Utilite TEXT NOT NULL CHECK(Utilite IN ('Commun', 'Perso')),
+        Description TEXT,
+        AuteurID INTEGER NOT NULL REFERENCES auteurs(ID),
+        CategorieID INTEGER REFERENCES categories(ID),
+        MaterialiseAvant TEXT NOT NULL,
+        Devise TEXT NOT NULL DEFAULT 'EUR',
+        Uid TEXT
+    )
+"""
+
+TRIGGERS_JOURNAL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_insertion AFTER INSERT ON transactions
+    BEGIN
+        UPDATE transactions SET Uid = lower(hex(randomblob(16))) WHERE ID = NEW.ID AND Uid IS NULL;
+        INSERT INTO journal (Uid, Operation) SELECT Uid, 'I' FROM transactions WHERE ID = NEW.ID;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_modification
+    AFTER UPDATE OF Date, Montant, Type, Utilite, Description, AuteurID, CategorieID, Devise ON transactions
+    WHEN OLD.Uid IS NOT NULL
+    BEGIN
+        INSERT INTO journal (Uid, Operation) VALUES (NEW.Uid, 'U');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_suppression AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO journal (Uid, Operation) VALUES (OLD.Uid, 'D');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_ajout_seul_update BEFORE UPDATE ON journal
+    BEGIN
+        SELECT RAISE(ABORT, 'Le journal est en ajout seul');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_ajout_seul_delete BEFORE DELETE ON journal
+    BEGIN
+        SELECT RAISE(ABORT, 'Le journal est en ajout seul');
+    END
+    """,
+)
+
+# Quand une originale disparaît ou change d'empreinte, ses doublons ne doivent pas pointer dans le vide :
+# le plus ancien dont l'empreinte n'a plus d'originale le devient, les autres sont rattachés à lui
+# (ou, à défaut, à l'originale de leur propre empreinte)
+_NOUVELLE_ORIGINALE = """
+    SELECT MIN(t.ID) FROM transactions t
+    WHERE t.DoublonDe = OLD.ID
+      AND NOT EXISTS (SELECT 1 FROM transactions o WHERE o.Empreinte = t.Empreinte AND o.DoublonDe IS NULL)
+"""
+_REATTACHER_DOUBLONS = f"""
+    BEGIN
+        UPDATE transactions
+        SET DoublonDe = COALESCE(
+            ({_NOUVELLE_ORIGINALE}),
+            (SELECT o.ID FROM transactions o WHERE o.Empreinte = transactions.Empreinte AND o.DoublonDe IS NULL)
+        )
+        WHERE DoublonDe = OLD.ID AND ID IS NOT ({_NOUVELLE_ORIGINALE});
+        UPDATE transactions SET DoublonDe = NULL WHERE DoublonDe = OLD.ID;
+    END
+"""
+TRIGGERS_DOUBLONS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS doublons_suppression AFTER DELETE ON transactions
+    WHEN OLD.DoublonDe IS NULL
+    {_REATTACHER_DOUBLONS}
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS doublons_modification AFTER UPDATE OF Empreinte, DoublonDe ON transactions
+    WHEN OLD.DoublonDe IS NULL AND (OLD.Empreinte IS NOT NEW.Empreinte OR NEW.DoublonDe IS NOT NULL)
+    {_REATTACHER_DOUBLONS}
+    """,
+)
+
+# Invalident le cache des règlements (reglement_periodes) pour les mois dont les dépenses communes
+# changent ; un changement de taux peut modifier n'importe quel mois converti
+TRIGGERS_REGLEMENT = (
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_insertion AFTER INSERT ON transactions
+    WHEN NEW.Utilite = 'Commun' AND NEW.Type = 'Depense'
+    BEGIN
+        DELETE FROM reglement_periodes WHERE Periode = substr(NEW.Date, 1, 7);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_modification
+    AFTER UPDATE OF Date, Montant, Type, Utilite, AuteurID, Devise ON transactions
+    WHEN (OLD.Utilite = 'Commun' AND OLD.Type = 'Depense') OR (NEW.Utilite = 'Commun' AND NEW.Type = 'Depense')
+    BEGIN
+        DELETE FROM reglement_periodes WHERE Periode IN (substr(OLD.Date, 1, 7), substr(NEW.Date, 1, 7));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_suppression AFTER DELETE ON transactions
+    WHEN OLD.Utilite = 'Commun' AND OLD.Type = 'Depense'
+    BEGIN
+        DELETE FROM reglement_periodes WHERE Periode = substr(OLD.Date, 1, 7);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_taux_insertion AFTER INSERT ON taux_change
+    BEGIN
+        DELETE FROM reglement_periodes;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_taux_modification AFTER UPDATE ON taux_change
+    BEGIN
+        DELETE FROM reglement_periodes;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reglement_taux_suppression AFTER DELETE ON taux_change
+    BEGIN
+        DELETE FROM reglement_periodes;
+    END
+    """,
+)
+
+# Tiennent à jour les dépenses cumulées par mois, auteur, utilité et devise (depenses_periodes) :
+# vérifier une limite de budget ne demande ainsi jamais de re-sommer le mois
+TRIGGERS_BUDGETS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS budget_insertion AFTER INSERT ON transactions
+    WHEN NEW.Type = 'Depense'
+    BEGIN
+        INSERT INTO depenses_periodes (Periode, AuteurID, Utilite, Devise, Depenses)
+        VALUES (substr(NEW.Date, 1, 7), NEW.AuteurID, NEW.Utilite, NEW.Devise, NEW.Montant)
+        ON CONFLICT (Periode, AuteurID, Utilite, Devise) DO UPDATE SET Depenses = Depenses + excluded.Depenses;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS budget_modification
+    AFTER UPDATE OF Date, Montant, Type, Utilite, AuteurID, Devise ON transactions
+    WHEN OLD.Type = 'Depense' OR NEW.Type = 'Depense'
+    BEGIN
+        UPDATE depenses_periodes SET Depenses = Depenses - OLD.Montant
+        WHERE OLD.Type = 'Depense' AND Periode = substr(OLD.Date, 1, 7) AND AuteurID = OLD.AuteurID
+          AND Utilite = OLD.Utilite AND Devise = OLD.Devise;
+        INSERT INTO depenses_periodes (Periode, AuteurID, Utilite, Devise, Depenses)
+        SELECT substr(NEW.Date, 1, 7), NEW.AuteurID, NEW.Utilite, NEW.Devise, NEW.Montant
+        WHERE NEW.Type = 'Depense'
+        ON CONFLICT (Periode, AuteurID, Utilite, Devise) DO UPDATE SET Depenses = Depenses + excluded.Depenses;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS budget_suppression AFTER DELETE ON transactions
+    WHEN OLD.Type = 'Depense'
+    BEGIN
+        UPDATE depenses_periodes SET Depenses = Depenses - OLD.Montant
+        WHERE Periode = substr(OLD.Date, 1, 7) AND AuteurID = OLD.AuteurID
+          AND Utilite = OLD.Utilite AND Devise = OLD.Devise;
+    END
+    """,
+)
+
+# Insertion d'une transaction avec son empreinte (?10) et son Uid (?11). SIGNALER rattache la ligne
+# à l'originale de même empreinte, ou au doublon approximatif ?12 ; IGNORER n'insère rien si
+# l'empreinte existe. Fournir l'Uid évite au trigger journal_insertion de réécrire chaque ligne.
+_COLONNES_INSERTION = """
+    INSERT INTO transactions
+        (Date, Montant, Type, Utilite, Description, AuteurID, CategorieID, Devise, RecurrenceID, Empreinte, Uid,
+         DoublonDe)
+"""
+INSERTION_SIGNALER = (
+    _COLONNES_INSERTION
+    + """
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11,
+            COALESCE((SELECT ID FROM transactions WHERE Empreinte = ?10 AND DoublonDe IS NULL), ?12))
+"""
+)
+INSERTION_IGNORER = (
+    _COLONNES_INSERTION
+    + """
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, NULL)
+    ON CONFLICT (Empreinte) WHERE DoublonDe IS NULL DO NOTHING
+"""
+)
+# Occurrences récurrentes : une occurrence déjà reçue d'une autre copie (même Uid) n'est pas recréée
+INSERTION_OCCURRENCES = INSERTION_SIGNALER + "    ON CONFLICT (Uid) DO NOTHING\n"
+
+# Transactions avec les noms d'auteur et de catégorie résolus (définition de la vue v_transactions)
+REQUETE_TRANSACTIONS = """
+    SELECT t.ID, t.Date, t.Montant, t.Devise, t.Type, t.Utilite, t.Description,
+           a.Nom AS Auteur, c.Nom AS Categorie, t.RecurrenceID
+    FROM transactions t
+    JOIN auteurs a ON a.ID = t.AuteurID
+    LEFT JOIN categories c ON c.ID = t.CategorieID
+"""
+
+
+def _normaliser_nom(nom: str) -> str:
+    """Supprime les espaces superflus d'un nom d'auteur ou de catégorie"""
+    return " ".join(nom.split())
+
+
+@lru_cache(maxsize=256)
+def _normaliser_devise(devise: str) -> str:
+    """Normalise un code de devise ISO 4217 (3 lettres) en majuscules"""
+    code = devise.strip().upper()
+    if not re.fullmatch(r"[A-Z]{3}", code):
+        raise ValueError(f"Code de devise invalide: {devise}")
+    return code
+
+
+def _bornes_periode(annee: int = None, mois: int = None) -> Tuple[Optional[str], Optional[str]]:
+    """Retourne les dates de début (incluse) et de fin (exclue) d'un mois, ou (None, None) sans filtre"""
+    if not (annee and mois):
+        return None, None
+    if mois == 12:
+        return f"{annee}-12-01", f"{annee + 1}-01-01"
+    return f"{annee}-{mois:02d}-01", f"{annee}-{mois + 1:02d}-01"
+
+
+def _cle_libelle(libelle: Tuple) -> Tuple:
+    """Clé de tri d'un libellé de tableau croisé, les valeurs absentes (None) en premier"""
+    return tuple((valeur is not None, valeur) for valeur in libelle)
+
+
+def _normaliser_description(description: Optional[str]) -> str:
+    """Réduit une description à ses mots : sans accents, casse, ponctuation ni espaces superflus"""
+    texte = description or ""
+    if not texte.isascii():
+        texte = "".join(c for c in unicodedata.normalize("NFKD", texte) if not unicodedata.combining(c))
+    return " ".join(_SEPARATEURS_MOTS.split(texte.casefold())).strip()
+
+
+def calculer_empreinte(date: str, montant: float, description: Optional[str], auteur: str) -> int:
+    """
+    Calcule l'empreinte d'une transaction, identique pour deux imports de la même ligne
+
+    Args:
+        date: Date (YYYY-MM-DD)
+        montant: Montant, arrondi au centime
+        description: Description, normalisée par _normaliser_description
+        auteur: Nom de l'auteur, sans tenir compte de la casse
+
+    Returns:
+        Hachage BLAKE2 sur 64 bits, stocké en entier signé
+    """
+    cle = "|".join((date, f"{montant:.2f}", _normaliser_description(description), _normaliser_nom(auteur).casefold()))
+    return int.from_bytes(hashlib.blake2b(cle.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def _ajouter_candidat(
+    candidats: Dict, transaction_id: int, date: str, montant: float, description: Optional[str], auteur_id: int
+):
+    """Ajoute une transaction originale aux candidats de la détection approximative"""
+    cle = (auteur_id, round(montant * 100))
+    candidats.setdefault(cle, []).append(
+        (Date.fromisoformat(date).toordinal(), transaction_id, _normaliser_description(description))
+    )
+
+
+def _doublon_approximatif(
+    candidats: Dict, ligne: Tuple, tolerance_jours: int, seuil_description: float
+) -> Optional[int]:
+    """
+    Cherche parmi les candidats la transaction la plus proche d'une ligne à insérer
+
+    Même auteur, même montant au centime, dates à tolerance_jours près et
+    descriptions similaires au moins à seuil_description.
+
+    Returns:
+        ID de la transaction la plus proche, ou None
+    """
+    date, montant, _, _, description, auteur_id = ligne[:6]
+    jour = Date.fromisoformat(date).toordinal()
+    reference = _normaliser_description(description)
+
+    meilleur, meilleure_similarite = None, seuil_description
+    for jour_candidat, candidat_id, description_candidat in candidats.get((auteur_id, round(montant * 100)), ()):
+        if abs(jour_candidat - jour) > tolerance_jours:
+            continue
+        similarite = difflib.SequenceMatcher(None, reference, description_candidat).ratio()
+        if similarite >= meilleure_similarite:
+            meilleur, meilleure_similarite = candidat_id, similarite
+    return meilleur
+
+
+def _uid_occurrence(uid_regle: str, date: str) -> str:
+    """
+    Calcule l'Uid d'une occurrence récurrente
+
+    Il ne dépend que de la règle et de la date : deux copies de la base qui
+    partagent une règle créent chacune ses occurrences sous les mêmes Uid,
+    et la synchronisation les fusionne au lieu de les dupliquer.
+    """
+    return uuid.uuid5(uuid.UUID(uid_regle), date).hex
+
+
+def _occurrences_recurrence(frequence: str, date_debut: str, apres: str, avant: str) -> List[str]:
+    """
+    Calcule les dates d'occurrence d'une règle récurrente dans [apres, avant[
+
+    Le jour du mois de la date de début est conservé, ramené au dernier jour
+    du mois si besoin (31 -> 30, 29 février -> 28).
+
+    Args:
+        frequence: 'hebdomadaire', 'mensuelle' ou 'annuelle'
+        date_debut: Première occurrence de la règle (YYYY-MM-DD)
+        apres: Borne basse incluse (YYYY-MM-DD)
+        avant: Borne haute exclue (YYYY-MM-DD)
+
+    Returns:
+        Liste des dates (YYYY-MM-DD) triées
+    """
+    debut = Date.fromisoformat(date_debut)
+    borne_basse = max(Date.fromisoformat(apres), debut)
+    borne_haute = Date.fromisoformat(avant)
+
+    # Démarrer près de la borne basse plutôt qu'à la première occurrence
+    if frequence == "hebdomadaire":
+        n = max(0, (borne_basse - debut).days // 7)
+    elif frequence == "mensuelle":
+        n = max(0, (borne_basse.year - debut.year) * 12 + borne_basse.month - debut.month - 1)
+    else:
+        n = max(0, borne_basse.year - debut.year - 1)
+
+    dates = []
+    while True:
+        if frequence == "hebdomadaire":
+            occurrence = debut + timedelta(weeks=n)
+        else:
+            mois_total = debut.month - 1 + (n if frequence == "mensuelle" else 12 * n)
+            annee, mois = debut.year + mois_total // 12, mois_total % 12 + 1
+            jour = min(debut.day, calendar.monthrange(annee, mois)[1])
+            occurrence = Date(annee, mois, jour)
+
+        if occurrence >= borne_haute:
+            return dates
+        if occurrence >= borne_basse:
+            dates.append(occurrence.isoformat())
+        n += 1
+
+
+def _mois_suivant(periode: str) -> str:
+    """Retourne le mois 'YYYY-MM' qui suit un mois 'YYYY-MM'"""
+    annee, mois = int(periode[:4]), int(periode[5:7])
+    return f"{annee + 1}-01" if mois == 12 else f"{annee}-{mois + 1:02d}"
+
+
+def _periodes(debut: str, fin: str) -> List[str]:
+    """Retourne les mois 'YYYY-MM' de debut (inclus) à fin (exclu)"""
+    periodes = []
+    while debut < fin:
+        periodes.append(debut)
+        debut = _mois_suivant(debut)
+    return periodes
+
+
+def _virements_minimaux(soldes: Dict[str, float]) -> List[Tuple[str, str, float]]:
+    """
+    Calcule les virements qui équilibrent des soldes nets
+
+    Le plus gros débiteur rembourse le plus gros créancier, jusqu'à épuisement
+    de l'un des deux : au plus n - 1 virements pour n personnes.
+
+    Args:
+        soldes: {personne: solde}, positif si on lui doit de l'argent
+
+    Returns:
+        Liste de tuples (débiteur, créancier, montant)
+    """
+    crediteurs = sorted(([solde, nom] for nom, solde in soldes.items() if solde > 0.005), reverse=True)
+    debiteurs = sorted(([-solde, nom] for nom, solde in soldes.items() if solde < -0.005), reverse=True)
+
+    virements = []
+    i = j = 0
+    while i < len(debiteurs) and j < len(crediteurs):
+        montant = min(debiteurs[i][0], crediteurs[j][0])
+        virements.append((debiteurs[i][1], crediteurs[j][1], round(montant, 2)))
+        debiteurs[i][0] -= montant
+        crediteurs[j][0] -= montant
+        if debiteurs[i][0] < 0.005:
+            i += 1
+        if crediteurs[j][0] < 0.005:
+            j += 1
+
+    return virements
 
 
 class BudgetDatabase:
@@ -16,6 +484,11 @@ class BudgetDatabase:
         self.db_name = db_name
         self.conn = None
         self.cursor = None
+        self._recurrences_materialisees_avant = None
+        self._invalider_dimensions()
+        self.devise_rapport = DEVISE_REFERENCE
+        self._taux_charges = None
+        self._taux_conversion = lru_cache(maxsize=65536)(self._calculer_taux_conversion)
         self._connect()
         self._create_table()
 
@@ -23,323 +496,2107 @@ class BudgetDatabase:
         """Établit la connexion à la base de données"""
         self.conn = sqlite3.connect(self.db_name)
         self.cursor = self.conn.cursor()
+        self.conn.create_function("taux_vers_rapport", 2, self._taux_vers_rapport)
 
     def _create_table(self):
-        """Crée la table des transactions si elle n'existe pas"""
+        """Crée les tables si elles n'existent pas et migre les anciens schémas"""
+        for table in ("auteurs", "categories"):
+            self.cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    Nom TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            """
+            )
+        self.cursor.execute(SCHEMA_TRANSACTIONS.format(table="transactions"))
+        self.cursor.execute(SCHEMA_RECURRENCES.format(table="recurrences"))
+        self._ajouter_colonne("transactions", "RecurrenceID", "INTEGER REFERENCES recurrences(ID)")
+
+        # Anciennes bases : Auteur stocké en texte sur chaque ligne
+        for table, schema in (("transactions", SCHEMA_TRANSACTIONS), ("recurrences", SCHEMA_RECURRENCES)):
+            if "Auteur" in self._colonnes(table):
+                self._encoder_auteurs(table, schema)
+
+        for table in ("transactions", "recurrences"):
+            self._ajouter_colonne(table, "Devise", "TEXT NOT NULL DEFAULT 'EUR'")
         self.cursor.execute(
             """
-            CREATE TABLE IF NOT EXISTS transactions (
-                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            CREATE TABLE IF NOT EXISTS taux_change (
+                Devise TEXT NOT NULL,
                 Date TEXT NOT NULL,
-                Montant REAL NOT NULL,
-                Type TEXT NOT NULL CHECK(Type IN ('Revenu', 'Depense')),
-                Utilite TEXT NOT NULL CHECK(Utilite IN ('Commun', 'Perso')),
-                Description TEXT,
-                Auteur TEXT NOT NULL
+                Taux REAL NOT NULL CHECK(Taux > 0),
+                PRIMARY KEY (Devise, Date)
             )
         """
         )
-        self.conn.commit()
 
-    def ajouter_entree(
-        self, date: str, montant: float, type_transaction: str, utilite: str, description: str, auteur: str
-    ) -> int:
+        # Index des dates : filtres par période et tri chronologique de iterer_transactions sans parcourir la table.
+        # Il couvre aussi les colonnes des tableaux croisés par mois, auteur, utilité et type, qui ne lisent pas
+        # la table (tableau de bord). Anciennes bases : remplace l'index limité à la date.
+        self.cursor.execute("DROP INDEX IF EXISTS idx_transactions_date")
+        self.cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_transactions_periodes
+            ON transactions(Date, ID, AuteurID, Utilite, Type, Devise, Montant)
         """
-        Ajoute une nouvelle transaction
+        )
 
-        Args:
-            date: Date au format YYYY-MM-DD
-            montant: Montant de la transaction
-            type_transaction: 'Revenu' ou 'Depense'
-            utilite: 'Commun' ou 'Perso'
-            description: Description de la transaction
-            auteur: Nom de l'auteur
+        # La vue est recréée pour suivre les colonnes ajoutées au schéma
+        self.cursor.execute("DROP VIEW IF EXISTS v_transactions")
+        self.cursor.execute(f"CREATE VIEW v_transactions AS {REQUETE_TRANSACTIONS}")
+        self._create_journal()
+        self._create_empreintes()
+        self._create_reglements()
+        self._create_budgets()
+        self.conn.commit()
 
-        Returns:
-            ID de la transaction créée
+    def _create_journal(self):
+        """
+        Crée le journal des modifications et les triggers qui l'alimentent
+
+        Chaque transaction reçoit un identifiant global (Uid) commun à toutes
+        les copies de la base. Les triggers enregistrent chaque insertion,
+        modification et suppression, quel que soit le chemin utilisé, avec un
+        numéro de séquence croissant. Le journal est en ajout seul.
         """
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS meta (Cle TEXT PRIMARY KEY, Valeur TEXT)")
+        self.cursor.execute("INSERT OR IGNORE INTO meta (Cle, Valeur) VALUES ('uid_base', ?)", (uuid.uuid4().hex,))
+
+        self._ajouter_colonne("transactions", "Uid", "TEXT")
+        self.cursor.execute(
+            "SELECT ID, Date, Montant, Type, Utilite, Description, Auteur FROM v_transactions "
+            "WHERE ID IN (SELECT ID FROM transactions WHERE Uid IS NULL)"
+        )
+        # Uid déterministe pour les lignes existantes : deux copies d'un même
+        # fichier attribuent ainsi le même Uid aux mêmes lignes
+        uids = [(uuid.uuid5(uuid.NAMESPACE_OID, "|".join(map(str, row))).hex, row[0]) for row in self.cursor.fetchall()]
+        self.cursor.executemany("UPDATE transactions SET Uid = ? WHERE ID = ?", uids)
+        self.cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_uid ON transactions(Uid)")
+
+        # Uid des règles récurrentes, dont dérive celui de chaque occurrence (voir _uid_occurrence)
+        self._ajouter_colonne("recurrences", "Uid", "TEXT")
         self.cursor.execute(
             """
-            INSERT INTO transactions (Date, Montant, Type, Utilite, Description, Auteur)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (date, montant, type_transaction, utilite, description, auteur),
+            SELECT r.ID, r.Frequence, r.DateDebut, r.Montant, r.Type, r.Utilite, r.Description, a.Nom
+            FROM recurrences r
+            JOIN auteurs a ON a.ID = r.AuteurID
+            WHERE r.Uid IS NULL
+        """
         )
-        self.conn.commit()
-        return self.cursor.lastrowid
+        uids = [(uuid.uuid5(uuid.NAMESPACE_OID, "|".join(map(str, row))).hex, row[0]) for row in self.cursor.fetchall()]
+        self.cursor.executemany("UPDATE recurrences SET Uid = ? WHERE ID = ?", uids)
 
-    def supprimer_entree(self, transaction_id: int) -> bool:
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'journal'")
+        nouveau_journal = self.cursor.fetchone() is None
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                Seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                Uid TEXT NOT NULL,
+                Operation TEXT NOT NULL CHECK(Operation IN ('I', 'U', 'D'))
+            )
         """
-        Supprime une transaction par son ID
+        )
+        if nouveau_journal:
+            # Les lignes déjà présentes forment l'état initial : "changements depuis 0" = toute la base
+            self.cursor.execute("INSERT INTO journal (Uid, Operation) SELECT Uid, 'I' FROM transactions ORDER BY ID")
 
-        Args:
-            transaction_id: ID de la transaction à supprimer
+        # Anciennes bases : le trigger journalisait aussi les colonnes techniques (Empreinte, RecurrenceID...)
+        self.cursor.execute("DROP TRIGGER IF EXISTS journal_modification")
+        for trigger in TRIGGERS_JOURNAL:
+            self.cursor.execute(trigger)
 
-        Returns:
-            True si la suppression a réussi, False sinon
+    def _create_empreintes(self):
         """
-        self.cursor.execute("DELETE FROM transactions WHERE ID = ?", (transaction_id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        Calcule l'empreinte des transactions qui n'en ont pas et crée l'index unique
 
-    def modifier_entree(
-        self,
-        transaction_id: int,
-        date: str = None,
-        montant: float = None,
-        type_transaction: str = None,
-        utilite: str = None,
-        description: str = None,
-        auteur: str = None,
-    ) -> bool:
+        L'index ne porte que sur les lignes non signalées comme doublons : une
+        empreinte donnée n'y apparaît qu'une fois, ce qui rend la détection O(1).
+        Parmi des lignes existantes identiques, la plus ancienne est l'originale ;
+        les triggers TRIGGERS_DOUBLONS la remplacent si elle est supprimée ou modifiée.
         """
-        Modifie une transaction existante
-
-        Args:
-            transaction_id: ID de la transaction à modifier
-            date: Nouvelle date (optionnel)
-            montant: Nouveau montant (optionnel)
-            type_transaction: Nouveau type (optionnel)
-            utilite: Nouvelle utilité (optionnel)
-            description: Nouvelle description (optionnel)
-            auteur: Nouvel auteur (optionnel)
+        for colonne in ("Empreinte", "DoublonDe"):
+            self._ajouter_colonne("transactions", colonne, "INTEGER")
 
-        Returns:
-            True si la modification a réussi, False sinon
+        self.cursor.execute(
+            """
+            SELECT t.ID, t.Date, t.Montant, t.Description, a.Nom
+            FROM transactions t
+            JOIN auteurs a ON a.ID = t.AuteurID
+            WHERE t.Empreinte IS NULL
+            ORDER BY t.ID
         """
-        # Récupérer la transaction actuelle
-        self.cursor.execute("SELECT * FROM transactions WHERE ID = ?", (transaction_id,))
-        transaction = self.cursor.fetchone()
+        )
+        rows = self.cursor.fetchall()
+        if rows:
+            self.cursor.execute(
+                "SELECT Empreinte, ID FROM transactions WHERE Empreinte IS NOT NULL AND DoublonDe IS NULL"
+            )
+            originales = dict(self.cursor.fetchall())
+
+            empreintes = []
+            for transaction_id, date, montant, description, auteur in rows:
+                empreinte = calculer_empreinte(date, montant, description, auteur)
+                empreintes.append((empreinte, originales.setdefault(empreinte, transaction_id), transaction_id))
+            self.cursor.executemany(
+                "UPDATE transactions SET Empreinte = ?, DoublonDe = NULLIF(?, ID) WHERE ID = ?", empreintes
+            )
 
-        if not transaction:
-            return False
+        self.cursor.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_empreinte
+            ON transactions(Empreinte) WHERE DoublonDe IS NULL
+        """
+        )
 
-        # Utiliser les valeurs actuelles si aucune nouvelle valeur n'est fournie
-        colonnes = [desc[0] for desc in self.cursor.description]
-        trans_dict = dict(zip(colonnes, transaction))
+        # Index partiel des doublons : retrouver ceux d'une originale ne parcourt pas la table
+        self.cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_transactions_doublons
+            ON transactions(DoublonDe) WHERE DoublonDe IS NOT NULL
+        """
+        )
+        for trigger in TRIGGERS_DOUBLONS:
+            self.cursor.execute(trigger)
 
-        new_date = date if date is not None else trans_dict["Date"]
-        new_montant = montant if montant is not None else trans_dict["Montant"]
-        new_type = type_transaction if type_transaction is not None else trans_dict["Type"]
-        new_utilite = utilite if utilite is not None else trans_dict["Utilite"]
-        new_description = description if description is not None else trans_dict["Description"]
-        new_auteur = auteur if auteur is not None else trans_dict["Auteur"]
+    def _create_reglements(self):
+        """
+        Crée les tables de répartition et de cache des dépenses communes
 
+        reglement_paiements garde, pour chaque mois clos, ce que chaque auteur
+        a payé en dépenses communes ; un mois n'est valide en cache que s'il
+        figure dans reglement_periodes, dont les triggers le retirent dès qu'une
+        de ses dépenses communes change.
+        """
         self.cursor.execute(
             """
-            UPDATE transactions 
-            SET Date = ?, Montant = ?, Type = ?, Utilite = ?, Description = ?, Auteur = ?
-            WHERE ID = ?
-        """,
-            (new_date, new_montant, new_type, new_utilite, new_description, new_auteur, transaction_id),
+            CREATE TABLE IF NOT EXISTS repartition (
+                AuteurID INTEGER PRIMARY KEY REFERENCES auteurs(ID),
+                Part REAL NOT NULL CHECK(Part > 0)
+            )
+        """
+        )
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reglement_periodes (
+                Periode TEXT NOT NULL,
+                Devise TEXT NOT NULL,
+                PRIMARY KEY (Periode, Devise)
+            )
+        """
         )
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reglement_paiements (
+                Periode TEXT NOT NULL,
+                Devise TEXT NOT NULL,
+                AuteurID INTEGER NOT NULL,
+                Paye REAL NOT NULL,
+                PRIMARY KEY (Periode, Devise, AuteurID)
+            )
+        """
+        )
+        for trigger in TRIGGERS_REGLEMENT:
+            self.cursor.execute(trigger)
 
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        # Index partiel : seules les dépenses communes y figurent, le mois en cours est lu sans parcourir la table
+        self.cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_transactions_communes
+            ON transactions(Date) WHERE Utilite = 'Commun' AND Type = 'Depense'
+        """
+        )
 
-    def obtenir_transaction_par_id(self, transaction_id: int) -> Optional[Dict]:
+    def _create_budgets(self):
         """
-        Récupère une transaction par son ID
+        Crée la table des limites de budget et les dépenses cumulées par mois
 
-        Args:
-            transaction_id: ID de la transaction
+        depenses_periodes est remplie une fois à partir des transactions
+        existantes, puis tenue à jour par les triggers TRIGGERS_BUDGETS.
+        """
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS budgets (
+                AuteurID INTEGER NOT NULL DEFAULT 0,
+                Utilite TEXT NOT NULL DEFAULT '' CHECK(Utilite IN ('', 'Commun', 'Perso')),
+                Limite REAL NOT NULL CHECK(Limite > 0),
+                Devise TEXT NOT NULL DEFAULT 'EUR',
+                PRIMARY KEY (AuteurID, Utilite)
+            )
+        """
+        )
 
-        Returns:
-            Dictionnaire contenant la transaction ou None
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'depenses_periodes'")
+        nouvelle_table = self.cursor.fetchone() is None
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS depenses_periodes (
+                Periode TEXT NOT NULL,
+                AuteurID INTEGER NOT NULL,
+                Utilite TEXT NOT NULL,
+                Devise TEXT NOT NULL,
+                Depenses REAL NOT NULL,
+                PRIMARY KEY (Periode, AuteurID, Utilite, Devise)
+            )
         """
-        self.cursor.execute("SELECT * FROM transactions WHERE ID = ?", (transaction_id,))
-        row = self.cursor.fetchone()
+        )
+        if nouvelle_table:
+            self.cursor.execute(
+                """
+                INSERT INTO depenses_periodes (Periode, AuteurID, Utilite, Devise, Depenses)
+                SELECT substr(Date, 1, 7), AuteurID, Utilite, Devise, SUM(Montant)
+                FROM transactions
+                WHERE Type = 'Depense'
+                GROUP BY 1, 2, 3, 4
+            """
+            )
 
-        if row:
-            colonnes = [desc[0] for desc in self.cursor.description]
-            return dict(zip(colonnes, row))
-        return None
+        for trigger in TRIGGERS_BUDGETS:
+            self.cursor.execute(trigger)
 
-    def obtenir_transactions_mois(
-        self, annee: int, mois: int, type_transaction: Optional[str] = None, auteur: Optional[str] = None
-    ) -> List[Dict]:
-        """
-        Récupère les transactions d'un mois spécifique
+    def _colonnes(self, table: str) -> List[str]:
+        """Retourne les noms des colonnes d'une table"""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in self.cursor.fetchall()]
 
-        Args:
-            annee: Année (ex: 2024)
-            mois: Mois (1-12)
-            type_transaction: Filtre optionnel 'Revenu' ou 'Depense'
-            auteur: Filtre optionnel par auteur
+    def _ajouter_colonne(self, table: str, colonne: str, definition: str):
+        """Ajoute une colonne à une table existante si elle n'existe pas encore"""
+        if colonne not in self._colonnes(table):
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {colonne} {definition}")
 
-        Returns:
-            Liste de dictionnaires contenant les transactions
+    def _encoder_auteurs(self, table: str, schema: str):
         """
-        date_debut = f"{annee}-{mois:02d}-01"
-        if mois == 12:
-            date_fin = f"{annee + 1}-01-01"
-        else:
-            date_fin = f"{annee}-{mois + 1:02d}-01"
-
-        query = "SELECT * FROM transactions WHERE Date >= ? AND Date < ?"
-        params = [date_debut, date_fin]
+        Remplace la colonne texte Auteur d'une table par une clé vers la table auteurs
 
-        if type_transaction:
-            query += " AND Type = ?"
-            params.append(type_transaction)
+        La table est reconstruite (SQLite ne sait pas modifier le type d'une
+        colonne) en conservant les IDs et le compteur AUTOINCREMENT.
+        """
+        colonnes = [c for c in self._colonnes(table) if c != "Auteur"]
+        self.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        sequence = self.cursor.fetchone()
 
-        if auteur:
-            query += " AND Auteur = ?"
-            params.append(auteur)
+        self.cursor.execute("DROP VIEW IF EXISTS v_transactions")
+        self.cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS correspondance_auteurs (Auteur TEXT PRIMARY KEY, ID INTEGER)"
+        )
+        self.cursor.execute(f"SELECT DISTINCT Auteur FROM {table}")
+        correspondance = [(auteur, self._id_dimension("auteurs", auteur)) for (auteur,) in self.cursor.fetchall()]
+        self.cursor.executemany("INSERT OR REPLACE INTO correspondance_auteurs VALUES (?, ?)", correspondance)
 
-        self.cursor.execute(query, params)
-        colonnes = [desc[0] for desc in self.cursor.description]
+        self.cursor.execute(schema.format(table=f"{table}_migration"))
+        self.cursor.execute(
+            f"""
+            INSERT INTO {table}_migration ({", ".join(colonnes)}, AuteurID)
+            SELECT {", ".join("t." + c for c in colonnes)}, a.ID
+            FROM {table} t JOIN correspondance_auteurs a ON a.Auteur = t.Auteur
+        """
+        )
+        self.cursor.execute(f"DROP TABLE {table}")
+        self.cursor.execute(f"ALTER TABLE {table}_migration RENAME TO {table}")
 
-        return [dict(zip(colonnes, row)) for row in self.cursor.fetchall()]
+        if sequence:
+            self.cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (sequence[0], table))
 
-    def obtenir_totaux_mois(self, annee: int, mois: int) -> Dict[str, Dict[str, float]]:
+    def _id_dimension(self, table: str, nom: Optional[str]) -> Optional[int]:
         """
-        Calcule les totaux revenus/dépenses par personne pour un mois
+        Retourne l'ID d'un nom dans une table de dimension, en le créant si besoin
+
+        Les espaces superflus sont supprimés et la comparaison ignore la casse,
+        de sorte que 'alice ' et 'Alice' désignent la même entrée.
 
         Args:
-            annee: Année
-            mois: Mois (1-12)
+            table: 'auteurs' ou 'categories'
+            nom: Nom à encoder (None renvoie None)
 
         Returns:
-            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+            ID entier de l'entrée
         """
-        transactions = self.obtenir_transactions_mois(annee, mois)
-        totaux = {}
-
-        for trans in transactions:
-            auteur = trans["Auteur"]
-            if auteur not in totaux:
-                totaux[auteur] = {"revenus": 0.0, "depenses": 0.0}
+        if nom is None:
+            return None
+
+        nom = _normaliser_nom(nom)
+        cache = self._ids_dimensions[table]
+        if nom not in cache:
+            self.cursor.execute(f"INSERT OR IGNORE INTO {table} (Nom) VALUES (?)", (nom,))
+            self.cursor.execute(f"SELECT ID FROM {table} WHERE Nom = ?", (nom,))
+            cache[nom] = self.cursor.fetchone()[0]
+        return cache[nom]
+
+    def _chercher_id_dimension(self, table: str, nom: str) -> Optional[int]:
+        """
+        Retourne l'ID d'un nom dans une table de dimension, sans le créer
 
-            if trans["Type"] == "Revenu":
-                totaux[auteur]["revenus"] += trans["Montant"]
-            else:
-                totaux[auteur]["depenses"] += trans["Montant"]
+        Args:
+            table: 'auteurs' ou 'categories'
+            nom: Nom recherché
 
-        return totaux
+        Returns:
+            ID entier de l'entrée, None si le nom est inconnu
+        """
+        nom = _normaliser_nom(nom)
+        if nom not in self._ids_dimensions[table]:
+            self.cursor.execute(f"SELECT ID FROM {table} WHERE Nom = ?", (nom,))
+            row = self.cursor.fetchone()
+            if row is None:
+                return None
+            self._ids_dimensions[table][nom] = row[0]
+        return self._ids_dimensions[table][nom]
+
+    def _invalider_dimensions(self):
+        """Vide le cache nom -> ID des tables de dimension"""
+        self._ids_dimensions = {"auteurs": {}, "categories": {}}
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Valide la transaction en cours, ou l'annule en cas d'erreur
 
-    def obtenir_totaux_globaux(self) -> Dict[str, Dict[str, float]]:
+        Une annulation défait aussi les auteurs et catégories créés par
+        _id_dimension : leur cache est alors vidé pour ne pas garder d'ID orphelin.
         """
-        Calcule les totaux revenus/dépenses par personne sur toute la base
+        try:
+            with self.conn:
+                yield
+        except BaseException:
+            self._invalider_dimensions()
+            raise
+
+    def _noms_dimension(self, table: str) -> Dict[int, str]:
+        """Retourne la correspondance ID -> nom d'une table de dimension"""
+        self.cursor.execute(f"SELECT ID, Nom FROM {table}")
+        return dict(self.cursor.fetchall())
+
+    def obtenir_auteurs(self) -> List[str]:
+        """
+        Récupère la liste des auteurs connus
 
         Returns:
-            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+            Liste des noms triés
         """
-        self.cursor.execute(
-            """
-            SELECT Auteur, Type, SUM(Montant) as Total
-            FROM transactions
-            GROUP BY Auteur, Type
+        return sorted(self._noms_dimension("auteurs").values(), key=str.lower)
+
+    def obtenir_categories(self) -> List[str]:
         """
-        )
+        Récupère la liste des catégories connues
 
-        totaux = {}
-        for row in self.cursor.fetchall():
-            auteur, type_trans, total = row
-            if auteur not in totaux:
-                totaux[auteur] = {"revenus": 0.0, "depenses": 0.0}
+        Returns:
+            Liste des noms triés
+        """
+        return sorted(self._noms_dimension("categories").values(), key=str.lower)
 
-            if type_trans == "Revenu":
-                totaux[auteur]["revenus"] = total
-            else:
-                totaux[auteur]["depenses"] = total
+    def definir_taux(self, devise: str, date: str, taux: float):
+        """
+        Enregistre le taux de change d'une devise à une date
 
-        return totaux
+        Args:
+            devise: Code de la devise (ex: 'USD')
+            date: Date d'effet du taux (YYYY-MM-DD)
+            taux: Valeur d'une unité de la devise en DEVISE_REFERENCE
+        """
+        self.definir_taux_en_masse([(devise, date, taux)])
 
-    def obtenir_depenses_par_utilite(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+    def definir_taux_en_masse(self, lignes: Iterable[Tuple[str, str, float]], remplacer: bool = True) -> int:
         """
-        Calcule les dépenses par utilité (Commun/Perso)
+        Enregistre une série de taux de change en une seule transaction
 
         Args:
-            annee: Filtre optionnel par année
-            mois: Filtre optionnel par mois
+            lignes: Tuples (devise, date, taux)
+            remplacer: Remplace un taux existant à la même date (sinon il est conservé)
 
         Returns:
-            Dict avec structure {'Commun': montant, 'Perso': montant}
+            Nombre de taux enregistrés
         """
-        query = "SELECT Utilite, SUM(Montant) as Total FROM transactions WHERE Type = 'Depense'"
-        params = []
-
-        if annee and mois:
-            date_debut = f"{annee}-{mois:02d}-01"
-            if mois == 12:
-                date_fin = f"{annee + 1}-01-01"
-            else:
-                date_fin = f"{annee}-{mois + 1:02d}-01"
-            query += " AND Date >= ? AND Date < ?"
-            params = [date_debut, date_fin]
+        lignes = [(_normaliser_devise(devise), date, taux) for devise, date, taux in lignes]
+        conflit = "REPLACE" if remplacer else "IGNORE"
+        with self._transaction():
+            self.cursor.executemany(
+                f"INSERT OR {conflit} INTO taux_change (Devise, Date, Taux) VALUES (?, ?, ?)", lignes
+            )
+            nb_taux = self.cursor.rowcount if lignes else 0
+        self._invalider_taux()
+        return nb_taux
 
-        query += " GROUP BY Utilite"
+    def obtenir_taux(self, devise: str) -> List[Tuple[str, float]]:
+        """
+        Récupère l'historique des taux d'une devise
 
-        self.cursor.execute(query, params)
+        Args:
+            devise: Code de la devise
 
-        result = {"Commun": 0.0, "Perso": 0.0}
-        for row in self.cursor.fetchall():
-            utilite, total = row
-            result[utilite] = total
+        Returns:
+            Liste de tuples (date, taux) triée par date
+        """
+        self.cursor.execute(
+            "SELECT Date, Taux FROM taux_change WHERE Devise = ? ORDER BY Date", (_normaliser_devise(devise),)
+        )
+        return self.cursor.fetchall()
 
-        return result
+    def obtenir_taux_change(self) -> List[Tuple[str, str, float]]:
+        """
+        Récupère tous les taux de change enregistrés
 
-    def obtenir_revenus_totaux(self, annee: int = None, mois: int = None) -> float:
+        Returns:
+            Liste de tuples (devise, date, taux) triée par devise puis date
         """
-        Calcule le total des revenus
+        self.cursor.execute("SELECT Devise, Date, Taux FROM taux_change ORDER BY Devise, Date")
+        return self.cursor.fetchall()
 
-        Args:
-            annee: Filtre optionnel par année
-            mois: Filtre optionnel par mois
+    def obtenir_devises(self) -> List[str]:
+        """
+        Récupère les devises utilisées par les transactions ou les taux de change
 
         Returns:
-            Montant total des revenus
+            Liste des codes triés
         """
-        query = "SELECT SUM(Montant) FROM transactions WHERE Type = 'Revenu'"
-        params = []
+        self.cursor.execute(
+            "SELECT Devise FROM transactions UNION SELECT Devise FROM taux_change UNION SELECT ?", (DEVISE_REFERENCE,)
+        )
+        return sorted(row[0] for row in self.cursor.fetchall())
 
-        if annee and mois:
-            date_debut = f"{annee}-{mois:02d}-01"
-            if mois == 12:
-                date_fin = f"{annee + 1}-01-01"
-            else:
-                date_fin = f"{annee}-{mois + 1:02d}-01"
-            query += " AND Date >= ? AND Date < ?"
-            params = [date_debut, date_fin]
+    def definir_devise_rapport(self, devise: str):
+        """
+        Change la devise dans laquelle les totaux et analyses sont exprimés
 
-        self.cursor.execute(query, params)
-        result = self.cursor.fetchone()[0]
-        return result if result else 0.0
+        Args:
+            devise: Code de la devise de rapport
+        """
+        self.devise_rapport = self._verifier_devise(devise)
 
-    def obtenir_revenus_par_auteur(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+    @property
+    def symbole_devise(self) -> str:
+        """Symbole de la devise de rapport, pour l'affichage"""
+        return SYMBOLES_DEVISES.get(self.devise_rapport, self.devise_rapport)
+
+    def convertir(self, montant: float, devise: str, date: str) -> float:
         """
-        Calcule les revenus par auteur
+        Convertit un montant dans la devise de rapport
 
         Args:
-            annee: Filtre optionnel par année
-            mois: Filtre optionnel par mois
+            montant: Montant exprimé dans la devise d'origine
+            devise: Devise d'origine
+            date: Date de la transaction (YYYY-MM-DD), le dernier taux connu à cette date est utilisé
 
         Returns:
-            Dict avec structure {auteur: montant}
+            Montant dans la devise de rapport
         """
-        query = "SELECT Auteur, SUM(Montant) as Total FROM transactions WHERE Type = 'Revenu'"
-        params = []
+        if devise == self.devise_rapport:
+            return montant
+        return montant * self._taux_vers_rapport(devise, date)
 
-        if annee and mois:
-            date_debut = f"{annee}-{mois:02d}-01"
-            if mois == 12:
-                date_fin = f"{annee + 1}-01-01"
-            else:
-                date_fin = f"{annee}-{mois + 1:02d}-01"
-            query += " AND Date >= ? AND Date < ?"
-            params = [date_debut, date_fin]
+    def _montant_converti(self) -> str:
+        """
+        Expression SQL du montant converti dans la devise de rapport
 
-        query += " GROUP BY Auteur"
+        Les lignes déjà dans la devise de rapport ne passent pas par Python ;
+        les autres appellent taux_vers_rapport, dont les résultats sont mis en cache.
+        """
+        # devise_rapport est validée par _normaliser_devise : 3 lettres majuscules
+        return f"Montant * CASE Devise WHEN '{self.devise_rapport}' THEN 1.0 ELSE taux_vers_rapport(Devise, Date) END"
 
-        self.cursor.execute(query, params)
+    def _taux_vers_rapport(self, devise: str, date: str) -> float:
+        """Fonction SQL taux_vers_rapport : taux d'une devise vers la devise de rapport à une date"""
+        return self._taux_conversion(devise, self.devise_rapport, date)
 
-        result = {}
-        for row in self.cursor.fetchall():
-            auteur, total = row
-            result[auteur] = total
+    def _calculer_taux_conversion(self, devise: str, devise_cible: str, date: str) -> float:
+        """Calcule le taux de conversion entre deux devises (mis en cache LRU par __init__)"""
+        return self._taux(devise, date) / self._taux(devise_cible, date)
 
-        return result
+    def _taux(self, devise: str, date: str) -> float:
+        """
+        Retourne la valeur d'une unité de devise en DEVISE_REFERENCE à une date
+
+        Le dernier taux connu à la date est utilisé, ou le premier taux connu
+        pour une date antérieure à tout l'historique.
+        """
+        if devise == DEVISE_REFERENCE:
+            return 1.0
+
+        taux_charges = self._charger_taux()
+        if devise not in taux_charges:
+            raise ValueError(f"Aucun taux de change pour la devise {devise} (montant du {date})")
+
+        dates, valeurs = taux_charges[devise]
+        return valeurs[max(bisect.bisect_right(dates, date) - 1, 0)]
+
+    def _charger_taux(self) -> Dict[str, Tuple[List[str], List[float]]]:
+        """Charge la table taux_change en mémoire (une fois, jusqu'à _invalider_taux)"""
+        if self._taux_charges is None:
+            self._taux_charges = {}
+            for devise_taux, date_taux, taux in self.conn.execute(
+                "SELECT Devise, Date, Taux FROM taux_change ORDER BY Devise, Date"
+            ):
+                dates, valeurs = self._taux_charges.setdefault(devise_taux, ([], []))
+                dates.append(date_taux)
+                valeurs.append(taux)
+        return self._taux_charges
+
+    def _verifier_devise(self, devise: str) -> str:
+        """
+        Normalise une devise et vérifie qu'elle peut être convertie
+
+        Une devise sans aucun taux de change est refusée (ValueError) dès
+        l'écriture : sinon tous les totaux échoueraient ensuite à la lecture.
+        """
+        code = _normaliser_devise(devise)
+        if code != DEVISE_REFERENCE and code not in self._charger_taux():
+            raise ValueError(f"Aucun taux de change pour la devise {code} : enregistrez-en un avant de l'utiliser")
+        return code
+
+    def _invalider_taux(self):
+        """Vide le cache des taux après une modification de la table taux_change"""
+        self._taux_charges = None
+        self._taux_conversion.cache_clear()
+
+    def ajouter_entree(
+        self,
+        date: str,
+        montant: float,
+        type_transaction: str,
+        utilite: str,
+        description: str,
+        auteur: str,
+        categorie: Optional[str] = None,
+        devise: str = DEVISE_REFERENCE,
+    ) -> int:
+        """
+        Ajoute une nouvelle transaction
+
+        Args:
+            date: Date au format YYYY-MM-DD
+            montant: Montant de la transaction
+            type_transaction: 'Revenu' ou 'Depense'
+            utilite: 'Commun' ou 'Perso'
+            description: Description de la transaction
+            auteur: Nom de l'auteur
+            categorie: Nom de la catégorie (optionnel)
+            devise: Devise du montant (par défaut DEVISE_REFERENCE)
+
+        Returns:
+            ID de la transaction créée (signalée comme doublon si une transaction identique existe)
+        """
+        self.cursor.execute(
+            INSERTION_SIGNALER,
+            (
+                date,
+                montant,
+                type_transaction,
+                utilite,
+                description,
+                self._id_dimension("auteurs", auteur),
+                self._id_dimension("categories", categorie),
+                self._verifier_devise(devise),
+                None,
+                calculer_empreinte(date, montant, description, auteur),
+                secrets.token_hex(16),
+                None,
+            ),
+        )
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def supprimer_entree(self, transaction_id: int) -> bool:
+        """
+        Supprime une transaction par son ID
+
+        Args:
+            transaction_id: ID de la transaction à supprimer
+
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        self.cursor.execute("DELETE FROM transactions WHERE ID = ?", (transaction_id,))
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    def modifier_entree(
+        self,
+        transaction_id: int,
+        date: str = None,
+        montant: float = None,
+        type_transaction: str = None,
+        utilite: str = None,
+        description: str = None,
+        auteur: str = None,
+        categorie: str = None,
+        devise: str = None,
+    ) -> bool:
+        """
+        Modifie une transaction existante
+
+        Args:
+            transaction_id: ID de la transaction à modifier
+            date: Nouvelle date (optionnel)
+            montant: Nouveau montant (optionnel)
+            type_transaction: Nouveau type (optionnel)
+            utilite: Nouvelle utilité (optionnel)
+            description: Nouvelle description (optionnel)
+            auteur: Nouvel auteur (optionnel)
+            categorie: Nouvelle catégorie (optionnel)
+            devise: Nouvelle devise (optionnel)
+
+        Returns:
+            True si la modification a réussi, False sinon
+        """
+        self.cursor.execute(
+            """
+            UPDATE transactions
+            SET Date = COALESCE(?, Date),
+                Montant = COALESCE(?, Montant),
+                Type = COALESCE(?, Type),
+                Utilite = COALESCE(?, Utilite),
+                Description = COALESCE(?, Description),
+                AuteurID = COALESCE(?, AuteurID),
+                CategorieID = COALESCE(?, CategorieID),
+                Devise = COALESCE(?, Devise)
+            WHERE ID = ?
+        """,
+            (
+                date,
+                montant,
+                type_transaction,
+                utilite,
+                description,
+                self._id_dimension("auteurs", auteur),
+                self._id_dimension("categories", categorie),
+                self._verifier_devise(devise) if devise else None,
+                transaction_id,
+            ),
+        )
+        modifiee = self.cursor.rowcount > 0
+
+        if modifiee and any(valeur is not None for valeur in (date, montant, description, auteur)):
+            self._recalculer_empreintes([transaction_id])
+        self.conn.commit()
+        return modifiee
+
+    def _construire_filtres(self, filtres: Optional[Dict] = None) -> Tuple[str, List]:
+        """
+        Traduit un dictionnaire de filtres en clause WHERE paramétrée
+
+        Args:
+            filtres: Dict dont les clés sont celles de FILTRES_TRANSACTIONS
+
+        Returns:
+            Tuple (clause SQL commençant par ' AND', paramètres)
+        """
+        clause = ""
+        params = []
+
+        for cle, valeur in (filtres or {}).items():
+            if cle not in FILTRES_TRANSACTIONS:
+                raise ValueError(f"Filtre inconnu: {cle}")
+            if valeur is None:
+                continue
+            if cle in ("auteur", "categorie"):
+                valeur = _normaliser_nom(valeur)
+            elif cle == "devise":
+                valeur = _normaliser_devise(valeur)
+            clause += f" AND {FILTRES_TRANSACTIONS[cle]}"
+            params.append(f"%{valeur}%" if cle == "description" else valeur)
+
+        return clause, params
+
+    def modifier_entrees(
+        self,
+        ids: Optional[List[int]] = None,
+        filtres: Optional[Dict] = None,
+        date: str = None,
+        montant: float = None,
+        type_transaction: str = None,
+        utilite: str = None,
+        description: str = None,
+        auteur: str = None,
+        categorie: str = None,
+        devise: str = None,
+    ) -> int:
+        """
+        Modifie en une seule transaction toutes les entrées sélectionnées
+
+        Les entrées sont sélectionnées par une liste d'IDs, par des filtres, ou
+        par les deux combinés. Seules les colonnes fournies sont modifiées.
+
+        Args:
+            ids: Liste d'IDs à modifier (optionnel)
+            filtres: Filtres de sélection, voir FILTRES_TRANSACTIONS (optionnel)
+            date: Nouvelle date (optionnel)
+            montant: Nouveau montant (optionnel)
+            type_transaction: Nouveau type (optionnel)
+            utilite: Nouvelle utilité (optionnel)
+            description: Nouvelle description (optionnel)
+            auteur: Nouvel auteur (optionnel)
+            categorie: Nouvelle catégorie (optionnel)
+            devise: Nouvelle devise (optionnel)
+
+        Returns:
+            Nombre de transactions modifiées
+        """
+        if ids is None and not filtres:
+            raise ValueError("Une liste d'IDs ou des filtres sont requis")
+        if ids is not None and not ids:
+            return 0
+
+        valeurs = {
+            "Date": date,
+            "Montant": montant,
+            "Type": type_transaction,
+            "Utilite": utilite,
+            "Description": description,
+            "AuteurID": self._id_dimension("auteurs", auteur),
+            "CategorieID": self._id_dimension("categories", categorie),
+            "Devise": self._verifier_devise(devise) if devise else None,
+        }
+        valeurs = {colonne: valeur for colonne, valeur in valeurs.items() if valeur is not None}
+        if not valeurs:
+            return 0
+
+        set_clause = ", ".join(f"{colonne} = ?" for colonne in valeurs)
+        clause, params = self._construire_filtres(filtres)
+        query = f"UPDATE transactions SET {set_clause} WHERE 1 = 1{clause}"
+        params = list(valeurs.values()) + params
+
+        recalculer = any(colonne in valeurs for colonne in ("Date", "Montant", "Description", "AuteurID"))
+        if recalculer and ids is None:
+            # Les filtres peuvent porter sur les colonnes modifiées : sélection avant la mise à jour
+            self.cursor.execute(f"SELECT ID FROM transactions WHERE 1 = 1{clause}", params[len(valeurs) :])
+            selection = [row[0] for row in self.cursor.fetchall()]
+        elif recalculer:
+            selection = list(ids)
+
+        with self._transaction():
+            if ids is None:
+                self.cursor.execute(query, params)
+            else:
+                self.cursor.executemany(query + " AND ID = ?", [params + [i] for i in ids])
+            nb_modifiees = self.cursor.rowcount
+
+            if recalculer:
+                self._recalculer_empreintes(selection)
+
+        return nb_modifiees
+
+    def _recalculer_empreintes(self, ids: List[int]):
+        """
+        Recalcule l'empreinte de transactions modifiées et leur statut de doublon
+
+        Args:
+            ids: IDs des transactions dont la date, le montant, la description ou l'auteur a changé
+        """
+        for debut in range(0, len(ids), 500):
+            lot = ids[debut : debut + 500]
+            self.cursor.execute(
+                f"""
+                SELECT t.ID, t.Date, t.Montant, t.Description, a.Nom
+                FROM transactions t
+                JOIN auteurs a ON a.ID = t.AuteurID
+                WHERE t.ID IN ({", ".join("?" * len(lot))})
+            """,
+                lot,
+            )
+            empreintes = [
+                (empreinte, empreinte, transaction_id, transaction_id)
+                for transaction_id, empreinte in (
+                    (row[0], calculer_empreinte(*row[1:])) for row in self.cursor.fetchall()
+                )
+            ]
+            self.cursor.executemany(
+                """
+                UPDATE transactions
+                SET Empreinte = ?,
+                    DoublonDe = (SELECT ID FROM transactions WHERE Empreinte = ? AND DoublonDe IS NULL AND ID != ?)
+                WHERE ID = ?
+            """,
+                empreintes,
+            )
+
+    def ajouter_entrees(
+        self,
+        transactions: Iterable[Dict],
+        doublons: str = "ignorer",
+        approximatif: bool = False,
+        tolerance_jours: int = 3,
+        seuil_description: float = 0.8,
+    ) -> Dict[str, int]:
+        """
+        Ajoute un lot de transactions en détectant les doublons
+
+        Chaque ligne est comparée à l'index unique des empreintes : la détection
+        exacte coûte une recherche d'index par ligne et tout le lot est inséré
+        en une seule requête préparée. Le mode approximatif cherche en plus, pour
+        le même auteur et le même montant, une transaction à quelques jours près
+        dont la description est proche ; les candidats de la période du lot sont
+        chargés une fois dans un dictionnaire.
+
+        Args:
+            transactions: Dicts au format de iterer_transactions (Date, Montant, Type, Utilite,
+                Description, Auteur, et optionnellement Categorie et Devise)
+            doublons: 'ignorer' pour ne pas insérer les doublons, 'signaler' pour les insérer
+                en les rattachant à l'originale (colonne DoublonDe)
+            approximatif: Détecte aussi les quasi-doublons
+            tolerance_jours: Écart de dates maximal d'un quasi-doublon
+            seuil_description: Similarité minimale (0 à 1) des descriptions d'un quasi-doublon
+
+        Returns:
+            Dict avec 'ajoutees', 'ignorees' et 'signalees'
+        """
+        if doublons not in MODES_DOUBLONS:
+            raise ValueError(f"Mode de doublons inconnu: {doublons}")
+
+        lignes = [
+            (
+                trans["Date"],
+                trans["Montant"],
+                trans["Type"],
+                trans["Utilite"],
+                trans["Description"],
+                self._id_dimension("auteurs", trans["Auteur"]),
+                self._id_dimension("categories", trans.get("Categorie")),
+                self._verifier_devise(trans.get("Devise") or DEVISE_REFERENCE),
+                None,
+                calculer_empreinte(trans["Date"], trans["Montant"], trans["Description"], trans["Auteur"]),
+                secrets.token_hex(16),
+            )
+            for trans in transactions
+        ]
+
+        self.cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM transactions")
+        dernier_id = self.cursor.fetchone()[0]
+
+        with self._transaction():
+            if approximatif and lignes:
+                # Ligne par ligne : chaque ligne doit voir les précédentes du lot
+                candidats = self._candidats_approximatifs(lignes, tolerance_jours)
+                for ligne in lignes:
+                    candidat = _doublon_approximatif(candidats, ligne, tolerance_jours, seuil_description)
+                    if doublons == "signaler":
+                        self.cursor.execute(INSERTION_SIGNALER, ligne + (candidat,))
+                    elif candidat is None:
+                        self.cursor.execute(INSERTION_IGNORER, ligne)
+                    if candidat is None:
+                        # Un doublon exact est aussi un doublon approximatif : la ligne est une originale
+                        _ajouter_candidat(candidats, self.cursor.lastrowid, *ligne[:2], ligne[4], ligne[5])
+            elif doublons == "signaler":
+                self.cursor.executemany(INSERTION_SIGNALER, [ligne + (None,) for ligne in lignes])
+            else:
+                self.cursor.executemany(INSERTION_IGNORER, lignes)
+
+        self.cursor.execute("SELECT COUNT(*), COUNT(DoublonDe) FROM transactions WHERE ID > ?", (dernier_id,))
+        nb_ajoutees, nb_signalees = self.cursor.fetchone()
+        return {"ajoutees": nb_ajoutees, "ignorees": len(lignes) - nb_ajoutees, "signalees": nb_signalees}
+
+    def _candidats_approximatifs(self, lignes: List[Tuple], tolerance_jours: int) -> Dict:
+        """
+        Charge les transactions originales de la période couverte par un lot
+
+        Returns:
+            Dict {(AuteurID, montant en centimes): [(jour ordinal, ID, description normalisée)]}
+        """
+        dates = [ligne[0] for ligne in lignes]
+        ecart = timedelta(days=tolerance_jours)
+        self.cursor.execute(
+            """
+            SELECT ID, Date, Montant, Description, AuteurID
+            FROM transactions
+            WHERE Date BETWEEN ? AND ? AND DoublonDe IS NULL
+        """,
+            (
+                (Date.fromisoformat(min(dates)) - ecart).isoformat(),
+                (Date.fromisoformat(max(dates)) + ecart).isoformat(),
+            ),
+        )
+
+        candidats = {}
+        for transaction_id, date, montant, description, auteur_id in self.cursor.fetchall():
+            _ajouter_candidat(candidats, transaction_id, date, montant, description, auteur_id)
+        return candidats
+
+    def obtenir_doublons(self) -> List[Dict]:
+        """
+        Récupère les transactions signalées comme doublons
+
+        Returns:
+            Liste de dictionnaires au format des transactions, avec l'ID de l'originale dans 'DoublonDe'
+        """
+        self.cursor.execute(
+            """
+            SELECT v.*, t.DoublonDe
+            FROM v_transactions v
+            JOIN transactions t ON t.ID = v.ID
+            WHERE t.DoublonDe IS NOT NULL
+            ORDER BY t.DoublonDe, v.ID
+        """
+        )
+        colonnes = [desc[0] for desc in self.cursor.description]
+
+        return [dict(zip(colonnes, row)) for row in self.cursor.fetchall()]
+
+    def supprimer_entrees(self, ids: Optional[List[int]] = None, filtres: Optional[Dict] = None) -> int:
+        """
+        Supprime en une seule transaction toutes les entrées sélectionnées
+
+        Args:
+            ids: Liste d'IDs à supprimer (optionnel)
+            filtres: Filtres de sélection, voir FILTRES_TRANSACTIONS (optionnel)
+
+        Returns:
+            Nombre de transactions supprimées
+        """
+        if ids is None and not filtres:
+            raise ValueError("Une liste d'IDs ou des filtres sont requis")
+        if ids is not None and not ids:
+            return 0
+
+        clause, params = self._construire_filtres(filtres)
+        query = f"DELETE FROM transactions WHERE 1 = 1{clause}"
+
+        with self._transaction():
+            if ids is None:
+                self.cursor.execute(query, params)
+            else:
+                self.cursor.executemany(query + " AND ID = ?", [params + [i] for i in ids])
+
+        return self.cursor.rowcount
+
+    def ajouter_recurrence(
+        self,
+        frequence: str,
+        date_debut: str,
+        montant: float,
+        type_transaction: str,
+        utilite: str,
+        description: str,
+        auteur: str,
+        date_fin: Optional[str] = None,
+        categorie: Optional[str] = None,
+        devise: str = DEVISE_REFERENCE,
+    ) -> int:
+        """
+        Ajoute une règle de transaction récurrente
+
+        Les occurrences ne sont pas créées immédiatement : elles sont
+        matérialisées à la demande, lorsqu'une requête couvre leur date.
+
+        Args:
+            frequence: 'hebdomadaire', 'mensuelle' ou 'annuelle'
+            date_debut: Date de la première occurrence (YYYY-MM-DD)
+            montant: Montant de chaque occurrence
+            type_transaction: 'Revenu' ou 'Depense'
+            utilite: 'Commun' ou 'Perso'
+            description: Description des occurrences
+            auteur: Nom de l'auteur
+            date_fin: Date de la dernière occurrence possible, incluse (optionnel)
+            categorie: Nom de la catégorie des occurrences (optionnel)
+            devise: Devise du montant (par défaut DEVISE_REFERENCE)
+
+        Returns:
+            ID de la règle créée
+        """
+        self.cursor.execute(
+            """
+            INSERT INTO recurrences
+                (Frequence, DateDebut, DateFin, Montant, Type, Utilite, Description, AuteurID, CategorieID,
+                 MaterialiseAvant, Devise, Uid)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                frequence,
+                date_debut,
+                date_fin,
+                montant,
+                type_transaction,
+                utilite,
+                description,
+                self._id_dimension("auteurs", auteur),
+                self._id_dimension("categories", categorie),
+                date_debut,
+                self._verifier_devise(devise),
+                uuid.uuid4().hex,
+            ),
+        )
+        self.conn.commit()
+        self._recurrences_materialisees_avant = None
+        return self.cursor.lastrowid
+
+    def supprimer_recurrence(self, recurrence_id: int) -> bool:
+        """
+        Supprime une règle récurrente sans toucher aux occurrences déjà créées
+
+        Args:
+            recurrence_id: ID de la règle à supprimer
+
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        self.cursor.execute("UPDATE transactions SET RecurrenceID = NULL WHERE RecurrenceID = ?", (recurrence_id,))
+        self.cursor.execute("DELETE FROM recurrences WHERE ID = ?", (recurrence_id,))
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    def obtenir_recurrences(self) -> List[Dict]:
+        """
+        Récupère toutes les règles récurrentes
+
+        Returns:
+            Liste de dictionnaires contenant les règles
+        """
+        self.cursor.execute(
+            """
+            SELECT r.ID, r.Frequence, r.DateDebut, r.DateFin, r.Montant, r.Devise, r.Type, r.Utilite, r.Description,
+                   a.Nom AS Auteur, c.Nom AS Categorie, r.MaterialiseAvant
+            FROM recurrences r
+            JOIN auteurs a ON a.ID = r.AuteurID
+            LEFT JOIN categories c ON c.ID = r.CategorieID
+            ORDER BY r.ID
+        """
+        )
+        colonnes = [desc[0] for desc in self.cursor.description]
+
+        return [dict(zip(colonnes, row)) for row in self.cursor.fetchall()]
+
+    def _materialiser_recurrences(self, date_fin: Optional[str] = None):
+        """
+        Crée en bloc les occurrences récurrentes nécessaires à une requête
+
+        Seules les occurrences passées ou du jour, antérieures à date_fin, sont
+        écrites ; les dates futures restent virtuelles (voir obtenir_occurrences_projetees).
+
+        Args:
+            date_fin: Date de fin exclue couverte par la requête (optionnel)
+        """
+        demain = (Date.today() + timedelta(days=1)).isoformat()
+        borne = min(date_fin, demain) if date_fin else demain
+
+        if self._recurrences_materialisees_avant and borne <= self._recurrences_materialisees_avant:
+            return
+
+        noms = self._noms_dimension("auteurs")
+        self.cursor.execute(
+            """
+            SELECT ID, Frequence, DateDebut, DateFin, Montant, Type, Utilite, Description, AuteurID, CategorieID,
+                   MaterialiseAvant, Devise, Uid
+            FROM recurrences
+            WHERE MaterialiseAvant < ? AND (DateFin IS NULL OR DateFin >= MaterialiseAvant)
+        """,
+            (borne,),
+        )
+
+        occurrences = []
+        avancements = []
+        for row in self.cursor.fetchall():
+            regle_id, frequence, debut, fin, montant, type_trans, utilite, description, auteur, categorie = row[:10]
+            apres, devise, uid_regle = row[10:]
+            avant = min(borne, (Date.fromisoformat(fin) + timedelta(days=1)).isoformat()) if fin else borne
+            for date in _occurrences_recurrence(frequence, debut, apres, avant):
+                occurrences.append(
+                    (
+                        date,
+                        montant,
+                        type_trans,
+                        utilite,
+                        description,
+                        auteur,
+                        categorie,
+                        devise,
+                        regle_id,
+                        calculer_empreinte(date, montant, description, noms[auteur]),
+                        _uid_occurrence(uid_regle, date),
+                        None,
+                    )
+                )
+            avancements.append((borne, regle_id))
+
+        if avancements:
+            with self._transaction():
+                self.cursor.executemany(INSERTION_OCCURRENCES, occurrences)
+                self.cursor.executemany("UPDATE recurrences SET MaterialiseAvant = ? WHERE ID = ?", avancements)
+
+        if self._recurrences_materialisees_avant is None or borne > self._recurrences_materialisees_avant:
+            self._recurrences_materialisees_avant = borne
+
+    def obtenir_occurrences_projetees(self, date_debut: str, date_fin: str) -> List[Dict]:
+        """
+        Calcule les occurrences récurrentes non encore matérialisées d'une période
+
+        Rien n'est écrit en base : ces occurrences servent aux projections.
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD)
+            date_fin: Date de fin exclue (YYYY-MM-DD)
+
+        Returns:
+            Liste de dictionnaires au format des transactions (ID à None)
+        """
+        occurrences = []
+        for regle in self.obtenir_recurrences():
+            apres = max(date_debut, regle["MaterialiseAvant"])
+            avant = date_fin
+            if regle["DateFin"]:
+                avant = min(avant, (Date.fromisoformat(regle["DateFin"]) + timedelta(days=1)).isoformat())
+            if apres >= avant:
+                continue
+
+            for date in _occurrences_recurrence(regle["Frequence"], regle["DateDebut"], apres, avant):
+                occurrences.append(
+                    {
+                        "ID": None,
+                        "Date": date,
+                        "Montant": regle["Montant"],
+                        "Devise": regle["Devise"],
+                        "Type": regle["Type"],
+                        "Utilite": regle["Utilite"],
+                        "Description": regle["Description"],
+                        "Auteur": regle["Auteur"],
+                        "Categorie": regle["Categorie"],
+                        "RecurrenceID": regle["ID"],
+                    }
+                )
+
+        return sorted(occurrences, key=lambda o: o["Date"])
+
+    def obtenir_transaction_par_id(self, transaction_id: int) -> Optional[Dict]:
+        """
+        Récupère une transaction par son ID
+
+        Args:
+            transaction_id: ID de la transaction
+
+        Returns:
+            Dictionnaire contenant la transaction ou None
+        """
+        self.cursor.execute("SELECT * FROM v_transactions WHERE ID = ?", (transaction_id,))
+        row = self.cursor.fetchone()
+
+        if row:
+            colonnes = [desc[0] for desc in self.cursor.description]
+            return dict(zip(colonnes, row))
+        return None
+
+    def obtenir_transactions_mois(
+        self, annee: int, mois: int, type_transaction: Optional[str] = None, auteur: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Récupère les transactions d'un mois spécifique
+
+        Args:
+            annee: Année (ex: 2024)
+            mois: Mois (1-12)
+            type_transaction: Filtre optionnel 'Revenu' ou 'Depense'
+            auteur: Filtre optionnel par auteur
+
+        Returns:
+            Liste de dictionnaires contenant les transactions
+        """
+        date_debut = f"{annee}-{mois:02d}-01"
+        if mois == 12:
+            date_fin = f"{annee + 1}-01-01"
+        else:
+            date_fin = f"{annee}-{mois + 1:02d}-01"
+
+        self._materialiser_recurrences(date_fin)
+
+        query = "SELECT * FROM v_transactions WHERE Date >= ? AND Date < ?"
+        params = [date_debut, date_fin]
+
+        if type_transaction:
+            query += " AND Type = ?"
+            params.append(type_transaction)
+
+        if auteur:
+            query += " AND Auteur = ?"
+            params.append(_normaliser_nom(auteur))
+
+        self.cursor.execute(query, params)
+        colonnes = [desc[0] for desc in self.cursor.description]
+
+        return [dict(zip(colonnes, row)) for row in self.cursor.fetchall()]
+
+    def iterer_transactions(
+        self,
+        date_debut: Optional[str] = None,
+        date_fin: Optional[str] = None,
+        taille_lot: int = 5000,
+        filtres: Optional[Dict] = None,
+    ) -> Iterator[Dict]:
+        """
+        Parcourt les transactions d'une période triées par date, par lots
+
+        Utilise un curseur dédié pour ne pas interférer avec les autres requêtes
+        et ne garde jamais plus d'un lot en mémoire.
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+            taille_lot: Nombre de lignes lues à chaque appel à fetchmany
+            filtres: Filtres supplémentaires, voir FILTRES_TRANSACTIONS (optionnel)
+
+        Yields:
+            Dictionnaire représentant une transaction
+        """
+        self._materialiser_recurrences(date_fin)
+
+        clause, params = self._construire_filtres(filtres)
+        query = f"{REQUETE_TRANSACTIONS} WHERE 1 = 1{clause}"
+
+        if date_debut:
+            query += " AND Date >= ?"
+            params.append(date_debut)
+
+        if date_fin:
+            query += " AND Date < ?"
+            params.append(date_fin)
+
+        query += " ORDER BY t.Date, t.ID"
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            colonnes = [desc[0] for desc in cursor.description]
+            while True:
+                rows = cursor.fetchmany(taille_lot)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(colonnes, row))
+        finally:
+            cursor.close()
+
+    def obtenir_pivot(
+        self,
+        lignes: Iterable[str] = (),
+        colonnes: Iterable[str] = (),
+        mesure: str = "somme",
+        filtres: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        Calcule un tableau croisé dense en une seule requête GROUP BY
+
+        Exemple : obtenir_pivot(["auteur", "utilite"], ["mois"]) donne une ligne
+        par couple (auteur, utilité) et une colonne par mois.
+
+        Args:
+            lignes: Dimensions en lignes, clés de DIMENSIONS_PIVOT
+            colonnes: Dimensions en colonnes, clés de DIMENSIONS_PIVOT
+            mesure: Clé de MESURES_PIVOT, calculée sur les montants convertis
+            filtres: Dict dont les clés sont celles de FILTRES_TRANSACTIONS (optionnel)
+
+        Returns:
+            Dict avec 'valeurs' (tableau NumPy 2-D), 'lignes' et 'colonnes' (libellés de chaque axe :
+            la valeur pour une seule dimension, un tuple pour plusieurs, () sans dimension).
+            Les cellules sans transaction valent 0 pour 'somme' et 'nombre', NaN sinon.
+        """
+        lignes, colonnes = list(lignes), list(colonnes)
+        dimensions = lignes + colonnes
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS_PIVOT:
+                raise ValueError(f"Dimension inconnue: {dimension}")
+        if mesure not in MESURES_PIVOT:
+            raise ValueError(f"Mesure inconnue: {mesure}")
+
+        expressions = [DIMENSIONS_PIVOT[dimension][0] for dimension in dimensions]
+        expressions.append(MESURES_PIVOT[mesure].format(montant=self._montant_converti()))
+        clause, params = self._construire_filtres(filtres)
+        query = f"SELECT {', '.join(expressions)} FROM transactions WHERE 1 = 1{clause}"
+        if dimensions:
+            query += " GROUP BY " + ", ".join(str(i) for i in range(1, len(dimensions) + 1))
+
+        self._materialiser_recurrences((filtres or {}).get("date_fin"))
+        self.cursor.execute(query, params)
+        rows = self.cursor.fetchall()
+
+        # Les IDs ne sont résolus en noms qu'une fois l'agrégation faite sur les clés entières
+        for position, dimension in enumerate(dimensions):
+            table = DIMENSIONS_PIVOT[dimension][1]
+            if table:
+                noms = self._noms_dimension(table)
+                rows = [row[:position] + (noms.get(row[position]),) + row[position + 1 :] for row in rows]
+
+        nb_lignes = len(lignes)
+        cles_lignes = sorted({row[:nb_lignes] for row in rows}, key=_cle_libelle) if lignes else [()]
+        cles_colonnes = sorted({row[nb_lignes:-1] for row in rows}, key=_cle_libelle) if colonnes else [()]
+        index_lignes = {cle: i for i, cle in enumerate(cles_lignes)}
+        index_colonnes = {cle: j for j, cle in enumerate(cles_colonnes)}
+
+        vide = 0.0 if mesure in ("somme", "nombre") else np.nan
+        valeurs = np.full((len(cles_lignes), len(cles_colonnes)), vide)
+        for row in rows:
+            if row[-1] is not None:
+                valeurs[index_lignes[row[:nb_lignes]], index_colonnes[row[nb_lignes:-1]]] = row[-1]
+
+        def libelles(cles: List[Tuple]) -> List:
+            return [cle[0] if len(cle) == 1 else cle for cle in cles]
+
+        return {"valeurs": valeurs, "lignes": libelles(cles_lignes), "colonnes": libelles(cles_colonnes)}
+
+    def _pivot_en_dict(self, pivot: Dict) -> Dict:
+        """Convertit un tableau croisé en dict {ligne: {colonne: valeur}}"""
+        return {
+            ligne: dict(zip(pivot["colonnes"], valeurs))
+            for ligne, valeurs in zip(pivot["lignes"], pivot["valeurs"].tolist())
+        }
+
+    def _pivot_en_serie(self, pivot: Dict) -> Dict:
+        """Convertit un tableau croisé à une seule colonne en dict {ligne: valeur}"""
+        return dict(zip(pivot["lignes"], pivot["valeurs"][:, 0].tolist()))
+
+    def obtenir_totaux_mois(
+        self, annee: int, mois: int, inclure_projections: bool = False
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Calcule les totaux revenus/dépenses par personne pour un mois
+
+        Args:
+            annee: Année
+            mois: Mois (1-12)
+            inclure_projections: Ajoute les occurrences récurrentes futures, sans les écrire
+
+        Returns:
+            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+        """
+        date_debut, date_fin = _bornes_periode(annee, mois)
+        totaux = self._totaux_par_auteur(
+            self.obtenir_pivot(["auteur"], ["type"], filtres={"date_debut": date_debut, "date_fin": date_fin})
+        )
+
+        if inclure_projections:
+            for occurrence in self.obtenir_occurrences_projetees(date_debut, date_fin):
+                auteur = occurrence["Auteur"]
+                if auteur not in totaux:
+                    totaux[auteur] = {"revenus": 0.0, "depenses": 0.0}
+
+                montant = self.convertir(occurrence["Montant"], occurrence["Devise"], occurrence["Date"])
+                if occurrence["Type"] == "Revenu":
+                    totaux[auteur]["revenus"] += montant
+                else:
+                    totaux[auteur]["depenses"] += montant
+
+        return totaux
+
+    def _totaux_par_auteur(self, pivot: Dict) -> Dict[str, Dict[str, float]]:
+        """Convertit un tableau croisé auteur x type en {auteur: {'revenus': montant, 'depenses': montant}}"""
+        return {
+            auteur: {"revenus": totaux.get("Revenu", 0.0), "depenses": totaux.get("Depense", 0.0)}
+            for auteur, totaux in self._pivot_en_dict(pivot).items()
+        }
+
+    def obtenir_totaux_globaux(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calcule les totaux revenus/dépenses par personne sur toute la base
+
+        Returns:
+            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+        """
+        return self._totaux_par_auteur(self.obtenir_pivot(["auteur"], ["type"]))
+
+    def obtenir_depenses_par_utilite(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+        """
+        Calcule les dépenses par utilité (Commun/Perso)
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Dict avec structure {'Commun': montant, 'Perso': montant}
+        """
+        date_debut, date_fin = _bornes_periode(annee, mois)
+        filtres = {"type_transaction": "Depense", "date_debut": date_debut, "date_fin": date_fin}
+
+        result = {"Commun": 0.0, "Perso": 0.0}
+        result.update(self._pivot_en_serie(self.obtenir_pivot(["utilite"], filtres=filtres)))
+        return result
+
+    def obtenir_revenus_totaux(self, annee: int = None, mois: int = None) -> float:
+        """
+        Calcule le total des revenus
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Montant total des revenus
+        """
+        date_debut, date_fin = _bornes_periode(annee, mois)
+        filtres = {"type_transaction": "Revenu", "date_debut": date_debut, "date_fin": date_fin}
+        return float(self.obtenir_pivot(filtres=filtres)["valeurs"][0, 0])
+
+    def obtenir_revenus_par_auteur(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+        """
+        Calcule les revenus par auteur
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Dict avec structure {auteur: montant}
+        """
+        date_debut, date_fin = _bornes_periode(annee, mois)
+        filtres = {"type_transaction": "Revenu", "date_debut": date_debut, "date_fin": date_fin}
+        return self._pivot_en_serie(self.obtenir_pivot(["auteur"], filtres=filtres))
+
+    def obtenir_depenses_par_categorie(self, annee: int = None, mois: int = None) -> Dict[Optional[str], float]:
+        """
+        Calcule les dépenses par catégorie
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Dict avec structure {categorie: montant}, None pour les dépenses sans catégorie
+        """
+        date_debut, date_fin = _bornes_periode(annee, mois)
+        filtres = {"type_transaction": "Depense", "date_debut": date_debut, "date_fin": date_fin}
+        return self._pivot_en_serie(self.obtenir_pivot(["categorie"], filtres=filtres))
+
+    def obtenir_totaux_mensuels(self, annee: int, inclure_projections: bool = False) -> Dict[int, Dict[str, float]]:
+        """
+        Calcule les revenus/dépenses de chaque mois d'une année en une seule requête
+
+        Args:
+            annee: Année à analyser
+            inclure_projections: Ajoute les occurrences récurrentes futures, sans les écrire
+
+        Returns:
+            Dict avec structure {mois: {'revenus': montant, 'depenses': montant}} pour les 12 mois
+        """
+        filtres = {"date_debut": f"{annee}-01-01", "date_fin": f"{annee + 1}-01-01"}
+        presents = self._pivot_en_dict(self.obtenir_pivot(["mois"], ["type"], filtres=filtres))
+
+        totaux = {}
+        for mois in range(1, 13):
+            valeurs = presents.get(mois, {})
+            totaux[mois] = {"revenus": valeurs.get("Revenu", 0.0), "depenses": valeurs.get("Depense", 0.0)}
+
+        if inclure_projections:
+            for occurrence in self.obtenir_occurrences_projetees(f"{annee}-01-01", f"{annee + 1}-01-01"):
+                mois = int(occurrence["Date"][5:7])
+                cle = "revenus" if occurrence["Type"] == "Revenu" else "depenses"
+                totaux[mois][cle] += self.convertir(occurrence["Montant"], occurrence["Devise"], occurrence["Date"])
+
+        return totaux
+
+    def obtenir_historique_mensuel(
+        self, date_debut: Optional[str] = None, date_fin: Optional[str] = None
+    ) -> List[Tuple[str, str, str, str, float]]:
+        """
+        Calcule les totaux de chaque mois par auteur, utilité et type
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+
+        Returns:
+            Liste de tuples (mois 'YYYY-MM', auteur, utilite, type, total) triée par mois
+        """
+        query = f"""
+            SELECT substr(Date, 1, 7) AS Mois, AuteurID, Utilite, Type, SUM({self._montant_converti()})
+            FROM transactions
+            WHERE 1 = 1
+        """
+        params = []
+
+        if date_debut:
+            query += " AND Date >= ?"
+            params.append(date_debut)
+
+        if date_fin:
+            query += " AND Date < ?"
+            params.append(date_fin)
+
+        query += " GROUP BY Mois, AuteurID, Utilite, Type ORDER BY Mois"
+
+        self._materialiser_recurrences(date_fin)
+        self.cursor.execute(query, params)
+        rows = self.cursor.fetchall()
+
+        noms = self._noms_dimension("auteurs")
+        return [
+            (mois, noms[auteur_id], utilite, type_trans, total) for mois, auteur_id, utilite, type_trans, total in rows
+        ]
+
+    def obtenir_totaux_journaliers(
+        self, date_debut: Optional[str] = None, date_fin: Optional[str] = None
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Calcule les revenus/dépenses de chaque jour ayant au moins une transaction
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+
+        Returns:
+            Liste de tuples (date, revenus, depenses) triée par date
+        """
+        montant = self._montant_converti()
+        query = f"""
+            SELECT Date,
+                   SUM(CASE WHEN Type = 'Revenu' THEN {montant} ELSE 0 END),
+                   SUM(CASE WHEN Type = 'Depense' THEN {montant} ELSE 0 END)
+            FROM transactions
+            WHERE 1 = 1
+        """
+        params = []
+
+        if date_debut:
+            query += " AND Date >= ?"
+            params.append(date_debut)
+
+        if date_fin:
+            query += " AND Date < ?"
+            params.append(date_fin)
+
+        query += " GROUP BY Date ORDER BY Date"
+
+        self._materialiser_recurrences(date_fin)
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    def definir_part(self, auteur: str, part: float):
+        """
+        Définit la part d'un auteur dans les dépenses communes
+
+        Les parts sont relatives : 2 pour l'un et 1 pour l'autre donne 2/3 - 1/3.
+        Un auteur sans part définie compte pour 1.
+
+        Args:
+            auteur: Nom de l'auteur
+            part: Poids strictement positif
+        """
+        if part <= 0:
+            raise ValueError("La part doit être strictement positive")
+
+        self.cursor.execute(
+            """
+            INSERT INTO repartition (AuteurID, Part) VALUES (?, ?)
+            ON CONFLICT (AuteurID) DO UPDATE SET Part = excluded.Part
+        """,
+            (self._id_dimension("auteurs", auteur), part),
+        )
+        self.conn.commit()
+
+    def obtenir_parts(self) -> Dict[str, float]:
+        """
+        Récupère les parts définies dans les dépenses communes
+
+        Returns:
+            Dict {auteur: part}
+        """
+        self.cursor.execute("SELECT a.Nom, r.Part FROM repartition r JOIN auteurs a ON a.ID = r.AuteurID")
+        return dict(self.cursor.fetchall())
+
+    def _mettre_en_cache_reglement(self, date_debut: Optional[str], date_fin: str):
+        """
+        Calcule en une requête les paiements communs des mois clos absents du cache
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD), None pour toute la base
+            date_fin: Date de fin exclue, au plus tard le premier jour du mois en cours
+        """
+        if date_debut is None:
+            self.cursor.execute("SELECT MIN(Date) FROM transactions WHERE Utilite = 'Commun' AND Type = 'Depense'")
+            date_debut = self.cursor.fetchone()[0]
+            if date_debut is None:
+                return
+
+        self.cursor.execute(
+            "SELECT Periode FROM reglement_periodes WHERE Devise = ? AND Periode >= ? AND Periode < ?",
+            (self.devise_rapport, date_debut[:7], date_fin[:7]),
+        )
+        en_cache = {row[0] for row in self.cursor.fetchall()}
+        manquantes = [periode for periode in _periodes(date_debut[:7], date_fin[:7]) if periode not in en_cache]
+        if not manquantes:
+            return
+
+        fin = _mois_suivant(manquantes[-1])
+        non_valides = "Periode NOT IN (SELECT Periode FROM reglement_periodes WHERE Devise = ?1)"
+        with self._transaction():
+            self.cursor.execute(
+                f"""
+                DELETE FROM reglement_paiements
+                WHERE Devise = ?1 AND Periode >= ?2 AND Periode < ?3 AND {non_valides}
+            """,
+                (self.devise_rapport, manquantes[0], fin),
+            )
+            self.cursor.execute(
+                f"""
+                INSERT INTO reglement_paiements (Periode, Devise, AuteurID, Paye)
+                SELECT substr(Date, 1, 7) AS Periode, ?1, AuteurID, SUM({self._montant_converti()})
+                FROM transactions
+                WHERE Utilite = 'Commun' AND Type = 'Depense' AND Date >= ?2 AND Date < ?3 AND {non_valides}
+                GROUP BY Periode, AuteurID
+            """,
+                (self.devise_rapport, f"{manquantes[0]}-01", f"{fin}-01"),
+            )
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO reglement_periodes (Periode, Devise) VALUES (?, ?)",
+                [(periode, self.devise_rapport) for periode in manquantes],
+            )
+
+    def obtenir_reglement(self, annee: int = None, mois: int = None) -> Dict:
+        """
+        Calcule ce que chacun doit aux autres pour les dépenses communes
+
+        Chaque participant, qu'il ait payé ou non sur la période, doit sa part
+        (voir definir_part) du total des dépenses communes ; son solde est ce
+        qu'il a payé moins ce qu'il doit. Les participants sont les auteurs qui
+        ont une part définie ou au moins une dépense commune.
+
+        Les sommes payées par mois clos sont mises en cache, seul le mois en
+        cours est recalculé à chaque appel.
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois (avec annee)
+
+        Returns:
+            Dict avec 'total', 'paye', 'du' et 'soldes' ({auteur: montant}) et 'virements'
+            (liste de tuples (débiteur, créancier, montant) qui soldent les comptes)
+        """
+        if annee and mois:
+            date_debut, date_fin = _bornes_periode(annee, mois)
+        elif annee:
+            date_debut, date_fin = f"{annee}-01-01", f"{annee + 1}-01-01"
+        else:
+            date_debut, date_fin = None, None
+
+        self._materialiser_recurrences(date_fin)
+
+        # Mois clos : depuis le cache, complété si besoin
+        mois_courant = Date.today().replace(day=1).isoformat()
+        fin_clos = min(date_fin, mois_courant) if date_fin else mois_courant
+        if date_debut is None or date_debut < fin_clos:
+            self._mettre_en_cache_reglement(date_debut, fin_clos)
+
+        self.cursor.execute(
+            """
+            SELECT p.AuteurID, SUM(p.Paye)
+            FROM reglement_paiements p
+            JOIN reglement_periodes c ON c.Periode = p.Periode AND c.Devise = p.Devise
+            WHERE p.Devise = ? AND p.Periode >= ? AND p.Periode < ?
+            GROUP BY p.AuteurID
+        """,
+            (self.devise_rapport, (date_debut or "")[:7], fin_clos[:7]),
+        )
+        paye = dict(self.cursor.fetchall())
+
+        # Mois en cours (et futurs) : toujours recalculés
+        if date_fin is None or date_fin > mois_courant:
+            query = f"""
+                SELECT AuteurID, SUM({self._montant_converti()})
+                FROM transactions
+                WHERE Utilite = 'Commun' AND Type = 'Depense' AND Date >= ?
+            """
+            params = [max(date_debut or "", mois_courant)]
+            if date_fin:
+                query += " AND Date < ?"
+                params.append(date_fin)
+            self.cursor.execute(query + " GROUP BY AuteurID", params)
+            for auteur_id, total in self.cursor.fetchall():
+                paye[auteur_id] = paye.get(auteur_id, 0.0) + total
+
+        # Les participants partagent les dépenses communes, y compris ceux qui n'ont rien payé sur la période
+        self.cursor.execute(
+            """
+            SELECT a.ID, a.Nom, COALESCE(r.Part, 1.0)
+            FROM auteurs a
+            LEFT JOIN repartition r ON r.AuteurID = a.ID
+            WHERE r.AuteurID IS NOT NULL
+               OR a.ID IN (SELECT AuteurID FROM transactions WHERE Utilite = 'Commun' AND Type = 'Depense')
+        """
+        )
+        rows = self.cursor.fetchall()
+        noms = {auteur_id: nom for auteur_id, nom, _ in rows}
+        poids = {auteur_id: part for auteur_id, _, part in rows}
+        total = sum(paye.values())
+        total_poids = sum(poids.values())
+
+        du = {noms[a]: total * p / total_poids for a, p in poids.items()}
+        paye = {noms[a]: paye.get(a, 0.0) for a in poids}
+        soldes = {auteur: round(paye[auteur] - du[auteur], 2) for auteur in du}
+
+        return {
+            "total": total,
+            "paye": paye,
+            "du": du,
+            "soldes": soldes,
+            "virements": _virements_minimaux(soldes),
+        }
+
+    def definir_budget(self, limite: float, auteur: str = None, utilite: str = None, devise: str = DEVISE_REFERENCE):
+        """
+        Définit une limite mensuelle de dépenses
+
+        Args:
+            limite: Montant maximal des dépenses sur un mois
+            auteur: Auteur concerné, qui doit déjà exister (None pour tous les auteurs)
+            utilite: 'Commun' ou 'Perso' (None pour toutes les dépenses)
+            devise: Devise de la limite
+        """
+        if limite <= 0:
+            raise ValueError("La limite doit être strictement positive")
+
+        auteur_id = self._chercher_id_dimension("auteurs", auteur) if auteur else 0
+        if auteur_id is None:
+            raise ValueError(f"Auteur inconnu: {auteur}")
+
+        self.cursor.execute(
+            """
+            INSERT INTO budgets (AuteurID, Utilite, Limite, Devise) VALUES (?, ?, ?, ?)
+            ON CONFLICT (AuteurID, Utilite) DO UPDATE SET Limite = excluded.Limite, Devise = excluded.Devise
+        """,
+            (auteur_id, utilite or "", limite, self._verifier_devise(devise)),
+        )
+        self.conn.commit()
+
+    def supprimer_budget(self, auteur: str = None, utilite: str = None) -> bool:
+        """
+        Supprime une limite mensuelle de dépenses
+
+        Args:
+            auteur: Auteur concerné (None pour la limite de tous les auteurs)
+            utilite: 'Commun' ou 'Perso' (None pour la limite de toutes les dépenses)
+
+        Returns:
+            True si une limite a été supprimée
+        """
+        auteur_id = self._chercher_id_dimension("auteurs", auteur) if auteur else 0
+        if auteur_id is None:
+            return False
+
+        self.cursor.execute("DELETE FROM budgets WHERE AuteurID = ? AND Utilite = ?", (auteur_id, utilite or ""))
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    def _depenses_periode(self, periode: str, auteur_id: int, utilite: str) -> float:
+        """
+        Lit les dépenses cumulées d'un mois dans depenses_periodes, converties dans la devise de rapport
+
+        Le coût ne dépend pas du nombre de transactions du mois. Chaque devise
+        est convertie au taux de la fin du mois (ou du jour pour le mois en cours).
+
+        Args:
+            periode: Mois 'YYYY-MM'
+            auteur_id: ID de l'auteur, 0 pour tous
+            utilite: 'Commun' ou 'Perso', '' pour toutes
+        """
+        self.cursor.execute(
+            """
+            SELECT Devise, SUM(Depenses)
+            FROM depenses_periodes
+            WHERE Periode = ?1 AND (?2 = 0 OR AuteurID = ?2) AND (?3 = '' OR Utilite = ?3)
+            GROUP BY Devise
+        """,
+            (periode, auteur_id, utilite),
+        )
+        date_taux = self._date_taux_periode(periode)
+        return sum(self.convertir(total, devise, date_taux) for devise, total in self.cursor.fetchall())
+
+    def _date_taux_periode(self, periode: str) -> str:
+        """Retourne la date du taux de change utilisé pour un mois : son dernier jour, au plus tard aujourd'hui"""
+        annee, mois = int(periode[:4]), int(periode[5:7])
+        fin_mois = f"{periode}-{calendar.monthrange(annee, mois)[1]:02d}"
+        return min(fin_mois, Date.today().isoformat())
+
+    def _etat_budgets(self, periode: str, rows: List[Tuple[int, str, float, str]]) -> List[Dict]:
+        """Calcule la consommation de chaque limite (AuteurID, Utilite, Limite, Devise) sur un mois"""
+        noms = self._noms_dimension("auteurs")
+        date_taux = self._date_taux_periode(periode)
+
+        etats = []
+        for auteur_id, utilite, limite, devise in rows:
+            limite = self.convertir(limite, devise, date_taux)
+            consomme = self._depenses_periode(periode, auteur_id, utilite)
+            etats.append(
+                {
+                    "Auteur": noms.get(auteur_id),
+                    "Utilite": utilite or None,
+                    "Limite": limite,
+                    "Consomme": consomme,
+                    "Pourcentage": consomme / limite * 100,
+                }
+            )
+        return etats
+
+    def obtenir_budgets(self, annee: int, mois: int) -> List[Dict]:
+        """
+        Calcule la consommation de chaque limite de budget sur un mois
+
+        Args:
+            annee: Année
+            mois: Mois (1-12)
+
+        Returns:
+            Liste de dicts avec 'Auteur' et 'Utilite' (None pour tous/toutes), 'Limite',
+            'Consomme' (dans la devise de rapport) et 'Pourcentage'
+        """
+        self._materialiser_recurrences(_bornes_periode(annee, mois)[1])
+        self.cursor.execute("SELECT AuteurID, Utilite, Limite, Devise FROM budgets ORDER BY AuteurID, Utilite")
+        return self._etat_budgets(f"{annee}-{mois:02d}", self.cursor.fetchall())
+
+    def obtenir_limites(self, annee: int) -> List[Dict]:
+        """
+        Récupère les limites de budget, converties pour chaque mois d'une année
+
+        Contrairement à obtenir_budgets, la consommation n'est pas calculée :
+        les limites sont lues en une requête.
+
+        Args:
+            annee: Année
+
+        Returns:
+            Liste de dicts avec 'Auteur' et 'Utilite' (None pour tous/toutes) et 'Limites',
+            les 12 limites mensuelles dans la devise de rapport
+        """
+        noms = self._noms_dimension("auteurs")
+        dates_taux = [self._date_taux_periode(f"{annee}-{mois:02d}") for mois in range(1, 13)]
+
+        self.cursor.execute("SELECT AuteurID, Utilite, Limite, Devise FROM budgets ORDER BY AuteurID, Utilite")
+        return [
+            {
+                "Auteur": noms.get(auteur_id),
+                "Utilite": utilite or None,
+                "Limites": [self.convertir(limite, devise, date_taux) for date_taux in dates_taux],
+            }
+            for auteur_id, utilite, limite, devise in self.cursor.fetchall()
+        ]
+
+    def verifier_budgets(self, auteur: str, utilite: str, date: str) -> List[Dict]:
+        """
+        Retourne les limites dépassées par les dépenses du mois d'une transaction
+
+        À appeler après l'ajout d'une dépense : seules les limites qui la
+        concernent (son auteur, son utilité, ou tous) sont lues, en O(1).
+
+        Args:
+            auteur: Auteur de la dépense
+            utilite: Utilité de la dépense
+            date: Date de la dépense (YYYY-MM-DD)
+
+        Returns:
+            Limites dépassées, au format de obtenir_budgets
+        """
+        self.cursor.execute(
+            "SELECT AuteurID, Utilite, Limite, Devise FROM budgets WHERE AuteurID IN (0, ?) AND Utilite IN ('', ?)",
+            (self._chercher_id_dimension("auteurs", auteur), utilite),
+        )
+        etats = self._etat_budgets(date[:7], self.cursor.fetchall())
+        return [etat for etat in etats if etat["Consomme"] > etat["Limite"]]
+
+    def obtenir_sequence_journal(self) -> int:
+        """
+        Retourne le numéro de séquence de la dernière modification journalisée
+
+        Returns:
+            Séquence maximale du journal (0 si vide)
+        """
+        self.cursor.execute("SELECT COALESCE(MAX(Seq), 0) FROM journal")
+        return self.cursor.fetchone()[0]
+
+    def obtenir_uid_base(self) -> str:
+        """
+        Retourne l'identifiant unique de cette copie de la base
+
+        Returns:
+            Identifiant hexadécimal
+        """
+        self.cursor.execute("SELECT Valeur FROM meta WHERE Cle = 'uid_base'")
+        return self.cursor.fetchone()[0]
+
+    def obtenir_meta(self, cle: str) -> Optional[str]:
+        """
+        Lit une valeur de la table meta
+
+        Args:
+            cle: Clé à lire
+
+        Returns:
+            Valeur associée ou None
+        """
+        self.cursor.execute("SELECT Valeur FROM meta WHERE Cle = ?", (cle,))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def definir_meta(self, cle: str, valeur: str):
+        """
+        Écrit une valeur dans la table meta
+
+        Args:
+            cle: Clé à écrire
+            valeur: Valeur associée
+        """
+        self.cursor.execute("INSERT OR REPLACE INTO meta (Cle, Valeur) VALUES (?, ?)", (cle, valeur))
+        self.conn.commit()
+
+    def iterer_changements(self, depuis: int = 0, taille_lot: int = 5000) -> Iterator[Dict]:
+        """
+        Parcourt les transactions modifiées depuis une séquence du journal
+
+        Plusieurs modifications d'une même transaction sont fusionnées : seul
+        son état actuel est renvoyé, ou sa suppression si elle n'existe plus.
+        Le coût est proportionnel au nombre de changements, pas à la taille de la base.
+
+        Args:
+            depuis: Séquence de départ exclue
+            taille_lot: Nombre de lignes lues à chaque appel à fetchmany
+
+        Yields:
+            Dict {'Uid', 'Seq', 'Operation': 'maj' ou 'suppression', puis les colonnes si 'maj'}
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT j.Uid, MAX(j.Seq) AS Seq, t.ID IS NOT NULL AS Existe,
+                       t.Date, t.Montant, t.Devise, t.Type, t.Utilite, t.Description, a.Nom, c.Nom
+                FROM journal j
+                LEFT JOIN transactions t ON t.Uid = j.Uid
+                LEFT JOIN auteurs a ON a.ID = t.AuteurID
+                LEFT JOIN categories c ON c.ID = t.CategorieID
+                WHERE j.Seq > ?
+                GROUP BY j.Uid
+                ORDER BY Seq
+            """,
+                (depuis,),
+            )
+            while True:
+                rows = cursor.fetchmany(taille_lot)
+                if not rows:
+                    break
+                for row in rows:
+                    uid, seq, existe, date, montant, devise, type_trans, utilite, description, auteur, categorie = row
+                    if not existe:
+                        yield {"Uid": uid, "Seq": seq, "Operation": "suppression"}
+                        continue
+                    yield {
+                        "Uid": uid,
+                        "Seq": seq,
+                        "Operation": "maj",
+                        "Date": date,
+                        "Montant": montant,
+                        "Devise": devise,
+                        "Type": type_trans,
+                        "Utilite": utilite,
+                        "Description": description,
+                        "Auteur": auteur,
+                        "Categorie": categorie,
+                    }
+        finally:
+            cursor.close()
+
+    def appliquer_changements(self, changements: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Applique des changements issus d'une autre copie de la base
+
+        L'opération est idempotente : une ligne déjà à jour n'est pas réécrite
+        (et n'est donc pas rejournalisée), une suppression déjà faite est ignorée.
+        Les devises des lignes doivent avoir un taux : importez d'abord ceux de
+        l'autre copie avec definir_taux_en_masse.
+
+        Args:
+            changements: Changements au format produit par iterer_changements
+
+        Returns:
+            Tuple (nombre de lignes insérées ou modifiées, nombre de lignes supprimées)
+        """
+        maj = []
+        suppressions = []
+        for changement in changements:
+            if changement["Operation"] == "suppression":
+                suppressions.append((changement["Uid"],))
+            else:
+                maj.append(
+                    (
+                        changement["Date"],
+                        changement["Montant"],
+                        changement["Type"],
+                        changement["Utilite"],
+                        changement["Description"],
+                        self._id_dimension("auteurs", changement["Auteur"]),
+                        self._id_dimension("categories", changement["Categorie"]),
+                        # Les fichiers produits avant l'ajout des devises n'ont pas de colonne Devise
+                        self._verifier_devise(changement.get("Devise", DEVISE_REFERENCE)),
+                        changement["Uid"],
+                        calculer_empreinte(
+                            changement["Date"], changement["Montant"], changement["Description"], changement["Auteur"]
+                        ),
+                    )
+                )
+
+        with self._transaction():
+            nb_maj = 0
+            if maj:
+                self.cursor.executemany(
+                    """
+                    INSERT INTO transactions
+                        (Date, Montant, Type, Utilite, Description, AuteurID, CategorieID, Devise, Uid, Empreinte,
+                         DoublonDe)
+                    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10,
+                            (SELECT ID FROM transactions WHERE Empreinte = ?10 AND DoublonDe IS NULL AND Uid != ?9))
+                    ON CONFLICT(Uid) DO UPDATE SET
+                        Date = excluded.Date,
+                        Montant = excluded.Montant,
+                        Type = excluded.Type,
+                        Utilite = excluded.Utilite,
+                        Description = excluded.Description,
+                        AuteurID = excluded.AuteurID,
+                        CategorieID = excluded.CategorieID,
+                        Devise = excluded.Devise,
+                        Empreinte = excluded.Empreinte,
+                        DoublonDe = excluded.DoublonDe
+                    WHERE Date IS NOT excluded.Date
+                       OR Montant IS NOT excluded.Montant
+                       OR Type IS NOT excluded.Type
+                       OR Utilite IS NOT excluded.Utilite
+                       OR Description IS NOT excluded.Description
+                       OR AuteurID IS NOT excluded.AuteurID
+                       OR CategorieID IS NOT excluded.CategorieID
+                       OR Devise IS NOT excluded.Devise
+                """,
+                    maj,
+                )
+                nb_maj = self.cursor.rowcount
+
+            nb_suppressions = 0
+            if suppressions:
+                self.cursor.executemany("DELETE FROM transactions WHERE Uid = ?", suppressions)
+                nb_suppressions = self.cursor.rowcount
+
+        return nb_maj, nb_suppressions
+
+    def obtenir_version_donnees(self) -> Tuple[int, int]:
+        """
+        Retourne un marqueur qui change dès que les données sont modifiées
+
+        PRAGMA data_version détecte les écritures faites par d'autres connexions,
+        total_changes celles faites par cette connexion.
+
+        Returns:
+            Tuple (data_version, total_changes) à comparer entre deux appels
+        """
+        self.cursor.execute("PRAGMA data_version")
+        return self.cursor.fetchone()[0], self.conn.total_changes
+
+    def obtenir_version_persistante(self) -> str:
+        """
+        Retourne un marqueur des données qui reste valable d'une session à l'autre
+
+        Contrairement à obtenir_version_donnees, il ne dépend pas de la connexion :
+        il combine le fichier, l'identifiant de la base, la dernière séquence du
+        journal et une empreinte des taux de change et des limites de budget
+        (non journalisés). Les récurrences échues sont d'abord matérialisées,
+        pour que le marqueur corresponde aux données que verront les lectures.
+
+        Returns:
+            Marqueur à comparer entre deux appels ou deux sessions
+        """
+        self._materialiser_recurrences()
+        parametres = hashlib.blake2b(digest_size=8)
+        for table, ordre in (("taux_change", "Devise, Date"), ("budgets", "AuteurID, Utilite")):
+            for row in self.conn.execute(f"SELECT * FROM {table} ORDER BY {ordre}"):
+                parametres.update(repr(row).encode())
+        return f"{self.db_name}:{self.obtenir_uid_base()}:{self.obtenir_sequence_journal()}:{parametres.hexdigest()}"
 
     def fermer(self):
         """Ferme la connexion à la base de données"""
@@ -0,0 +1,95 @@
+import csv
+import functools
+import gzip
+import json
+import time
+from typing import Callable, Dict, Optional
+
+from database_manager import BudgetDatabase
+
+FORMATS_EXPORT = ("csv", "jsonl")
+COLONNES_EXPORT = [
+    "ID",
+    "Date",
+    "Montant",
+    "Devise",
+    "Type",
+    "Utilite",
+    "Description",
+    "Auteur",
+    "Categorie",
+    "RecurrenceID",
+]
+
+
+def _ecrire_ligne_json(f, trans: Dict):
+    """Écrit une transaction sur une ligne JSON"""
+    f.write(json.dumps(trans, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def exporter_transactions(
+    db: BudgetDatabase,
+    chemin: str,
+    format_export: str = None,
+    date_debut: str = None,
+    date_fin: str = None,
+    filtres: Optional[Dict] = None,
+    compression: bool = None,
+    progression: Optional[Callable[[int], None]] = None,
+    intervalle_progression: int = 10_000,
+) -> Dict:
+    """
+    Exporte les transactions en CSV ou en JSON Lines, ligne par ligne
+
+    Les lignes sont lues par lots depuis la base et écrites au fil de l'eau :
+    la mémoire utilisée ne dépend pas du nombre de transactions exportées.
+
+    Args:
+        db: Instance de BudgetDatabase
+        chemin: Fichier de destination (ex: transactions.csv, transactions.jsonl.gz)
+        format_export: 'csv' ou 'jsonl' (par défaut déduit de l'extension du fichier)
+        date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+        date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+        filtres: Filtres supplémentaires, voir FILTRES_TRANSACTIONS (optionnel)
+        compression: Compresser en gzip (par défaut si le fichier se termine par .gz)
+        progression: Fonction appelée avec le nombre de lignes déjà écrites (optionnel)
+        intervalle_progression: Nombre de lignes entre deux appels à progression
+
+    Returns:
+        Dict avec 'nb_lignes', 'duree' (secondes) et 'lignes_par_seconde'
+    """
+    if compression is None:
+        compression = chemin.endswith(".gz")
+    if format_export is None:
+        nom = chemin[:-3] if chemin.endswith(".gz") else chemin
+        format_export = "jsonl" if nom.endswith((".jsonl", ".json")) else "csv"
+    if format_export not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu: {format_export}")
+
+    debut = time.perf_counter()
+    nb_lignes = 0
+    ouvrir = gzip.open if compression else open
+
+    with ouvrir(chemin, "wt", encoding="utf-8", newline="") as f:
+        if format_export == "csv":
+            writer = csv.DictWriter(f, fieldnames=COLONNES_EXPORT)
+            writer.writeheader()
+            ecrire = writer.writerow
+        else:
+            ecrire = functools.partial(_ecrire_ligne_json, f)
+
+        for trans in db.iterer_transactions(date_debut, date_fin, filtres=filtres):
+            ecrire(trans)
+            nb_lignes += 1
+            if progression and nb_lignes % intervalle_progression == 0:
+                progression(nb_lignes)
+
+    if progression:
+        progression(nb_lignes)
+
+    duree = time.perf_counter() - debut
+    return {
+        "nb_lignes": nb_lignes,
+        "duree": duree,
+        "lignes_par_seconde": nb_lignes / duree if duree > 0 else 0.0,
+    }
@@ -0,0 +1,77 @@
+import csv
+import gzip
+import json
+from typing import Dict, Iterator
+
+from database_manager import BudgetDatabase
+
+
+def _lire_transactions(chemin: str) -> Iterator[Dict]:
+    """
+    Lit un fichier CSV ou JSON Lines (éventuellement compressé en gzip) ligne par ligne
+
+    Le format est celui produit par exporter_transactions : les colonnes ID et
+    RecurrenceID sont ignorées, Categorie et Devise sont optionnelles.
+    """
+    ouvrir = gzip.open if chemin.endswith(".gz") else open
+    nom = chemin[:-3] if chemin.endswith(".gz") else chemin
+
+    with ouvrir(chemin, "rt", encoding="utf-8", newline="") as f:
+        if nom.endswith((".jsonl", ".json")):
+            lignes = (json.loads(ligne) for ligne in f if ligne.strip())
+        else:
+            lignes = csv.DictReader(f)
+
+        for ligne in lignes:
+            yield {
+                "Date": ligne["Date"],
+                "Montant": float(ligne["Montant"]),
+                "Type": ligne["Type"],
+                "Utilite": ligne["Utilite"],
+                "Description": ligne.get("Description") or "",
+                "Auteur": ligne["Auteur"],
+                "Categorie": ligne.get("Categorie") or None,
+                "Devise": ligne.get("Devise") or None,
+            }
+
+
+def importer_transactions(
+    db: BudgetDatabase,
+    chemin: str,
+    doublons: str = "ignorer",
+    approximatif: bool = False,
+    taille_lot: int = 5000,
+) -> Dict[str, int]:
+    """
+    Importe un fichier de transactions en détectant les lignes déjà présentes
+
+    Réimporter le même fichier n'ajoute rien en mode 'ignorer'. Le fichier est
+    lu et inséré par lots : la mémoire utilisée ne dépend pas de sa taille.
+
+    Args:
+        db: Instance de BudgetDatabase
+        chemin: Fichier CSV ou JSON Lines (.gz pour un fichier compressé)
+        doublons: 'ignorer' ou 'signaler', voir BudgetDatabase.ajouter_entrees
+        approximatif: Détecte aussi les quasi-doublons (dates proches, description similaire)
+        taille_lot: Nombre de lignes insérées par transaction
+
+    Returns:
+        Dict avec 'ajoutees', 'ignorees' et 'signalees'
+    """
+    totaux = {"ajoutees": 0, "ignorees": 0, "signalees": 0}
+    lot = []
+
+    def inserer():
+        resultat = db.ajouter_entrees(lot, doublons=doublons, approximatif=approximatif)
+        for cle in totaux:
+            totaux[cle] += resultat[cle]
+        lot.clear()
+
+    for transaction in _lire_transactions(chemin):
+        lot.append(transaction)
+        if len(lot) >= taille_lot:
+            inserer()
+    if lot:
+        inserer()
+
+    return totaux
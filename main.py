@@ -1,7 +1,14 @@
 from datetime import datetime
 
-from database_manager import BudgetDatabase
-from visualizer import BudgetVisualizer
+from dashboard import TableauDeBord
+from database_manager import DEVISE_REFERENCE, DIMENSIONS_PIVOT, MESURES_PIVOT, BudgetDatabase
+from export import exporter_transactions
+from importation import importer_transactions
+from rapport import generer_rapport_annuel
+from replique import RepliqueAnalytique, mesurer_latences
+from snapshot import exporter_snapshot
+from synchronisation import exporter_changements, importer_changements
+from visualizer import GRAPHIQUES_CACHABLES, BudgetVisualizer
 
 
 def afficher_menu():
@@ -20,7 +27,23 @@ def afficher_menu():
     print("9. Analyse revenus par auteur")
     print("10. Graphiques d'évolution mensuelle")
     print("11. Graphique comparatif auteurs")
-    print("12. Quitter")
+    print("12. Exporter un snapshot colonnaire")
+    print("13. Tableau de bord en direct")
+    print("14. Historique journalier")
+    print("15. Modification groupée")
+    print("16. Transactions récurrentes")
+    print("17. Synchroniser avec une autre copie")
+    print("18. Projection Monte Carlo du solde")
+    print("19. Exporter les transactions (CSV/JSON Lines)")
+    print("20. Devises et taux de change")
+    print("21. Importer des transactions (CSV/JSON Lines)")
+    print("22. Mode analyse en mémoire (activer/désactiver)")
+    print("23. Rapport annuel PDF")
+    print("24. Tableau croisé (pivot)")
+    print("25. Règlement des dépenses communes")
+    print("26. Exporter un graphique en image (cache)")
+    print("27. Budgets mensuels (limites)")
+    print("28. Quitter")
     print("=" * 50)
 
 
@@ -33,6 +56,7 @@ def ajouter_transaction(db: BudgetDatabase):
         date = datetime.now().strftime("%Y-%m-%d")
 
     montant = float(input("Montant: "))
+    devise = input(f"Devise [{DEVISE_REFERENCE}]: ").strip() or DEVISE_REFERENCE
 
     print("Type: 1=Revenu, 2=Dépense")
     type_choice = input("Choix: ")
@@ -44,10 +68,15 @@ def ajouter_transaction(db: BudgetDatabase):
 
     description = input("Description: ")
     auteur = input("Auteur: ")
+    categorie = input("Catégorie (Entrée pour aucune): ").strip() or None
 
-    transaction_id = db.ajouter_entree(date, montant, type_trans, utilite, description, auteur)
+    transaction_id = db.ajouter_entree(date, montant, type_trans, utilite, description, auteur, categorie, devise)
     print(f"✓ Transaction ajoutée avec l'ID {transaction_id}")
 
+    if type_trans == "Depense":
+        for budget in db.verifier_budgets(auteur, utilite, date):
+            print(f"⚠ Budget {_libelle_budget(budget)} dépassé: {_consommation_budget(budget, db.symbole_devise)}")
+
 
 def modifier_transaction(db: BudgetDatabase):
     """Interface pour modifier une transaction"""
@@ -64,11 +93,12 @@ def modifier_transaction(db: BudgetDatabase):
     # Afficher la transaction actuelle
     print("\nTransaction actuelle:")
     print(f"Date: {transaction['Date']}")
-    print(f"Montant: {transaction['Montant']}")
+    print(f"Montant: {transaction['Montant']} {transaction['Devise']}")
     print(f"Type: {transaction['Type']}")
     print(f"Utilité: {transaction['Utilite']}")
     print(f"Description: {transaction['Description']}")
     print(f"Auteur: {transaction['Auteur']}")
+    print(f"Catégorie: {transaction['Categorie'] or '-'}")
 
     print("\n(Appuyez sur Entrée pour conserver la valeur actuelle)")
 
@@ -77,6 +107,7 @@ def modifier_transaction(db: BudgetDatabase):
 
     montant_str = input(f"Nouveau montant [{transaction['Montant']}]: ").strip()
     montant = float(montant_str) if montant_str else None
+    devise = input(f"Nouvelle devise [{transaction['Devise']}]: ").strip() or None
 
     print(f"Type actuel: {transaction['Type']}")
     print("Nouveau type: 1=Revenu, 2=Dépense, Entrée=Conserver")
@@ -98,22 +129,62 @@ def modifier_transaction(db: BudgetDatabase):
 
     description = input(f"Nouvelle description [{transaction['Description']}]: ").strip() or None
     auteur = input(f"Nouvel auteur [{transaction['Auteur']}]: ").strip() or None
+    categorie = input(f"Nouvelle catégorie [{transaction['Categorie'] or '-'}]: ").strip() or None
 
-    if db.modifier_entree(transaction_id, date, montant, type_trans, utilite, description, auteur):
+    if db.modifier_entree(transaction_id, date, montant, type_trans, utilite, description, auteur, categorie, devise):
         print("✓ Transaction modifiée")
     else:
         print("✗ Erreur lors de la modification")
 
 
 def supprimer_transaction(db: BudgetDatabase):
-    """Interface pour supprimer une transaction"""
+    """Interface pour supprimer une ou plusieurs transactions"""
     print("\n--- SUPPRIMER UNE TRANSACTION ---")
-    transaction_id = int(input("ID de la transaction à supprimer: "))
+    ids = [int(i) for i in input("ID(s) de la transaction à supprimer (séparés par des virgules): ").split(",")]
 
-    if db.supprimer_entree(transaction_id):
-        print("✓ Transaction supprimée")
-    else:
-        print("✗ Transaction non trouvée")
+    if len(ids) == 1:
+        if db.supprimer_entree(ids[0]):
+            print("✓ Transaction supprimée")
+        else:
+            print("✗ Transaction non trouvée")
+        return
+
+    nb_supprimees = db.supprimer_entrees(ids=ids)
+    print(f"✓ {nb_supprimees} transaction(s) supprimée(s) sur {len(ids)}")
+
+
+def modifier_transactions_groupe(db: BudgetDatabase):
+    """Interface pour modifier en une fois toutes les transactions correspondant à des filtres"""
+    print("\n--- MODIFICATION GROUPÉE ---")
+    print("(Appuyez sur Entrée pour ignorer un filtre)")
+
+    filtres = {
+        "description": input("Description contenant: ").strip() or None,
+        "auteur": input("Auteur: ").strip() or None,
+        "categorie": input("Catégorie: ").strip() or None,
+        "date_debut": input("Date de début (YYYY-MM-DD): ").strip() or None,
+        "date_fin": input("Date de fin exclue (YYYY-MM-DD): ").strip() or None,
+    }
+    if not any(filtres.values()):
+        print("✗ Au moins un filtre est requis")
+        return
+
+    print("\nNouvelles valeurs (Entrée=Conserver)")
+    print("Nouveau type: 1=Revenu, 2=Dépense")
+    type_choice = input("Choix: ").strip()
+    type_trans = {"1": "Revenu", "2": "Depense"}.get(type_choice)
+
+    print("Nouvelle utilité: 1=Commun, 2=Perso")
+    util_choice = input("Choix: ").strip()
+    utilite = {"1": "Commun", "2": "Perso"}.get(util_choice)
+
+    auteur = input("Nouvel auteur: ").strip() or None
+    categorie = input("Nouvelle catégorie: ").strip() or None
+
+    nb_modifiees = db.modifier_entrees(
+        filtres=filtres, type_transaction=type_trans, utilite=utilite, auteur=auteur, categorie=categorie
+    )
+    print(f"✓ {nb_modifiees} transaction(s) modifiée(s)")
 
 
 def voir_transactions_mois(db: BudgetDatabase):
@@ -139,13 +210,18 @@ def voir_transactions_mois(db: BudgetDatabase):
         return
 
     print(f"\n{len(transactions)} transaction(s) trouvée(s):")
-    print("-" * 100)
-    print(f"{'ID':<5} {'Date':<12} {'Type':<10} {'Utilité':<10} {'Montant':<10} {'Auteur':<15} {'Description':<30}")
-    print("-" * 100)
+    print("-" * 120)
+    print(
+        f"{'ID':<5} {'Date':<12} {'Type':<10} {'Utilité':<10} {'Montant':<14} {'Auteur':<15} "
+        f"{'Catégorie':<15} {'Description':<30}"
+    )
+    print("-" * 120)
 
     for t in transactions:
+        montant = f"{t['Montant']:.2f} {t['Devise']}"
         print(
-            f"{t['ID']:<5} {t['Date']:<12} {t['Type']:<10} {t['Utilite']:<10} {t['Montant']:<10.2f} {t['Auteur']:<15} {t['Description']:<30}"
+            f"{t['ID']:<5} {t['Date']:<12} {t['Type']:<10} {t['Utilite']:<10} {montant:<14} {t['Auteur']:<15} "
+            f"{t['Categorie'] or '-':<15} {t['Description']:<30}"
         )
 
 
@@ -166,7 +242,7 @@ def lister_revenus_mois(db: BudgetDatabase):
             print(f"(avec le filtre auteur: {auteur})")
         return
 
-    total = sum(r["Montant"] for r in revenus)
+    total = sum(db.convertir(r["Montant"], r["Devise"], r["Date"]) for r in revenus)
 
     # Affichage du titre avec mention du filtre si applicable
     titre = f"\n{len(revenus)} revenu(s) pour {mois:02d}/{annee}"
@@ -174,17 +250,16 @@ def lister_revenus_mois(db: BudgetDatabase):
         titre += f" - Auteur: {auteur}"
     print(titre + ":")
 
-    print("-" * 100)
-    print(f"{'ID':<5} {'Date':<12} {'Utilité':<10} {'Montant':<10} {'Auteur':<15} {'Description':<30}")
-    print("-" * 100)
+    print("-" * 104)
+    print(f"{'ID':<5} {'Date':<12} {'Utilité':<10} {'Montant':<14} {'Auteur':<15} {'Description':<30}")
+    print("-" * 104)
 
     for r in revenus:
-        print(
-            f"{r['ID']:<5} {r['Date']:<12} {r['Utilite']:<10} {r['Montant']:<10.2f} {r['Auteur']:<15} {r['Description']:<30}"
-        )
+        montant = f"{r['Montant']:.2f} {r['Devise']}"
+        print(f"{r['ID']:<5} {r['Date']:<12} {r['Utilite']:<10} {montant:<14} {r['Auteur']:<15} {r['Description']:<30}")
 
-    print("-" * 100)
-    print(f"{'TOTAL':<37} {total:<10.2f}")
+    print("-" * 104)
+    print(f"{'TOTAL':<29} {total:.2f} {db.devise_rapport}")
 
 
 def lister_depenses_mois(db: BudgetDatabase):
@@ -204,7 +279,7 @@ def lister_depenses_mois(db: BudgetDatabase):
             print(f"(avec le filtre auteur: {auteur})")
         return
 
-    total = sum(d["Montant"] for d in depenses)
+    total = sum(db.convertir(d["Montant"], d["Devise"], d["Date"]) for d in depenses)
 
     # Affichage du titre avec mention du filtre si applicable
     titre = f"\n{len(depenses)} dépense(s) pour {mois:02d}/{annee}"
@@ -212,17 +287,16 @@ def lister_depenses_mois(db: BudgetDatabase):
         titre += f" - Auteur: {auteur}"
     print(titre + ":")
 
-    print("-" * 100)
-    print(f"{'ID':<5} {'Date':<12} {'Utilité':<10} {'Montant':<10} {'Auteur':<15} {'Description':<30}")
-    print("-" * 100)
+    print("-" * 104)
+    print(f"{'ID':<5} {'Date':<12} {'Utilité':<10} {'Montant':<14} {'Auteur':<15} {'Description':<30}")
+    print("-" * 104)
 
     for d in depenses:
-        print(
-            f"{d['ID']:<5} {d['Date']:<12} {d['Utilite']:<10} {d['Montant']:<10.2f} {d['Auteur']:<15} {d['Description']:<30}"
-        )
+        montant = f"{d['Montant']:.2f} {d['Devise']}"
+        print(f"{d['ID']:<5} {d['Date']:<12} {d['Utilite']:<10} {montant:<14} {d['Auteur']:<15} {d['Description']:<30}")
 
-    print("-" * 100)
-    print(f"{'TOTAL':<37} {total:<10.2f}")
+    print("-" * 104)
+    print(f"{'TOTAL':<29} {total:.2f} {db.devise_rapport}")
 
 
 def voir_totaux_par_personne(db: BudgetDatabase):
@@ -302,10 +376,10 @@ def analyse_depenses_utilite(db: BudgetDatabase, visualizer: BudgetVisualizer):
     # Affichage dans le terminal
     periode = f"{mois:02d}/{annee}" if annee and mois else "Toute période"
     print(f"\n=== Dépenses par utilité - {periode} ===")
-    print(f"Revenus totaux: {revenus_total:.2f}€")
-    print(f"Dépenses totales: {total_depenses:.2f}€")
+    print(f"Revenus totaux: {revenus_total:.2f}{db.symbole_devise}")
+    print(f"Dépenses totales: {total_depenses:.2f}{db.symbole_devise}")
     print("-" * 80)
-    print(f"{'Utilité':<15} {'Montant (€)':<15} {'% du total':<15} {'% des revenus':<20}")
+    print(f"{'Utilité':<15} {'Montant (' + db.symbole_devise + ')':<15} {'% du total':<15} {'% des revenus':<20}")
     print("-" * 80)
 
     for utilite, montant in depenses.items():
@@ -344,9 +418,9 @@ def analyse_revenus_auteur(db: BudgetDatabase, visualizer: BudgetVisualizer):
     # Affichage dans le terminal
     periode = f"{mois:02d}/{annee}" if annee and mois else "Toute période"
     print(f"\n=== Revenus par auteur - {periode} ===")
-    print(f"Revenus totaux: {total_revenus:.2f}€")
+    print(f"Revenus totaux: {total_revenus:.2f}{db.symbole_devise}")
     print("-" * 60)
-    print(f"{'Auteur':<20} {'Montant (€)':<20} {'% du total':<20}")
+    print(f"{'Auteur':<20} {'Montant (' + db.symbole_devise + ')':<20} {'% du total':<20}")
     print("-" * 60)
 
     for auteur, montant in sorted(revenus_auteurs.items(), key=lambda x: x[1], reverse=True):
@@ -386,11 +460,463 @@ def graphique_comparatif(visualizer: BudgetVisualizer):
     visualizer.graphique_comparatif_auteurs(annee, mois)
 
 
+def gerer_recurrences(db: BudgetDatabase):
+    """Interface de gestion des transactions récurrentes"""
+    print("\n--- TRANSACTIONS RÉCURRENTES ---")
+    print("1. Ajouter une règle")
+    print("2. Lister les règles")
+    print("3. Supprimer une règle")
+    print("4. Projection d'un mois")
+    choix = input("Choix: ").strip()
+
+    if choix == "1":
+        print("Fréquence: 1=Hebdomadaire, 2=Mensuelle, 3=Annuelle")
+        frequence = {"1": "hebdomadaire", "3": "annuelle"}.get(input("Choix: ").strip(), "mensuelle")
+
+        date_debut = input("Date de première occurrence (YYYY-MM-DD) [Entrée pour aujourd'hui]: ").strip()
+        if not date_debut:
+            date_debut = datetime.now().strftime("%Y-%m-%d")
+        date_fin = input("Date de fin (YYYY-MM-DD) [Entrée pour aucune]: ").strip() or None
+
+        montant = float(input("Montant: "))
+        devise = input(f"Devise [{DEVISE_REFERENCE}]: ").strip() or DEVISE_REFERENCE
+
+        print("Type: 1=Revenu, 2=Dépense")
+        type_trans = "Revenu" if input("Choix: ") == "1" else "Depense"
+
+        print("Utilité: 1=Commun, 2=Perso")
+        utilite = "Commun" if input("Choix: ") == "1" else "Perso"
+
+        description = input("Description: ")
+        auteur = input("Auteur: ")
+        categorie = input("Catégorie (Entrée pour aucune): ").strip() or None
+
+        recurrence_id = db.ajouter_recurrence(
+            frequence, date_debut, montant, type_trans, utilite, description, auteur, date_fin, categorie, devise
+        )
+        print(f"✓ Règle ajoutée avec l'ID {recurrence_id}")
+
+    elif choix == "2":
+        recurrences = db.obtenir_recurrences()
+        if not recurrences:
+            print("\nAucune règle récurrente")
+            return
+
+        print("-" * 114)
+        print(
+            f"{'ID':<5} {'Fréquence':<13} {'Début':<12} {'Fin':<12} {'Type':<10} {'Montant':<14} "
+            f"{'Auteur':<15} {'Description':<30}"
+        )
+        print("-" * 114)
+        for r in recurrences:
+            montant = f"{r['Montant']:.2f} {r['Devise']}"
+            print(
+                f"{r['ID']:<5} {r['Frequence']:<13} {r['DateDebut']:<12} {r['DateFin'] or '-':<12} {r['Type']:<10} "
+                f"{montant:<14} {r['Auteur']:<15} {r['Description']:<30}"
+            )
+
+    elif choix == "3":
+        recurrence_id = int(input("ID de la règle à supprimer: "))
+        if db.supprimer_recurrence(recurrence_id):
+            print("✓ Règle supprimée (les occurrences passées sont conservées)")
+        else:
+            print("✗ Règle non trouvée")
+
+    elif choix == "4":
+        annee = int(input("Année: "))
+        mois = int(input("Mois (1-12): "))
+        totaux = db.obtenir_totaux_mois(annee, mois, inclure_projections=True)
+
+        print(f"\nProjection pour {mois:02d}/{annee} (récurrences futures incluses):")
+        print("-" * 60)
+        print(f"{'Auteur':<20} {'Revenus':<15} {'Dépenses':<15} {'Solde':<15}")
+        print("-" * 60)
+        for auteur, montants in totaux.items():
+            solde = montants["revenus"] - montants["depenses"]
+            print(f"{auteur:<20} {montants['revenus']:<15.2f} {montants['depenses']:<15.2f} {solde:<15.2f}")
+
+    else:
+        print("\n✗ Choix invalide")
+
+
+def graphique_historique(visualizer: BudgetVisualizer):
+    """Affiche l'historique journalier sur une période"""
+    print("\n--- HISTORIQUE JOURNALIER ---")
+    date_debut = input("Date de début (YYYY-MM-DD) [Entrée pour le début]: ").strip() or None
+    date_fin = input("Date de fin exclue (YYYY-MM-DD) [Entrée pour la fin]: ").strip() or None
+
+    print("\nGénération des graphiques...")
+    visualizer.graphique_historique_journalier(date_debut, date_fin)
+
+
+def exporter_snapshot_periode(db: BudgetDatabase):
+    """Exporte une période dans un snapshot colonnaire"""
+    print("\n--- EXPORTER UN SNAPSHOT ---")
+    date_debut = input("Date de début (YYYY-MM-DD) [Entrée pour le début]: ").strip() or None
+    date_fin = input("Date de fin exclue (YYYY-MM-DD) [Entrée pour la fin]: ").strip() or None
+    dossier = input("Dossier de destination [snapshot]: ").strip() or "snapshot"
+
+    nb_lignes = exporter_snapshot(db, dossier, date_debut, date_fin)
+    print(f"✓ {nb_lignes} transaction(s) exportée(s) dans {dossier}")
+
+
+def tableau_de_bord(db: BudgetDatabase):
+    """Affiche le tableau de bord mis à jour en direct"""
+    print("\n--- TABLEAU DE BORD ---")
+    maintenant = datetime.now()
+    annee_str = input(f"Année [{maintenant.year}]: ").strip()
+    mois_str = input(f"Mois (1-12) [{maintenant.month}]: ").strip()
+    annee = int(annee_str) if annee_str else maintenant.year
+    mois = int(mois_str) if mois_str else maintenant.month
+
+    print("\nLe tableau de bord se met à jour à chaque modification de la base (fermez la fenêtre pour revenir)")
+    TableauDeBord(db, annee, mois).afficher()
+
+
+def graphique_projection(visualizer: BudgetVisualizer):
+    """Affiche la projection Monte Carlo du solde jusqu'à la fin de l'année"""
+    print("\n--- PROJECTION DU SOLDE ---")
+    print("Compte: 1=Commun, 2=Perso, 3=Tout le budget")
+    utilite = {"1": "Commun", "2": "Perso"}.get(input("Choix: ").strip())
+    nb_chemins_str = input("Nombre de simulations [100000]: ").strip()
+    nb_chemins = int(nb_chemins_str) if nb_chemins_str else 100_000
+
+    print("\nSimulation et génération des graphiques...")
+    visualizer.graphique_projection(nb_chemins=nb_chemins, utilite=utilite)
+
+
+def synchroniser(db: BudgetDatabase):
+    """Exporte ou importe les changements à échanger avec une autre copie de la base"""
+    print("\n--- SYNCHRONISATION ---")
+    print("1. Exporter les changements")
+    print("2. Importer un fichier de changements")
+    choix = input("Choix: ").strip()
+
+    if choix == "1":
+        dernier_export = db.obtenir_meta("dernier_export") or "0"
+        depuis_str = input(f"Depuis la séquence [{dernier_export}]: ").strip()
+        depuis = int(depuis_str) if depuis_str else int(dernier_export)
+        chemin = input("Fichier de destination [changements.jsonl.gz]: ").strip() or "changements.jsonl.gz"
+
+        nb_changements, jusqua = exporter_changements(db, chemin, depuis)
+        print(f"✓ {nb_changements} changement(s) exporté(s) dans {chemin} (séquence {depuis} → {jusqua})")
+
+    elif choix == "2":
+        chemin = input("Fichier à importer [changements.jsonl.gz]: ").strip() or "changements.jsonl.gz"
+        nb_maj, nb_suppressions = importer_changements(db, chemin)
+        print(f"✓ {nb_maj} transaction(s) ajoutée(s) ou modifiée(s), {nb_suppressions} supprimée(s)")
+
+    else:
+        print("\n✗ Choix invalide")
+
+
+def exporter_transactions_fichier(db: BudgetDatabase):
+    """Exporte les transactions d'une période en CSV ou JSON Lines"""
+    print("\n--- EXPORTER LES TRANSACTIONS ---")
+    print("(Appuyez sur Entrée pour ignorer un filtre)")
+    date_debut = input("Date de début (YYYY-MM-DD): ").strip() or None
+    date_fin = input("Date de fin exclue (YYYY-MM-DD): ").strip() or None
+    filtres = {
+        "auteur": input("Auteur: ").strip() or None,
+        "categorie": input("Catégorie: ").strip() or None,
+    }
+    print("Type: 1=Revenu, 2=Dépense, Entrée=Tous")
+    filtres["type_transaction"] = {"1": "Revenu", "2": "Depense"}.get(input("Choix: ").strip())
+    chemin = input("Fichier de destination (.csv, .jsonl, .gz pour compresser) [transactions.csv]: ").strip()
+    chemin = chemin or "transactions.csv"
+
+    resultat = exporter_transactions(
+        db,
+        chemin,
+        date_debut=date_debut,
+        date_fin=date_fin,
+        filtres=filtres,
+        progression=lambda nb: print(f"\r  {nb} ligne(s) écrite(s)...", end="", flush=True),
+    )
+    print(
+        f"\n✓ {resultat['nb_lignes']} transaction(s) exportée(s) dans {chemin} "
+        f"en {resultat['duree']:.2f}s ({resultat['lignes_par_seconde']:.0f} lignes/s)"
+    )
+
+
+def gerer_devises(db: BudgetDatabase):
+    """Sous-menu des taux de change et de la devise de rapport"""
+    print("\n--- DEVISES ---")
+    print(f"Devise de rapport actuelle: {db.devise_rapport}")
+    print(f"1. Enregistrer un taux de change (valeur d'une unité en {DEVISE_REFERENCE})")
+    print("2. Voir les taux d'une devise")
+    print("3. Changer la devise de rapport")
+    choix = input("Choix: ").strip()
+
+    if choix == "1":
+        devise = input("Devise (ex: USD): ").strip()
+        date = input("Date d'effet (YYYY-MM-DD) [Entrée pour aujourd'hui]: ").strip()
+        if not date:
+            date = datetime.now().strftime("%Y-%m-%d")
+        taux = float(input(f"1 {devise.upper()} = ? {DEVISE_REFERENCE}: "))
+        db.definir_taux(devise, date, taux)
+        print("✓ Taux enregistré")
+
+    elif choix == "2":
+        devise = input("Devise: ").strip()
+        taux = db.obtenir_taux(devise)
+        if not taux:
+            print("\nAucun taux pour cette devise")
+            return
+        for date, valeur in taux:
+            print(f"{date:<12} 1 {devise.upper()} = {valeur:.4f} {DEVISE_REFERENCE}")
+
+    elif choix == "3":
+        print(f"Devises connues: {', '.join(db.obtenir_devises())}")
+        db.definir_devise_rapport(input("Nouvelle devise de rapport: ").strip())
+        print(f"✓ Les totaux sont maintenant exprimés en {db.devise_rapport}")
+
+    else:
+        print("\n✗ Choix invalide")
+
+
+def importer_transactions_fichier(db: BudgetDatabase):
+    """Importe un fichier de transactions sans dupliquer les lignes déjà présentes"""
+    print("\n--- IMPORTER DES TRANSACTIONS ---")
+    chemin = input("Fichier à importer (.csv, .jsonl, .gz) [transactions.csv]: ").strip() or "transactions.csv"
+    print("Doublons: 1=Ignorer, 2=Importer et signaler")
+    doublons = "signaler" if input("Choix: ").strip() == "2" else "ignorer"
+    approximatif = input("Détecter aussi les quasi-doublons (dates proches, description similaire)? (o/N): ")
+    approximatif = approximatif.strip().lower() == "o"
+
+    resultat = importer_transactions(db, chemin, doublons, approximatif)
+    print(
+        f"✓ {resultat['ajoutees']} transaction(s) importée(s), {resultat['ignorees']} doublon(s) ignoré(s), "
+        f"{resultat['signalees']} doublon(s) signalé(s)"
+    )
+
+    signales = db.obtenir_doublons()
+    if not signales:
+        return
+
+    print(f"\n{len(signales)} transaction(s) signalée(s) comme doublon:")
+    print("-" * 100)
+    print(f"{'ID':<5} {'Doublon de':<11} {'Date':<12} {'Montant':<14} {'Auteur':<15} {'Description':<30}")
+    print("-" * 100)
+    for t in signales:
+        montant = f"{t['Montant']:.2f} {t['Devise']}"
+        print(
+            f"{t['ID']:<5} {t['DoublonDe']:<11} {t['Date']:<12} {montant:<14} {t['Auteur']:<15} {t['Description']:<30}"
+        )
+
+    if input("\nSupprimer ces doublons? (o/N): ").strip().lower() == "o":
+        nb_supprimees = db.supprimer_entrees(ids=[t["ID"] for t in signales])
+        print(f"✓ {nb_supprimees} doublon(s) supprimé(s)")
+
+
+def basculer_mode_analyse(db: BudgetDatabase, replique: RepliqueAnalytique = None) -> RepliqueAnalytique:
+    """
+    Active ou désactive la réplique en mémoire utilisée par les rapports (menus 7 à 11)
+
+    Returns:
+        La nouvelle réplique, ou None si le mode analyse est désactivé
+    """
+    print("\n--- MODE ANALYSE EN MÉMOIRE ---")
+    if replique:
+        replique.fermer()
+        print("✓ Mode analyse désactivé: les rapports lisent la base disque")
+        return None
+
+    debut = datetime.now()
+    replique = RepliqueAnalytique(db)
+    duree = (datetime.now() - debut).total_seconds() * 1000
+    print(f"✓ Mode analyse activé: base copiée en mémoire en {duree:.1f} ms")
+    print("  La copie est rafraîchie automatiquement après chaque modification.")
+
+    if input("Comparer la latence des rapports disque/mémoire? (o/N): ").strip().lower() == "o":
+        latences = mesurer_latences(db, replique)
+        print("-" * 60)
+        print(f"{'Requête':<25} {'Disque (ms)':>11} {'Mémoire (ms)':>12} {'Gain':>8}")
+        print("-" * 60)
+        for nom, mesure in latences.items():
+            gain = mesure["disque"] / mesure["memoire"] if mesure["memoire"] else 0.0
+            print(f"{nom:<25} {mesure['disque']:>11.2f} {mesure['memoire']:>12.2f} {gain:>7.2f}x")
+
+    return replique
+
+
+def rapport_annuel(db: BudgetDatabase):
+    """Génère le rapport annuel complet en PDF"""
+    print("\n--- RAPPORT ANNUEL PDF ---")
+    annee = input(f"Année [{datetime.now().year}]: ").strip()
+    annee = int(annee) if annee else datetime.now().year
+    chemin = input(f"Fichier PDF [rapport_{annee}.pdf]: ").strip() or None
+
+    print("\nGénération du rapport...")
+    resultat = generer_rapport_annuel(db, annee, chemin)
+    print(
+        f"✓ {resultat['nb_pages']} page(s) écrites dans {resultat['chemin']} "
+        f"({resultat['nb_transactions']} transactions, {resultat['duree']:.1f} s)"
+    )
+
+
+def tableau_croise(db: BudgetDatabase):
+    """Affiche un tableau croisé sur les dimensions choisies"""
+    print("\n--- TABLEAU CROISÉ ---")
+    print(f"Dimensions: {', '.join(DIMENSIONS_PIVOT)}")
+    lignes = [d.strip() for d in input("Dimensions en lignes (séparées par des virgules): ").split(",") if d.strip()]
+    colonnes = [d.strip() for d in input("Dimensions en colonnes (optionnel): ").split(",") if d.strip()]
+    print(f"Mesures: {', '.join(MESURES_PIVOT)}")
+    mesure = input("Mesure [somme]: ").strip() or "somme"
+    annee = input("Année (Entrée pour toute la base): ").strip()
+    filtres = {"date_debut": f"{annee}-01-01", "date_fin": f"{int(annee) + 1}-01-01"} if annee else None
+
+    pivot = db.obtenir_pivot(lignes, colonnes, mesure, filtres)
+    if not pivot["lignes"] or not pivot["colonnes"]:
+        print("\nAucune transaction")
+        return
+
+    def libelle(valeur) -> str:
+        return " / ".join(str(v) for v in valeur) if isinstance(valeur, tuple) else str(valeur)
+
+    en_tetes = [libelle(c) or mesure for c in pivot["colonnes"]]
+    largeur = max(len(libelle(ligne)) for ligne in pivot["lignes"]) + 2
+    print("\n" + " " * largeur + "".join(f"{e:>14}" for e in en_tetes))
+    print("-" * (largeur + 14 * len(en_tetes)))
+    for ligne, valeurs in zip(pivot["lignes"], pivot["valeurs"]):
+        print(f"{libelle(ligne):<{largeur}}" + "".join(f"{v:>14.2f}" for v in valeurs))
+
+
+def reglement_depenses_communes(db: BudgetDatabase):
+    """Affiche qui doit combien à qui pour les dépenses communes, ou modifie les parts"""
+    print("\n--- RÈGLEMENT DES DÉPENSES COMMUNES ---")
+    parts = db.obtenir_parts()
+    if parts:
+        print("Parts: " + ", ".join(f"{auteur}={part:g}" for auteur, part in parts.items()))
+    print("1. Calculer le règlement")
+    print("2. Définir la part d'un auteur")
+    choix = input("Choix: ").strip()
+
+    if choix == "1":
+        annee = input("Année (Entrée pour toute la base): ").strip()
+        mois = input("Mois (1-12, Entrée pour toute l'année): ").strip() if annee else ""
+        reglement = db.obtenir_reglement(int(annee) if annee else None, int(mois) if mois else None)
+
+        if not reglement["total"]:
+            print("\nAucune dépense commune")
+            return
+
+        symbole = db.symbole_devise
+        print(f"\nTotal des dépenses communes: {reglement['total']:.2f}{symbole}")
+        print("-" * 64)
+        print(f"{'Auteur':<20} {'Payé':>14} {'Dû':>14} {'Solde':>14}")
+        print("-" * 64)
+        for auteur, solde in reglement["soldes"].items():
+            print(f"{auteur:<20} {reglement['paye'][auteur]:>14.2f} {reglement['du'][auteur]:>14.2f} {solde:>+14.2f}")
+
+        if reglement["virements"]:
+            print("\nVirements à effectuer:")
+            for debiteur, crediteur, montant in reglement["virements"]:
+                print(f"  {debiteur} → {crediteur}: {montant:.2f}{symbole}")
+        else:
+            print("\n✓ Les comptes sont équilibrés")
+
+    elif choix == "2":
+        auteur = input("Auteur: ").strip()
+        part = float(input("Part (ex: 1, 2, 0.5): "))
+        db.definir_part(auteur, part)
+        print(f"✓ Part de {auteur} fixée à {part:g}")
+
+    else:
+        print("\n✗ Choix invalide")
+
+
+def exporter_graphique_image(visualizer: BudgetVisualizer):
+    """Écrit un graphique en image, sans fenêtre, en réutilisant le cache si les données n'ont pas changé"""
+    print("\n--- EXPORTER UN GRAPHIQUE EN IMAGE ---")
+    for i, graphique in enumerate(GRAPHIQUES_CACHABLES, 1):
+        print(f"{i}. {graphique.replace('graphique_', '').replace('_', ' ').capitalize()}")
+    graphique = GRAPHIQUES_CACHABLES[int(input("Choix: ")) - 1]
+
+    parametres = {}
+    if graphique == "graphique_historique_journalier":
+        parametres["date_debut"] = input("Date de début (YYYY-MM-DD, Entrée pour tout): ").strip() or None
+        parametres["date_fin"] = input("Date de fin exclue (YYYY-MM-DD, Entrée pour aujourd'hui): ").strip() or None
+    elif graphique == "graphique_evolution_mensuelle":
+        parametres["annee"] = int(input("Année: "))
+    else:
+        annee = input("Année (Entrée pour global): ").strip()
+        if annee:
+            parametres["annee"] = int(annee)
+            parametres["mois"] = int(input("Mois (1-12): "))
+    format_image = input("Format (png, svg, pdf) [png]: ").strip() or "png"
+
+    debut = datetime.now()
+    chemin = visualizer.image(graphique, format_image, **parametres)
+    duree = (datetime.now() - debut).total_seconds() * 1000
+    if chemin:
+        print(f"✓ Image disponible: {chemin} ({duree:.0f} ms)")
+
+
+def _libelle_budget(budget: dict) -> str:
+    """Décrit la portée d'une limite de budget (auteur et utilité)"""
+    return f"{budget['Auteur'] or 'Tous'} / {budget['Utilite'] or 'Toutes'}"
+
+
+def _consommation_budget(budget: dict, symbole: str) -> str:
+    """Formate la consommation d'une limite de budget"""
+    return f"{budget['Consomme']:.2f}{symbole} sur {budget['Limite']:.2f}{symbole} ({budget['Pourcentage']:.0f}%)"
+
+
+def gerer_budgets(db: BudgetDatabase):
+    """Affiche la consommation des limites mensuelles, ou en définit/supprime une"""
+    print("\n--- BUDGETS MENSUELS ---")
+    print("1. Consommation du mois")
+    print("2. Définir une limite")
+    print("3. Supprimer une limite")
+    choix = input("Choix: ").strip()
+
+    if choix == "1":
+        maintenant = datetime.now()
+        annee = int(input(f"Année [{maintenant.year}]: ").strip() or maintenant.year)
+        mois = int(input(f"Mois (1-12) [{maintenant.month}]: ").strip() or maintenant.month)
+        budgets = db.obtenir_budgets(annee, mois)
+        if not budgets:
+            print("\nAucune limite définie")
+            return
+
+        print(f"\n{'Portée':<30} {'Consommé':>12} {'Limite':>12} {'%':>6}")
+        print("-" * 64)
+        for budget in budgets:
+            alerte = " ⚠" if budget["Consomme"] > budget["Limite"] else ""
+            print(
+                f"{_libelle_budget(budget):<30} {budget['Consomme']:>12.2f} {budget['Limite']:>12.2f} "
+                f"{budget['Pourcentage']:>5.0f}%{alerte}"
+            )
+
+    elif choix == "2":
+        auteur = input("Auteur (Entrée pour tous): ").strip() or None
+        print("Utilité: 1=Commun, 2=Perso, Entrée=toutes")
+        utilite = {"1": "Commun", "2": "Perso"}.get(input("Choix: ").strip())
+        limite = float(input("Limite mensuelle: "))
+        devise = input(f"Devise [{DEVISE_REFERENCE}]: ").strip() or DEVISE_REFERENCE
+        db.definir_budget(limite, auteur, utilite, devise)
+        print(f"✓ Limite {auteur or 'Tous'} / {utilite or 'Toutes'} fixée à {limite:.2f} {devise}")
+
+    elif choix == "3":
+        auteur = input("Auteur (Entrée pour tous): ").strip() or None
+        print("Utilité: 1=Commun, 2=Perso, Entrée=toutes")
+        utilite = {"1": "Commun", "2": "Perso"}.get(input("Choix: ").strip())
+        if db.supprimer_budget(auteur, utilite):
+            print("✓ Limite supprimée")
+        else:
+            print("✗ Aucune limite pour cette portée")
+
+    else:
+        print("\n✗ Choix invalide")
+
+
 def main():
     """Fonction principale"""
     print("Initialisation de la base de données...")
 
     with BudgetDatabase("budget.db") as db:
+        replique = None
         visualizer = BudgetVisualizer(db)
 
         while True:
@@ -411,16 +937,51 @@ def main():
                 elif choix == "6":
                     lister_depenses_mois(db)
                 elif choix == "7":
-                    voir_totaux_par_personne(db)
+                    voir_totaux_par_personne(replique or db)
                 elif choix == "8":
-                    analyse_depenses_utilite(db, visualizer)
+                    analyse_depenses_utilite(replique or db, visualizer)
                 elif choix == "9":
-                    analyse_revenus_auteur(db, visualizer)
+                    analyse_revenus_auteur(replique or db, visualizer)
                 elif choix == "10":
                     graphique_evolution(visualizer)
                 elif choix == "11":
                     graphique_comparatif(visualizer)
                 elif choix == "12":
+                    exporter_snapshot_periode(db)
+                elif choix == "13":
+                    tableau_de_bord(db)
+                elif choix == "14":
+                    graphique_historique(visualizer)
+                elif choix == "15":
+                    modifier_transactions_groupe(db)
+                elif choix == "16":
+                    gerer_recurrences(db)
+                elif choix == "17":
+                    synchroniser(db)
+                elif choix == "18":
+                    graphique_projection(visualizer)
+                elif choix == "19":
+                    exporter_transactions_fichier(db)
+                elif choix == "20":
+                    gerer_devises(db)
+                elif choix == "21":
+                    importer_transactions_fichier(db)
+                elif choix == "22":
+                    replique = basculer_mode_analyse(db, replique)
+                    visualizer = BudgetVisualizer(replique or db)
+                elif choix == "23":
+                    rapport_annuel(replique or db)
+                elif choix == "24":
+                    tableau_croise(replique or db)
+                elif choix == "25":
+                    reglement_depenses_communes(db)
+                elif choix == "26":
+                    exporter_graphique_image(visualizer)
+                elif choix == "27":
+                    gerer_budgets(db)
+                elif choix == "28":
+                    if replique:
+                        replique.fermer()
                     print("\nAu revoir!")
                     break
                 else:
@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from database_manager import BudgetDatabase
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def decaler_mois(mois: str, decalage: int) -> str:
+    """Décale un mois 'YYYY-MM' d'un nombre de mois (positif ou négatif)"""
+    annee, numero = int(mois[:4]), int(mois[5:7])
+    total = annee * 12 + numero - 1 + decalage
+    return f"{total // 12}-{total % 12 + 1:02d}"
+
+
+def ecart_mois(debut: str, fin: str) -> int:
+    """Retourne le nombre de mois entre deux mois 'YYYY-MM' (négatif si fin précède debut)"""
+    return (int(fin[:4]) - int(debut[:4])) * 12 + int(fin[5:7]) - int(debut[5:7])
+
+
+class ProjectionBudget:
+    """
+    Projection Monte Carlo des soldes futurs
+
+    Rééchantillonne les mois de l'historique récent (bootstrap) : chaque mois
+    simulé reprend les totaux de toutes les séries (auteur, utilité, type)
+    d'un mois passé tiré au hasard. La moyenne, la dispersion et les
+    corrélations entre séries de l'historique sont conservées sans supposer
+    de loi, et aucun montant tiré n'est négatif. Tous les chemins sont simulés
+    à la fois sous forme de tableaux NumPy.
+    """
+
+    def __init__(self, db: BudgetDatabase, nb_mois_historique: int = 12):
+        """
+        Initialise la projection
+
+        Args:
+            db: Instance de BudgetDatabase
+            nb_mois_historique: Nombre de mois complets d'historique utilisés pour l'ajustement
+        """
+        self.db = db
+        self.nb_mois_historique = nb_mois_historique
+        self.series: List[Tuple[str, str, str]] = []
+        self.totaux = np.zeros((nb_mois_historique, 0))
+
+    def ajuster(self, mois_courant: str = None):
+        """
+        Charge les totaux mensuels de chaque série sur l'historique
+
+        Les mois sans transaction comptent pour zéro dans leur série. Les mois
+        antérieurs au premier mois qui a des données ne sont pas des mois à zéro
+        mais des mois inconnus : ils sont exclus des mois rééchantillonnés.
+
+        Args:
+            mois_courant: Mois 'YYYY-MM' exclu de l'historique (par défaut le mois en cours)
+        """
+        mois_courant = mois_courant or datetime.now().strftime("%Y-%m")
+        premier_mois = decaler_mois(mois_courant, -self.nb_mois_historique)
+        historique = self.db.obtenir_historique_mensuel(f"{premier_mois}-01", f"{mois_courant}-01")
+
+        self.series = sorted({(auteur, utilite, type_trans) for _, auteur, utilite, type_trans, _ in historique})
+        index_series = {serie: i for i, serie in enumerate(self.series)}
+
+        totaux = np.zeros((self.nb_mois_historique, len(self.series)))
+        for mois, auteur, utilite, type_trans, total in historique:
+            totaux[ecart_mois(premier_mois, mois), index_series[(auteur, utilite, type_trans)]] = total
+
+        # L'historique est trié par mois : sa première ligne donne le premier mois qui a des données
+        self.totaux = totaux[ecart_mois(premier_mois, historique[0][0]) :] if historique else totaux
+
+    def _signes(self, utilite: str = None) -> np.ndarray:
+        """Retourne +1 pour les revenus, -1 pour les dépenses, 0 pour les séries hors utilité"""
+        return np.array(
+            [
+                (1.0 if type_trans == "Revenu" else -1.0) if utilite in (None, serie_utilite) else 0.0
+                for _, serie_utilite, type_trans in self.series
+            ]
+        )
+
+    def simuler(
+        self,
+        nb_mois: int,
+        nb_chemins: int = 100_000,
+        utilite: str = "Commun",
+        solde_initial: float = 0.0,
+        graine: int = None,
+    ) -> Dict:
+        """
+        Simule l'évolution du solde sur les mois à venir
+
+        Aucune boucle : le mois d'historique rejoué est tiré pour chaque mois
+        et chaque chemin en une seule opération, puis les soldes sont cumulés.
+
+        Args:
+            nb_mois: Horizon de la projection en mois
+            nb_chemins: Nombre de chemins simulés
+            utilite: 'Commun' pour le compte commun, 'Perso', ou None pour tout le budget
+            solde_initial: Solde au début de la projection
+            graine: Graine du générateur aléatoire (optionnel)
+
+        Returns:
+            Dict avec 'percentiles' ({p: tableau des soldes par mois}), 'proba_negatif'
+            (probabilité de passer sous zéro avant l'horizon) et 'solde_final_moyen'
+        """
+        rng = np.random.default_rng(graine)
+
+        # Solde net de chaque mois de l'historique pour l'utilité demandée
+        nets = self.totaux @ self._signes(utilite)
+        tirages = nets[rng.integers(0, len(nets), size=(nb_mois, nb_chemins))]
+        soldes = solde_initial + np.cumsum(tirages, axis=0)
+
+        return {
+            "percentiles": dict(zip(PERCENTILES, np.percentile(soldes, PERCENTILES, axis=1))),
+            "proba_negatif": float((soldes.min(axis=0) < 0).mean()) if nb_mois else 0.0,
+            "solde_final_moyen": float(soldes[-1].mean()) if nb_mois else float(solde_initial),
+        }
+
+    def solde_actuel(self, utilite: str = "Commun") -> float:
+        """
+        Calcule le solde cumulé de toute la base pour une utilité
+
+        Args:
+            utilite: 'Commun', 'Perso' ou None pour tout le budget
+
+        Returns:
+            Revenus moins dépenses sur toute la période
+        """
+        totaux = self.db.obtenir_historique_mensuel()
+        return sum(
+            total if type_trans == "Revenu" else -total
+            for _, _, serie_utilite, type_trans, total in totaux
+            if utilite in (None, serie_utilite)
+        )
@@ -0,0 +1,116 @@
+import time
+from typing import Dict
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+from database_manager import BudgetDatabase
+from snapshot import BudgetSnapshot
+from visualizer import BudgetVisualizer
+
+NOMS_MOIS = [
+    "Janvier",
+    "Février",
+    "Mars",
+    "Avril",
+    "Mai",
+    "Juin",
+    "Juillet",
+    "Août",
+    "Septembre",
+    "Octobre",
+    "Novembre",
+    "Décembre",
+]
+
+
+def _page_synthese(contexte: BudgetSnapshot, annee: int) -> plt.Figure:
+    """Crée la page de synthèse : tableau mensuel et tableau par auteur de l'année"""
+    symbole = contexte.symbole_devise
+
+    lignes_mois = []
+    total_revenus = total_depenses = 0.0
+    for mois in range(1, 13):
+        revenus = contexte.obtenir_revenus_totaux(annee, mois)
+        depenses = sum(contexte.obtenir_depenses_par_utilite(annee, mois).values())
+        total_revenus += revenus
+        total_depenses += depenses
+        lignes_mois.append([NOMS_MOIS[mois - 1], f"{revenus:.2f}", f"{depenses:.2f}", f"{revenus - depenses:.2f}"])
+    lignes_mois.append(
+        ["Total", f"{total_revenus:.2f}", f"{total_depenses:.2f}", f"{total_revenus - total_depenses:.2f}"]
+    )
+
+    lignes_auteurs = [
+        [auteur, f"{t['revenus']:.2f}", f"{t['depenses']:.2f}", f"{t['revenus'] - t['depenses']:.2f}"]
+        for auteur, t in contexte.obtenir_totaux_globaux().items()
+    ]
+    colonnes = ["", f"Revenus ({symbole})", f"Dépenses ({symbole})", f"Solde ({symbole})"]
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), gridspec_kw={"height_ratios": [3, 1]})
+    for ax, lignes, titre in ((ax1, lignes_mois, "Par mois"), (ax2, lignes_auteurs, "Par auteur")):
+        ax.axis("off")
+        ax.set_title(titre, fontsize=14, fontweight="bold")
+        if lignes:
+            table = ax.table(cellText=lignes, colLabels=colonnes, loc="center", cellLoc="right")
+            table.scale(1, 1.4)
+
+    fig.suptitle(f"Rapport annuel {annee} - {contexte.nb_lignes} transactions", fontsize=16, fontweight="bold")
+    plt.tight_layout()
+    return fig
+
+
+def generer_rapport_annuel(db: BudgetDatabase, annee: int, chemin: str = None) -> Dict:
+    """
+    Génère le rapport annuel complet dans un PDF de plusieurs pages
+
+    Les transactions de l'année sont lues en une seule requête dans un
+    BudgetSnapshot en mémoire ; tous les tableaux et graphiques sont ensuite
+    calculés sur ce contexte sans interroger à nouveau la base.
+
+    Args:
+        db: Instance de BudgetDatabase
+        annee: Année du rapport
+        chemin: Fichier PDF de destination (par défaut rapport_<annee>.pdf)
+
+    Returns:
+        Dict avec 'chemin', 'nb_pages', 'nb_transactions' et 'duree' (secondes)
+    """
+    chemin = chemin or f"rapport_{annee}.pdf"
+    debut = time.perf_counter()
+
+    contexte = BudgetSnapshot.depuis_base(db, f"{annee}-01-01", f"{annee + 1}-01-01")
+    visualizer = BudgetVisualizer(contexte)
+
+    nb_pages = 0
+    with PdfPages(chemin) as pdf:
+
+        def ajouter(fig: plt.Figure):
+            nonlocal nb_pages
+            if fig is None:
+                return
+            pdf.savefig(fig)
+            plt.close(fig)
+            nb_pages += 1
+
+        ajouter(_page_synthese(contexte, annee))
+        ajouter(visualizer.graphique_evolution_mensuelle(annee, afficher=False))
+
+        # Sans filtre de mois, le contexte couvre exactement l'année
+        fig = visualizer.graphique_comparatif_auteurs(afficher=False)
+        if fig:
+            fig.axes[0].set_title(f"Comparatif par auteur - {annee}", fontsize=14, fontweight="bold")
+        ajouter(fig)
+
+        for mois in range(1, 13):
+            if not contexte.obtenir_totaux_mois(annee, mois):
+                continue
+            ajouter(visualizer.graphique_depenses_utilite(annee, mois, afficher=False))
+            ajouter(visualizer.graphique_revenus_auteur(annee, mois, afficher=False))
+            ajouter(visualizer.graphique_comparatif_auteurs(annee, mois, afficher=False))
+
+    return {
+        "chemin": chemin,
+        "nb_pages": nb_pages,
+        "nb_transactions": contexte.nb_lignes,
+        "duree": time.perf_counter() - debut,
+    }
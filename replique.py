@@ -0,0 +1,167 @@
+import functools
+import inspect
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database_manager import BudgetDatabase
+
+
+def _rafraichir_avant_lectures(cls):
+    """
+    Fait vérifier la version de la base source au début de chaque méthode publique héritée
+
+    Sans cela, seules les lectures qui matérialisent les récurrences
+    rafraîchiraient la copie : obtenir_auteurs, obtenir_parts ou les taux
+    de change pourraient renvoyer des données périmées après une écriture.
+    """
+
+    def envelopper(methode):
+        @functools.wraps(methode)
+        def lecture(self, *args, **kwargs):
+            self.rafraichir()
+            return methode(self, *args, **kwargs)
+
+        return lecture
+
+    for nom, methode in vars(BudgetDatabase).items():
+        if inspect.isfunction(methode) and not nom.startswith("_") and nom != "fermer" and nom not in vars(cls):
+            setattr(cls, nom, envelopper(methode))
+    return cls
+
+
+@_rafraichir_avant_lectures
+class RepliqueAnalytique(BudgetDatabase):
+    """
+    Copie en mémoire d'une base budgétaire, réservée aux lectures
+
+    La base disque est copiée dans une connexion :memory: avec l'API de
+    sauvegarde de SQLite. Toutes les méthodes de lecture de BudgetDatabase
+    s'exécutent sur cette copie, qui est recopiée dès que la version des
+    données de la base source change (vérifiée à l'entrée de chaque méthode).
+    """
+
+    def __init__(self, source: BudgetDatabase):
+        """
+        Initialise la réplique et effectue la première copie
+
+        Args:
+            source: Base disque à répliquer (reçoit toujours les écritures)
+        """
+        self.source = source
+        self.version_source = None
+        self.nb_rafraichissements = 0
+        devise_rapport = source.devise_rapport
+        super().__init__(":memory:")
+        self.devise_rapport = devise_rapport
+
+    @property
+    def devise_rapport(self) -> str:
+        """La devise de rapport est partagée avec la base source"""
+        return self.source.devise_rapport
+
+    @devise_rapport.setter
+    def devise_rapport(self, devise: str):
+        self.source.devise_rapport = devise
+
+    def _create_table(self):
+        """Le schéma vient de la base source : la première copie remplace la création des tables"""
+        self.rafraichir()
+
+    def rafraichir(self, forcer: bool = False) -> bool:
+        """
+        Recopie la base source si ses données ont changé depuis la dernière copie
+
+        Args:
+            forcer: Recopie même si la version des données n'a pas changé
+
+        Returns:
+            True si la copie a été refaite
+        """
+        version = self.source.obtenir_version_donnees()
+        if not forcer and version == self.version_source:
+            return False
+
+        self.cursor.execute("PRAGMA query_only = OFF")
+        self.source.conn.backup(self.conn)
+        self.cursor.execute("PRAGMA query_only = ON")
+
+        self.version_source = version
+        self.nb_rafraichissements += 1
+        self._invalider_taux()
+        self._invalider_dimensions()
+        return True
+
+    def _materialiser_recurrences(self, date_fin: Optional[str] = None):
+        """
+        Matérialise les récurrences dans la base source puis rafraîchit la copie
+
+        Appelée au début de chaque lecture de transactions : c'est ici que la
+        version de la base source est vérifiée.
+        """
+        self.source._materialiser_recurrences(date_fin)
+        self.rafraichir()
+
+    def obtenir_reglement(self, annee: int = None, mois: int = None) -> Dict:
+        """Calcule le règlement sur la base source, qui tient le cache des mois clos (voir BudgetDatabase)"""
+        return self.source.obtenir_reglement(annee, mois)
+
+    def obtenir_version_donnees(self) -> Tuple[int, int]:
+        """Retourne la version des données de la base source (voir BudgetDatabase.obtenir_version_donnees)"""
+        return self.source.obtenir_version_donnees()
+
+    def obtenir_version_persistante(self) -> str:
+        """Retourne la version persistante de la base source, la copie pouvant être en retard"""
+        return self.source.obtenir_version_persistante()
+
+
+def _requetes_rapports(annee: int, mois: int) -> List[Tuple[str, Callable[[BudgetDatabase], object]]]:
+    """Retourne les lectures effectuées par les menus de rapport (totaux, analyses et graphiques)"""
+    return [
+        ("Totaux globaux", lambda db: db.obtenir_totaux_globaux()),
+        ("Totaux du mois", lambda db: db.obtenir_totaux_mois(annee, mois)),
+        ("Dépenses par utilité", lambda db: db.obtenir_depenses_par_utilite(annee, mois)),
+        ("Revenus totaux", lambda db: db.obtenir_revenus_totaux(annee, mois)),
+        ("Revenus par auteur", lambda db: db.obtenir_revenus_par_auteur(annee, mois)),
+        ("Totaux mensuels", lambda db: db.obtenir_totaux_mensuels(annee)),
+    ]
+
+
+def mesurer_latences(
+    db: BudgetDatabase,
+    replique: RepliqueAnalytique,
+    repetitions: int = 20,
+    annee: int = None,
+    mois: int = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compare la latence des requêtes de rapport sur la base disque et sur la réplique
+
+    Chaque requête est exécutée une fois à vide sur chaque base, puis
+    chronométrée sur plusieurs répétitions.
+
+    Args:
+        db: Base disque
+        replique: Réplique en mémoire de cette base
+        repetitions: Nombre d'exécutions chronométrées par requête
+        annee: Année des requêtes mensuelles (par défaut l'année en cours)
+        mois: Mois des requêtes mensuelles (par défaut le mois en cours)
+
+    Returns:
+        Dict {requête: {'disque': ms, 'memoire': ms}} avec la latence moyenne en millisecondes
+    """
+    maintenant = datetime.now()
+    annee = annee or maintenant.year
+    mois = mois or maintenant.month
+
+    latences = {}
+    for nom, requete in _requetes_rapports(annee, mois):
+        latences[nom] = {}
+        for cle, base in (("disque", db), ("memoire", replique)):
+            requete(base)
+            debut = time.perf_counter()
+            for _ in range(repetitions):
+                requete(base)
+            latences[nom][cle] = (time.perf_counter() - debut) * 1000 / repetitions
+
+    return latences
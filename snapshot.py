@@ -0,0 +1,364 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from database_manager import DEVISE_REFERENCE, SYMBOLES_DEVISES, BudgetDatabase
+
+COLONNES_CODEES = ("Type", "Utilite", "Auteur", "Categorie")
+FICHIER_DICTIONNAIRE = "dictionnaire.json"
+
+
+def _bornes_mois(annee: int, mois: int):
+    """Retourne les dates de début (incluse) et de fin (exclue) d'un mois"""
+    date_debut = np.datetime64(f"{annee}-{mois:02d}-01", "D")
+    if mois == 12:
+        date_fin = np.datetime64(f"{annee + 1}-01-01", "D")
+    else:
+        date_fin = np.datetime64(f"{annee}-{mois + 1:02d}-01", "D")
+    return date_debut, date_fin
+
+
+def _taux_vectorise(db: BudgetDatabase, devise: str, dates: np.ndarray) -> np.ndarray:
+    """
+    Retourne le taux d'une devise en DEVISE_REFERENCE pour chaque date
+
+    Même règle que BudgetDatabase.convertir (dernier taux connu, ou premier
+    taux pour les dates antérieures), mais en une recherche dichotomique vectorisée.
+    """
+    if devise == DEVISE_REFERENCE:
+        return np.ones(len(dates))
+
+    historique = db.obtenir_taux(devise)
+    if not historique:
+        raise ValueError(f"Aucun taux de change pour la devise {devise}")
+
+    dates_taux = np.array([date for date, _ in historique], dtype="datetime64[D]")
+    valeurs = np.array([taux for _, taux in historique], dtype=np.float64)
+    indices = np.searchsorted(dates_taux, dates, side="right") - 1
+    return valeurs[np.maximum(indices, 0)]
+
+
+def _collecter_colonnes(
+    db: BudgetDatabase, date_debut: str = None, date_fin: str = None
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, int]]]:
+    """
+    Lit une période de la base en une seule passe et la range en colonnes NumPy
+
+    Les colonnes textuelles sont encodées par dictionnaire et les montants
+    convertis dans la devise de rapport de la base, devise par devise.
+
+    Returns:
+        Tuple (colonnes, dictionnaires {colonne: {valeur: code}})
+    """
+    ids = []
+    dates = []
+    montants = []
+    devises = []
+    codes = {colonne: [] for colonne in COLONNES_CODEES}
+    dictionnaires = {colonne: {} for colonne in COLONNES_CODEES}
+
+    for trans in db.iterer_transactions(date_debut, date_fin):
+        ids.append(trans["ID"])
+        dates.append(trans["Date"])
+        montants.append(trans["Montant"])
+        devises.append(trans["Devise"])
+        for colonne in COLONNES_CODEES:
+            valeurs = dictionnaires[colonne]
+            valeur = trans[colonne]
+            if valeur not in valeurs:
+                valeurs[valeur] = len(valeurs)
+            codes[colonne].append(valeurs[valeur])
+
+    dates = np.array(dates, dtype="datetime64[D]")
+    montants = np.array(montants, dtype=np.float64)
+    devises = np.array(devises, dtype=str)
+    for devise in np.unique(devises):
+        if devise == db.devise_rapport:
+            continue
+        masque = devises == devise
+        montants[masque] *= _taux_vectorise(db, devise, dates[masque]) / _taux_vectorise(
+            db, db.devise_rapport, dates[masque]
+        )
+
+    colonnes = {"ID": np.array(ids, dtype=np.int64), "Date": dates, "Montant": montants}
+    for colonne in COLONNES_CODEES:
+        colonnes[colonne] = np.array(codes[colonne], dtype=np.int32)
+
+    return colonnes, dictionnaires
+
+
+def exporter_snapshot(db: BudgetDatabase, dossier: str, date_debut: str = None, date_fin: str = None) -> int:
+    """
+    Exporte une période de la base dans un snapshot colonnaire
+
+    Chaque colonne est écrite dans un fichier .npy et les colonnes textuelles
+    (Type, Utilite, Auteur, Categorie) sont encodées par un dictionnaire stocké en JSON.
+    Les montants sont convertis dans la devise de rapport de la base, devise par devise.
+
+    Args:
+        db: Instance de BudgetDatabase
+        dossier: Dossier de destination (créé si besoin)
+        date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+        date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+
+    Returns:
+        Nombre de transactions exportées
+    """
+    colonnes, dictionnaires = _collecter_colonnes(db, date_debut, date_fin)
+
+    os.makedirs(dossier, exist_ok=True)
+    for colonne, valeurs in colonnes.items():
+        np.save(os.path.join(dossier, f"{colonne}.npy"), valeurs)
+
+    meta = {
+        "date_debut": date_debut,
+        "date_fin": date_fin,
+        "nb_lignes": len(colonnes["ID"]),
+        "devise": db.devise_rapport,
+        "dictionnaires": {colonne: list(dictionnaires[colonne]) for colonne in COLONNES_CODEES},
+    }
+    with open(os.path.join(dossier, FICHIER_DICTIONNAIRE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    return meta["nb_lignes"]
+
+
+class BudgetSnapshot:
+    """
+    Snapshot colonnaire en lecture seule, chargé par memory-mapping
+
+    Expose les mêmes méthodes de lecture que BudgetDatabase utilisées par
+    BudgetVisualizer, calculées directement sur les tableaux NumPy.
+    """
+
+    def __init__(self, dossier: str):
+        """
+        Charge un snapshot sans copier les données
+
+        Args:
+            dossier: Dossier produit par exporter_snapshot
+        """
+        self.dossier = dossier
+
+        with open(os.path.join(dossier, FICHIER_DICTIONNAIRE), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.date_debut = meta["date_debut"]
+        self.date_fin = meta["date_fin"]
+        self.nb_lignes = meta["nb_lignes"]
+        self.devise_rapport = meta.get("devise", DEVISE_REFERENCE)
+        self.dictionnaires: Dict[str, List[str]] = meta["dictionnaires"]
+
+        # Un tableau vide ne peut pas être projeté en mémoire
+        mmap_mode = "r" if self.nb_lignes else None
+        self.colonnes = {
+            colonne: np.load(os.path.join(dossier, f"{colonne}.npy"), mmap_mode=mmap_mode)
+            for colonne in ("ID", "Date", "Montant") + COLONNES_CODEES
+        }
+
+    @classmethod
+    def depuis_base(cls, db: BudgetDatabase, date_debut: str = None, date_fin: str = None) -> "BudgetSnapshot":
+        """
+        Construit un snapshot en mémoire, sans passer par des fichiers
+
+        Toute la période est lue en une seule requête ; les lectures suivantes
+        sont calculées sur les tableaux NumPy sans interroger la base.
+
+        Args:
+            db: Instance de BudgetDatabase
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+
+        Returns:
+            Snapshot portant sur la période
+        """
+        colonnes, dictionnaires = _collecter_colonnes(db, date_debut, date_fin)
+
+        snapshot = cls.__new__(cls)
+        snapshot.dossier = None
+        snapshot.date_debut = date_debut
+        snapshot.date_fin = date_fin
+        snapshot.nb_lignes = len(colonnes["ID"])
+        snapshot.devise_rapport = db.devise_rapport
+        snapshot.dictionnaires = {colonne: list(dictionnaires[colonne]) for colonne in COLONNES_CODEES}
+        snapshot.colonnes = colonnes
+        return snapshot
+
+    @property
+    def symbole_devise(self) -> str:
+        """Symbole de la devise des montants du snapshot, pour l'affichage"""
+        return SYMBOLES_DEVISES.get(self.devise_rapport, self.devise_rapport)
+
+    def obtenir_version_persistante(self) -> Optional[str]:
+        """
+        Retourne un marqueur du snapshot, qui ne change que s'il est réexporté
+
+        Returns:
+            Marqueur basé sur le dossier, ou None pour un snapshot construit en mémoire
+        """
+        if self.dossier is None:
+            return None
+        fichier = os.path.join(self.dossier, FICHIER_DICTIONNAIRE)
+        return f"snapshot:{os.path.abspath(self.dossier)}:{os.path.getmtime(fichier)}"
+
+    def _code(self, colonne: str, valeur: str) -> int:
+        """Retourne le code d'une valeur du dictionnaire, ou -1 si absente"""
+        try:
+            return self.dictionnaires[colonne].index(valeur)
+        except ValueError:
+            return -1
+
+    def _tranche(self, annee: int = None, mois: int = None) -> slice:
+        """
+        Retourne la tranche de lignes correspondant à une période
+
+        Les lignes étant triées par date, la recherche est dichotomique.
+        """
+        if not (annee and mois):
+            return slice(0, self.nb_lignes)
+
+        date_debut, date_fin = _bornes_mois(annee, mois)
+        dates = self.colonnes["Date"]
+        debut = int(np.searchsorted(dates, date_debut, side="left"))
+        fin = int(np.searchsorted(dates, date_fin, side="left"))
+        return slice(debut, fin)
+
+    def _sommes_par(self, colonne: str, tranche: slice, type_transaction: str = None) -> np.ndarray:
+        """Somme les montants par code d'une colonne encodée"""
+        codes = self.colonnes[colonne][tranche]
+        montants = self.colonnes["Montant"][tranche]
+        if type_transaction:
+            masque = self.colonnes["Type"][tranche] == self._code("Type", type_transaction)
+            codes = codes[masque]
+            montants = montants[masque]
+        return np.bincount(codes, weights=montants, minlength=len(self.dictionnaires[colonne]))
+
+    def obtenir_depenses_par_utilite(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+        """
+        Calcule les dépenses par utilité (Commun/Perso)
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Dict avec structure {'Commun': montant, 'Perso': montant}
+        """
+        sommes = self._sommes_par("Utilite", self._tranche(annee, mois), "Depense")
+
+        result = {"Commun": 0.0, "Perso": 0.0}
+        for utilite, total in zip(self.dictionnaires["Utilite"], sommes):
+            result[utilite] = float(total)
+
+        return result
+
+    def obtenir_revenus_totaux(self, annee: int = None, mois: int = None) -> float:
+        """
+        Calcule le total des revenus
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Montant total des revenus
+        """
+        tranche = self._tranche(annee, mois)
+        masque = self.colonnes["Type"][tranche] == self._code("Type", "Revenu")
+        return float(self.colonnes["Montant"][tranche][masque].sum())
+
+    def obtenir_revenus_par_auteur(self, annee: int = None, mois: int = None) -> Dict[str, float]:
+        """
+        Calcule les revenus par auteur
+
+        Args:
+            annee: Filtre optionnel par année
+            mois: Filtre optionnel par mois
+
+        Returns:
+            Dict avec structure {auteur: montant}
+        """
+        tranche = self._tranche(annee, mois)
+        revenus = self.colonnes["Type"][tranche] == self._code("Type", "Revenu")
+        presents = np.bincount(self.colonnes["Auteur"][tranche][revenus], minlength=len(self.dictionnaires["Auteur"]))
+        sommes = self._sommes_par("Auteur", tranche, "Revenu")
+
+        return {
+            auteur: float(total) for auteur, total, nb in zip(self.dictionnaires["Auteur"], sommes, presents) if nb > 0
+        }
+
+    def obtenir_totaux_mois(self, annee: int, mois: int) -> Dict[str, Dict[str, float]]:
+        """
+        Calcule les totaux revenus/dépenses par personne pour un mois
+
+        Args:
+            annee: Année
+            mois: Mois (1-12)
+
+        Returns:
+            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+        """
+        return self._totaux(self._tranche(annee, mois))
+
+    def obtenir_totaux_globaux(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calcule les totaux revenus/dépenses par personne sur tout le snapshot
+
+        Returns:
+            Dict avec structure {auteur: {'revenus': montant, 'depenses': montant}}
+        """
+        return self._totaux(self._tranche())
+
+    def _totaux(self, tranche: slice) -> Dict[str, Dict[str, float]]:
+        """Calcule les totaux revenus/dépenses par auteur sur une tranche"""
+        auteurs = self.dictionnaires["Auteur"]
+        presents = np.bincount(self.colonnes["Auteur"][tranche], minlength=len(auteurs))
+        revenus = self._sommes_par("Auteur", tranche, "Revenu")
+        depenses = self._sommes_par("Auteur", tranche, "Depense")
+
+        return {
+            auteur: {"revenus": float(revenus[i]), "depenses": float(depenses[i])}
+            for i, auteur in enumerate(auteurs)
+            if presents[i] > 0
+        }
+
+    def obtenir_totaux_journaliers(
+        self, date_debut: str = None, date_fin: str = None
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Calcule les revenus/dépenses de chaque jour ayant au moins une transaction
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+
+        Returns:
+            Liste de tuples (date, revenus, depenses) triée par date
+        """
+        dates = self.colonnes["Date"]
+        debut = int(np.searchsorted(dates, np.datetime64(date_debut, "D"))) if date_debut else 0
+        fin = int(np.searchsorted(dates, np.datetime64(date_fin, "D"))) if date_fin else self.nb_lignes
+        tranche = slice(debut, fin)
+
+        jours, inverse = np.unique(dates[tranche], return_inverse=True)
+        montants = self.colonnes["Montant"][tranche]
+        revenus = self.colonnes["Type"][tranche] == self._code("Type", "Revenu")
+
+        sommes_revenus = np.bincount(inverse, weights=np.where(revenus, montants, 0.0), minlength=len(jours))
+        sommes_depenses = np.bincount(inverse, weights=np.where(revenus, 0.0, montants), minlength=len(jours))
+
+        return list(zip(jours.astype(str), sommes_revenus.tolist(), sommes_depenses.tolist()))
+
+    def fermer(self):
+        """Libère les projections mémoire"""
+        self.colonnes = {}
+
+    def __enter__(self):
+        """Support du context manager"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Fermeture automatique avec context manager"""
+        self.fermer()
@@ -0,0 +1,60 @@
+import gzip
+import json
+from typing import Tuple
+
+from database_manager import BudgetDatabase
+
+
+def exporter_changements(db: BudgetDatabase, chemin: str, depuis: int = 0) -> Tuple[int, int]:
+    """
+    Exporte les changements survenus depuis une séquence dans un fichier delta
+
+    Le fichier est un JSON Lines compressé en gzip : une ligne d'en-tête puis
+    une ligne par transaction modifiée ou supprimée. Les taux de change ne sont
+    pas journalisés : l'en-tête les contient tous, pour que l'autre copie
+    connaisse les devises des lignes exportées.
+
+    Args:
+        db: Instance de BudgetDatabase
+        chemin: Fichier de destination (ex: delta.jsonl.gz)
+        depuis: Séquence du journal à partir de laquelle exporter (exclue)
+
+    Returns:
+        Tuple (nombre de changements exportés, séquence atteinte à passer au prochain export)
+    """
+    jusqua = db.obtenir_sequence_journal()
+    entete = {"base": db.obtenir_uid_base(), "depuis": depuis, "jusqua": jusqua, "taux": db.obtenir_taux_change()}
+
+    nb_changements = 0
+    with gzip.open(chemin, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(entete) + "\n")
+        for changement in db.iterer_changements(depuis):
+            if changement["Seq"] > jusqua:
+                break
+            f.write(json.dumps(changement, ensure_ascii=False, separators=(",", ":")) + "\n")
+            nb_changements += 1
+
+    db.definir_meta("dernier_export", str(jusqua))
+    return nb_changements, jusqua
+
+
+def importer_changements(db: BudgetDatabase, chemin: str) -> Tuple[int, int]:
+    """
+    Importe un fichier delta produit par exporter_changements
+
+    L'import est idempotent : réimporter le même fichier ne modifie rien.
+    Les taux de change de l'en-tête absents de la base sont ajoutés avant les
+    transactions ; un taux local à la même date est conservé.
+
+    Args:
+        db: Instance de BudgetDatabase
+        chemin: Fichier delta à appliquer
+
+    Returns:
+        Tuple (nombre de lignes insérées ou modifiées, nombre de lignes supprimées)
+    """
+    with gzip.open(chemin, "rt", encoding="utf-8") as f:
+        entete = json.loads(f.readline())
+        # Les fichiers produits avant l'export des taux n'ont pas de clé 'taux'
+        db.definir_taux_en_masse(entete.get("taux", []), remplacer=False)
+        return db.appliquer_changements(json.loads(ligne) for ligne in f)
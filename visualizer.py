@@ -1,31 +1,128 @@
-from typing import Dict, List
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from cache_graphiques import CacheGraphiques
 from database_manager import BudgetDatabase
+from projection import ProjectionBudget, decaler_mois
+from snapshot import BudgetSnapshot
+
+# Graphiques déterministes, servis par BudgetVisualizer.image depuis le cache disque
+GRAPHIQUES_CACHABLES = (
+    "graphique_depenses_utilite",
+    "graphique_revenus_auteur",
+    "graphique_evolution_mensuelle",
+    "graphique_comparatif_auteurs",
+    "graphique_historique_journalier",
+)
+
+
+def _sous_echantillonner_minmax(y: np.ndarray, nb_buckets: int) -> np.ndarray:
+    """
+    Sélectionne les indices des minima et maxima de chaque bucket
+
+    Conserve les pics d'une série tout en limitant le nombre de points à
+    2 * nb_buckets, sans boucle Python.
+
+    Args:
+        y: Série à réduire
+        nb_buckets: Nombre de buckets (typiquement la largeur en pixels)
+
+    Returns:
+        Indices triés des points à conserver
+    """
+    n = len(y)
+    if n <= 2 * nb_buckets:
+        return np.arange(n)
+
+    taille = -(-n // nb_buckets)
+    complete = np.pad(y, (0, taille * nb_buckets - n), mode="edge").reshape(nb_buckets, taille)
+    decalages = np.arange(nb_buckets) * taille
+
+    indices = np.concatenate([decalages + complete.argmin(axis=1), decalages + complete.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(indices, n - 1))
 
 
 class BudgetVisualizer:
     """Classe pour créer des visualisations graphiques du budget"""
 
-    def __init__(self, db: BudgetDatabase):
+    def __init__(
+        self,
+        db: Union[BudgetDatabase, BudgetSnapshot],
+        cache: CacheGraphiques = None,
+        style: str = "seaborn-v0_8-darkgrid",
+    ):
         """
         Initialise le visualiseur
 
         Args:
-            db: Instance de BudgetDatabase
+            db: Instance de BudgetDatabase, ou BudgetSnapshot pour tracer depuis un snapshot
+            cache: Cache des images rendues par image() (par défaut dans DOSSIER_CACHE)
+            style: Style matplotlib
         """
         self.db = db
-        plt.style.use("seaborn-v0_8-darkgrid")
+        self.cache = cache or CacheGraphiques()
+        self.style = style
+        plt.style.use(style)
 
-    def graphique_depenses_utilite(self, annee: int = None, mois: int = None):
+    def image(self, graphique: str, format_image: str = "png", **parametres) -> Optional[str]:
+        """
+        Retourne le fichier image d'un graphique, rendu seulement si les données ont changé
+
+        Destiné aux usages sans fenêtre (export, serveur HTTP) : l'image est
+        cherchée dans le cache sous la version persistante des données et
+        n'est rendue qu'en cas d'absence. Une source sans version (snapshot
+        construit en mémoire) est rendue à chaque appel dans un fichier
+        temporaire, hors du cache qu'elle ne ferait qu'encombrer.
+
+        Args:
+            graphique: Nom d'une méthode de GRAPHIQUES_CACHABLES
+            format_image: Format de l'image (png, svg, pdf...)
+            **parametres: Paramètres de la méthode (annee, mois, date_debut...)
+
+        Returns:
+            Chemin de l'image (à supprimer par l'appelant s'il est temporaire),
+            ou None s'il n'y a rien à afficher
+        """
+        if graphique not in GRAPHIQUES_CACHABLES:
+            raise ValueError(f"Graphique inconnu: {graphique}")
+
+        version = self.db.obtenir_version_persistante()
+        if version is not None:
+            cle = self.cache.cle(graphique, parametres, self.style, version, self.db.devise_rapport, format_image)
+            chemin = self.cache.obtenir(cle, format_image)
+            if chemin:
+                return chemin
+
+        fig = getattr(self, graphique)(afficher=False, **parametres)
+        if fig is None:
+            return None
+
+        if version is None:
+            with tempfile.NamedTemporaryFile(suffix=f".{format_image}", delete=False) as f:
+                fig.savefig(f, format=format_image)
+            chemin = f.name
+        else:
+            chemin = self.cache.enregistrer(cle, fig, format_image)
+        plt.close(fig)
+        return chemin
+
+    def graphique_depenses_utilite(
+        self, annee: int = None, mois: int = None, afficher: bool = True
+    ) -> Optional[plt.Figure]:
         """
         Crée un camembert des dépenses par utilité (Commun/Perso)
 
         Args:
             annee: Année optionnelle pour filtrer
             mois: Mois optionnel pour filtrer
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure, ou None s'il n'y a rien à afficher
         """
         depenses = self.db.obtenir_depenses_par_utilite(annee, mois)
         revenus_total = self.db.obtenir_revenus_totaux(annee, mois)
@@ -84,7 +181,7 @@ class BudgetVisualizer:
             ax2.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 height,
-                f"{val:.2f}€\n({pct:.1f}%)",
+                f"{val:.2f}{self.db.symbole_devise}\n({pct:.1f}%)",
                 ha="center",
                 va="bottom",
                 fontsize=10,
@@ -95,15 +192,23 @@ class BudgetVisualizer:
         fig.suptitle(f"Analyse des dépenses{periode}", fontsize=16, fontweight="bold")
 
         plt.tight_layout()
-        plt.show()
+        if afficher:
+            plt.show()
+        return fig
 
-    def graphique_revenus_auteur(self, annee: int = None, mois: int = None):
+    def graphique_revenus_auteur(
+        self, annee: int = None, mois: int = None, afficher: bool = True
+    ) -> Optional[plt.Figure]:
         """
         Crée des graphiques montrant la contribution de chaque auteur aux revenus
 
         Args:
             annee: Année optionnelle pour filtrer
             mois: Mois optionnel pour filtrer
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure, ou None s'il n'y a rien à afficher
         """
         revenus_auteurs = self.db.obtenir_revenus_par_auteur(annee, mois)
         total_revenus = sum(revenus_auteurs.values())
@@ -138,7 +243,7 @@ class BudgetVisualizer:
         x_pos = np.arange(len(auteurs))
         bars = ax2.bar(x_pos, montants, color=colors, alpha=0.7, edgecolor="black")
         ax2.set_xlabel("Auteur", fontsize=12, fontweight="bold")
-        ax2.set_ylabel("Montant (€)", fontsize=12, fontweight="bold")
+        ax2.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
         ax2.set_title("Revenus par auteur\n(Montants)", fontsize=14, fontweight="bold")
         ax2.set_xticks(x_pos)
         ax2.set_xticklabels(auteurs, rotation=45, ha="right")
@@ -149,7 +254,7 @@ class BudgetVisualizer:
             ax2.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 height,
-                f"{montant:.2f}€\n({pct:.1f}%)",
+                f"{montant:.2f}{self.db.symbole_devise}\n({pct:.1f}%)",
                 ha="center",
                 va="bottom",
                 fontsize=10,
@@ -158,18 +263,45 @@ class BudgetVisualizer:
 
         periode = f" - {mois:02d}/{annee}" if annee and mois else " - Toute période"
         fig.suptitle(
-            f"Analyse des revenus par auteur{periode}\nTotal: {total_revenus:.2f}€", fontsize=16, fontweight="bold"
+            f"Analyse des revenus par auteur{periode}\nTotal: {total_revenus:.2f}{self.db.symbole_devise}",
+            fontsize=16,
+            fontweight="bold",
         )
 
         plt.tight_layout()
-        plt.show()
+        if afficher:
+            plt.show()
+        return fig
 
-    def graphique_evolution_mensuelle(self, annee: int):
+    def _limites_budget(self, annee: int) -> Dict[Optional[str], List[float]]:
+        """
+        Retourne les limites de budget mensuelles d'une année portant sur toutes les utilités
+
+        Args:
+            annee: Année
+
+        Returns:
+            Dict {auteur: 12 limites} dans la devise de rapport (None pour tous les auteurs) ;
+            vide si la source, comme un BudgetSnapshot, ne gère pas les budgets
+        """
+        if not hasattr(self.db, "obtenir_limites"):
+            return {}
+        return {
+            budget["Auteur"]: budget["Limites"]
+            for budget in self.db.obtenir_limites(annee)
+            if budget["Utilite"] is None
+        }
+
+    def graphique_evolution_mensuelle(self, annee: int, afficher: bool = True) -> plt.Figure:
         """
         Crée un graphique montrant l'évolution des revenus/dépenses sur l'année
 
         Args:
             annee: Année à analyser
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure
         """
         mois_labels = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
 
@@ -200,8 +332,21 @@ class BudgetVisualizer:
             x + width / 2, depenses_mensuelles, width, label="Dépenses", color="#e74c3c", alpha=0.8, edgecolor="black"
         )
 
+        # Limite mensuelle globale (tous auteurs, toutes utilités) au-dessus des dépenses
+        limites = self._limites_budget(annee).get(None)
+        if limites:
+            ax1.hlines(
+                limites,
+                x,
+                x + width,
+                colors="black",
+                linestyles="--",
+                linewidth=2,
+                label="Limite",
+            )
+
         ax1.set_xlabel("Mois", fontsize=12, fontweight="bold")
-        ax1.set_ylabel("Montant (€)", fontsize=12, fontweight="bold")
+        ax1.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
         ax1.set_title(f"Revenus et Dépenses mensuels - {annee}", fontsize=14, fontweight="bold")
         ax1.set_xticks(x)
         ax1.set_xticklabels(mois_labels)
@@ -214,22 +359,30 @@ class BudgetVisualizer:
 
         ax2.axhline(y=0, color="black", linestyle="-", linewidth=1)
         ax2.set_xlabel("Mois", fontsize=12, fontweight="bold")
-        ax2.set_ylabel("Solde (€)", fontsize=12, fontweight="bold")
+        ax2.set_ylabel(f"Solde ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
         ax2.set_title(f"Solde mensuel - {annee}", fontsize=14, fontweight="bold")
         ax2.set_xticks(x)
         ax2.set_xticklabels(mois_labels)
         ax2.grid(axis="y", alpha=0.3)
 
         plt.tight_layout()
-        plt.show()
+        if afficher:
+            plt.show()
+        return fig
 
-    def graphique_comparatif_auteurs(self, annee: int = None, mois: int = None):
+    def graphique_comparatif_auteurs(
+        self, annee: int = None, mois: int = None, afficher: bool = True
+    ) -> Optional[plt.Figure]:
         """
         Crée un graphique comparatif revenus/dépenses par auteur
 
         Args:
             annee: Année optionnelle pour filtrer
             mois: Mois optionnel pour filtrer
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure, ou None s'il n'y a rien à afficher
         """
         if annee and mois:
             totaux = self.db.obtenir_totaux_mois(annee, mois)
@@ -255,8 +408,23 @@ class BudgetVisualizer:
         bars2 = ax.bar(x, depenses, width, label="Dépenses", color="#e74c3c", alpha=0.8, edgecolor="black")
         bars3 = ax.bar(x + width, soldes, width, label="Solde", color="#3498db", alpha=0.8, edgecolor="black")
 
+        # Limites mensuelles par auteur au-dessus de leurs dépenses
+        if annee and mois:
+            limites_auteurs = self._limites_budget(annee)
+            limites = [limites_auteurs[auteur][mois - 1] if auteur in limites_auteurs else np.nan for auteur in auteurs]
+            if not np.isnan(limites).all():
+                ax.hlines(
+                    limites,
+                    x - width / 2,
+                    x + width / 2,
+                    colors="black",
+                    linestyles="--",
+                    linewidth=2,
+                    label="Limite",
+                )
+
         ax.set_xlabel("Auteur", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Montant (€)", fontsize=12, fontweight="bold")
+        ax.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
 
         periode = f" - {mois:02d}/{annee}" if annee and mois else " - Toute période"
         ax.set_title(f"Comparatif par auteur{periode}", fontsize=14, fontweight="bold")
@@ -268,4 +436,137 @@ class BudgetVisualizer:
         ax.grid(axis="y", alpha=0.3)
 
         plt.tight_layout()
-        plt.show()
+        if afficher:
+            plt.show()
+        return fig
+
+    def graphique_historique_journalier(
+        self, date_debut: str = None, date_fin: str = None, afficher: bool = True
+    ) -> Optional[plt.Figure]:
+        """
+        Crée un graphique journalier des revenus, dépenses et du solde cumulé
+
+        Les séries sont réduites par buckets min/max à la largeur en pixels des
+        axes, ce qui garde un temps de rendu constant quelle que soit la durée.
+
+        Args:
+            date_debut: Date de début incluse (YYYY-MM-DD, optionnel)
+            date_fin: Date de fin exclue (YYYY-MM-DD, optionnel)
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure, ou None s'il n'y a rien à afficher
+        """
+        totaux = self.db.obtenir_totaux_journaliers(date_debut, date_fin)
+
+        if not totaux:
+            print("Aucune donnée à afficher")
+            return
+
+        # Série dense : un point par jour, y compris les jours sans transaction
+        dates = np.array([t[0] for t in totaux], dtype="datetime64[D]")
+        jours = np.arange(dates[0], dates[-1] + 1)
+        positions = (dates - dates[0]).astype(np.int64)
+
+        revenus = np.zeros(len(jours))
+        depenses = np.zeros(len(jours))
+        revenus[positions] = [t[1] for t in totaux]
+        depenses[positions] = [t[2] for t in totaux]
+        solde = np.cumsum(revenus - depenses)
+
+        # Créer la figure
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+        nb_buckets = max(int(ax1.bbox.width), 1)
+
+        for serie, label, color in ((revenus, "Revenus", "#2ecc71"), (depenses, "Dépenses", "#e74c3c")):
+            indices = _sous_echantillonner_minmax(serie, nb_buckets)
+            ax1.plot(jours[indices], serie[indices], label=label, color=color, linewidth=1)
+
+        ax1.set_ylabel(f"Montant ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
+        ax1.set_title("Revenus et Dépenses journaliers", fontsize=14, fontweight="bold")
+        ax1.legend(fontsize=11)
+        ax1.grid(axis="y", alpha=0.3)
+
+        # Graphique 2: Solde cumulé
+        indices = _sous_echantillonner_minmax(solde, nb_buckets)
+        ax2.plot(jours[indices], solde[indices], color="#3498db", linewidth=1.5)
+        ax2.fill_between(jours[indices], solde[indices], 0, where=solde[indices] >= 0, color="#2ecc71", alpha=0.3)
+        ax2.fill_between(jours[indices], solde[indices], 0, where=solde[indices] < 0, color="#e74c3c", alpha=0.3)
+
+        ax2.axhline(y=0, color="black", linestyle="-", linewidth=1)
+        ax2.set_xlabel("Date", fontsize=12, fontweight="bold")
+        ax2.set_ylabel(f"Solde cumulé ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
+        ax2.set_title("Solde cumulé", fontsize=14, fontweight="bold")
+        ax2.grid(axis="y", alpha=0.3)
+
+        fig.suptitle(f"Historique journalier - {jours[0]} au {jours[-1]}", fontsize=16, fontweight="bold")
+        fig.autofmt_xdate()
+
+        plt.tight_layout()
+        if afficher:
+            plt.show()
+        return fig
+
+    def graphique_projection(
+        self, nb_mois: int = None, nb_chemins: int = 100_000, utilite: str = "Commun", afficher: bool = True
+    ) -> Optional[plt.Figure]:
+        """
+        Crée un graphique de l'évolution mensuelle de l'année et des bandes de projection du solde
+
+        Le haut de la figure est celui de graphique_evolution_mensuelle ; le
+        solde mensuel du bas est remplacé par la projection.
+
+        Args:
+            nb_mois: Horizon en mois (par défaut jusqu'à la fin de l'année)
+            nb_chemins: Nombre de chemins Monte Carlo simulés
+            utilite: 'Commun' pour le compte commun, 'Perso', ou None pour tout le budget
+            afficher: Affiche la fenêtre (False pour seulement construire la figure)
+
+        Returns:
+            La figure, ou None s'il n'y a pas d'historique
+        """
+        maintenant = datetime.now()
+        mois_courant = maintenant.strftime("%Y-%m")
+        if nb_mois is None:
+            nb_mois = max(12 - maintenant.month, 1)
+
+        projection = ProjectionBudget(self.db)
+        projection.ajuster()
+        if not projection.series:
+            print("Aucun historique pour ajuster la projection")
+            return
+
+        solde_initial = projection.solde_actuel(utilite)
+        resultat = projection.simuler(nb_mois, nb_chemins, utilite, solde_initial)
+
+        fig = self.graphique_evolution_mensuelle(maintenant.year, afficher=False)
+        ax2 = fig.axes[1]
+        ax2.clear()
+
+        # Graphique 2: Bandes de percentiles du solde projeté, partant du solde actuel
+        x = np.arange(nb_mois + 1)
+        p = {k: np.concatenate([[solde_initial], v]) for k, v in resultat["percentiles"].items()}
+
+        ax2.fill_between(x, p[5], p[95], color="#3498db", alpha=0.2, label="5e - 95e percentile")
+        ax2.fill_between(x, p[25], p[75], color="#3498db", alpha=0.4, label="25e - 75e percentile")
+        ax2.plot(x, p[50], color="#2c3e50", marker="o", linewidth=2, label="Médiane")
+        ax2.axhline(y=0, color="r", linestyle="--", linewidth=2)
+
+        ax2.set_xlabel("Mois", fontsize=12, fontweight="bold")
+        ax2.set_ylabel(f"Solde ({self.db.symbole_devise})", fontsize=12, fontweight="bold")
+        libelle = utilite if utilite else "Total"
+        ax2.set_title(
+            f"Projection du solde ({libelle}) - {nb_chemins} simulations\n"
+            f"Probabilité de passer sous zéro: {resultat['proba_negatif'] * 100:.1f}%",
+            fontsize=14,
+            fontweight="bold",
+        )
+        ax2.set_xticks(x)
+        ax2.set_xticklabels([decaler_mois(mois_courant, i) for i in x], rotation=45, ha="right")
+        ax2.legend(fontsize=11)
+        ax2.grid(axis="y", alpha=0.3)
+
+        plt.tight_layout()
+        if afficher:
+            plt.show()
+        return fig